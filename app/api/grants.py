@@ -0,0 +1,151 @@
+import base64
+import hashlib
+import json
+import secrets
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from app.db.shared import shared_redis
+
+GRANT_TTL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class AccessGrant:
+    """Single-use credentials handed from a signed-in session to a plain
+    HTTP route, so the browser never sees the database password."""
+
+    username: str
+    password: str
+    purpose: str
+
+
+class LocalGrantStore:
+    def __init__(self):
+        self._grants: dict[
+            str, tuple[float, AccessGrant]
+        ] = {}
+        self._lock = threading.Lock()
+
+    def put(
+        self, token: str, grant: AccessGrant, ttl: float
+    ) -> None:
+        now = time.monotonic()
+        with self._lock:
+            for stale in [
+                key
+                for key, (
+                    expires_at,
+                    _,
+                ) in self._grants.items()
+                if expires_at <= now
+            ]:
+                del self._grants[stale]
+            self._grants[token] = (now + ttl, grant)
+
+    def take(self, token: str) -> AccessGrant | None:
+        with self._lock:
+            item = self._grants.pop(token, None)
+        if item is None or item[0] <= time.monotonic():
+            return None
+        return item[1]
+
+
+class RedisGrantStore:
+    """Lets a grant issued on one worker be redeemed on another, so the
+    import/export routes need no session affinity.
+
+    Redis never sees the token or a readable password. Entries are
+    keyed by a hash of the token and encrypted with a key derived from
+    it (Fernet, from ``cryptography``), so the password can only be
+    recovered by someone holding both the Redis entry and the token,
+    and only until the entry is redeemed or ``ttl`` expires.
+    """
+
+    def __init__(
+        self,
+        redis_client: Any,
+        prefix: str = "access-grant",
+    ):
+        self._redis = redis_client
+        self._prefix = prefix
+
+    def _key(self, token: str) -> str:
+        digest = hashlib.sha256(
+            f"id:{token}".encode()
+        ).hexdigest()
+        return f"{self._prefix}:{digest}"
+
+    @staticmethod
+    def _cipher(token: str) -> Any:
+        from cryptography.fernet import Fernet
+
+        return Fernet(
+            base64.urlsafe_b64encode(
+                hashlib.sha256(
+                    f"key:{token}".encode()
+                ).digest()
+            )
+        )
+
+    def put(
+        self, token: str, grant: AccessGrant, ttl: float
+    ) -> None:
+        self._redis.set(
+            self._key(token),
+            self._cipher(token).encrypt(
+                json.dumps(asdict(grant)).encode()
+            ),
+            ex=max(int(ttl), 1),
+        )
+
+    def take(self, token: str) -> AccessGrant | None:
+        from cryptography.fernet import InvalidToken
+
+        payload = self._redis.getdel(self._key(token))
+        if payload is None:
+            return None
+        try:
+            return AccessGrant(
+                **json.loads(
+                    self._cipher(token).decrypt(payload)
+                )
+            )
+        except InvalidToken:
+            return None
+
+
+def _make_grant_store() -> Any:
+    redis_client = shared_redis()
+    if redis_client is not None:
+        return RedisGrantStore(redis_client)
+    return LocalGrantStore()
+
+
+_store = _make_grant_store()
+
+
+def issue_grant(
+    username: str,
+    password: str,
+    purpose: str,
+    ttl_seconds: float = GRANT_TTL_SECONDS,
+) -> str:
+    token = secrets.token_urlsafe(32)
+    _store.put(
+        token,
+        AccessGrant(username, password, purpose),
+        ttl_seconds,
+    )
+    return token
+
+
+def redeem_grant(
+    token: str, purpose: str
+) -> AccessGrant | None:
+    grant = _store.take(token)
+    if grant is None or grant.purpose != purpose:
+        return None
+    return grant
\ No newline at end of file
@@ -0,0 +1,105 @@
+import datetime
+from typing import AsyncIterator
+
+from pymongo import errors
+from starlette.requests import Request
+from starlette.responses import (
+    JSONResponse,
+    Response,
+    StreamingResponse,
+)
+
+from app.api.grants import redeem_grant
+from app.db.filters import (
+    HandoverFilters,
+    build_handover_query,
+    filters_from_params,
+)
+from app.db.repository import HandoverRepository, run_db
+from app.exporters.handover_export import (
+    EXPORT_FORMATS,
+    EXPORT_MEDIA_TYPES,
+    stream_csv,
+    stream_xlsx,
+)
+
+EXPORT_ROUTE = "/api/handovers/export"
+
+
+async def _export_body(
+    repository: HandoverRepository,
+    export_format: str,
+    filters: HandoverFilters,
+) -> AsyncIterator[bytes]:
+    batches = repository.iter_handover_batches(filters)
+    encode = (
+        stream_csv
+        if export_format == "csv"
+        else stream_xlsx
+    )
+    try:
+        async for chunk in encode(batches):
+            yield chunk
+    finally:
+        await batches.aclose()
+        repository.close()
+
+
+async def export_handovers_endpoint(
+    request: Request,
+) -> Response:
+    """Stream matching handovers, one row per cylinder check.
+
+    Documents are pulled from a server-side cursor in fixed-size batches
+    and encoded as they arrive, so memory use does not grow with the
+    number of exported rows.
+    """
+    grant = await run_db(
+        redeem_grant,
+        request.query_params.get("token", ""),
+        "export",
+    )
+    if grant is None:
+        return JSONResponse(
+            {
+                "error": "Export link expired. Please start the export again."
+            },
+            status_code=403,
+        )
+    export_format = request.query_params.get(
+        "format", "csv"
+    )
+    if export_format not in EXPORT_FORMATS:
+        return JSONResponse(
+            {"error": "Unsupported export format."},
+            status_code=400,
+        )
+    filters = filters_from_params(request.query_params)
+    try:
+        build_handover_query(filters)
+    except ValueError:
+        return JSONResponse(
+            {
+                "error": "Dates must be in YYYY-MM-DD format."
+            },
+            status_code=400,
+        )
+    try:
+        repository = await HandoverRepository.connect(
+            grant.username, grant.password
+        )
+    except errors.PyMongoError:
+        return JSONResponse(
+            {
+                "error": "Database connection error. Please sign in again."
+            },
+            status_code=503,
+        )
+    filename = f"handovers-{datetime.date.today().isoformat()}.{export_format}"
+    return StreamingResponse(
+        _export_body(repository, export_format, filters),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        },
+    )
\ No newline at end of file
@@ -0,0 +1,89 @@
+import io
+import tempfile
+
+from pymongo import errors
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+from app.api.grants import redeem_grant
+from app.db.repository import HandoverRepository, run_db
+from app.importers.handover_import import (
+    IMPORT_FORMATS,
+    detect_import_format,
+)
+
+IMPORT_ROUTE = "/api/handovers/import"
+
+
+async def import_handovers_endpoint(
+    request: Request,
+) -> JSONResponse:
+    """Import a CSV/JSONL body streamed straight from the browser.
+
+    Reflex's upload handler buffers the whole file in memory, so the raw
+    request body is spooled to a temporary file chunk by chunk instead and
+    parsed from there on the database thread pool.
+    """
+    grant = await run_db(
+        redeem_grant,
+        request.query_params.get("token", ""),
+        "import",
+    )
+    if grant is None:
+        return JSONResponse(
+            {
+                "error": "Import link expired. Please start the import again."
+            },
+            status_code=403,
+        )
+    import_format = request.query_params.get(
+        "format"
+    ) or detect_import_format(
+        request.query_params.get("filename", "")
+    )
+    if import_format not in IMPORT_FORMATS:
+        return JSONResponse(
+            {
+                "error": "Unsupported file type. Upload a .csv or .jsonl file."
+            },
+            status_code=400,
+        )
+    try:
+        repository = await HandoverRepository.connect(
+            grant.username, grant.password
+        )
+    except errors.PyMongoError:
+        return JSONResponse(
+            {
+                "error": "Database connection error. Please sign in again."
+            },
+            status_code=503,
+        )
+    try:
+        with tempfile.TemporaryFile() as spool:
+            async for chunk in request.stream():
+                await run_db(spool.write, chunk)
+            await run_db(spool.seek, 0)
+            stream = io.TextIOWrapper(
+                spool,
+                encoding="utf-8-sig",
+                errors="replace",
+                newline="",
+            )
+            try:
+                report = await repository.import_handovers(
+                    stream,
+                    import_format,
+                    grant.username,
+                    f"Mr. {grant.username}",
+                )
+            finally:
+                stream.detach()
+    except errors.PyMongoError as e:
+        return JSONResponse(
+            {"error": f"Database operation failed: {e}"},
+            status_code=502,
+        )
+    finally:
+        repository.close()
+    return JSONResponse(report.as_dict())
\ No newline at end of file
@@ -9,8 +9,52 @@ from app.pages.handover_entry_page_2 import (
     handover_entry_page_2,
 )
 from app.pages.submissions_page import submissions_page
+from app.pages.import_page import import_page
+from app.pages.dashboard_page import dashboard_page
+from app.pages.cylinder_history_page import (
+    cylinder_history_page,
+)
+from app.states.dashboard_state import DashboardState
+from app.states.cylinder_history_state import (
+    CylinderHistoryState,
+)
+from app.api.handover_export import (
+    EXPORT_ROUTE,
+    export_handovers_endpoint,
+)
+from app.api.handover_import import (
+    IMPORT_ROUTE,
+    import_handovers_endpoint,
+)
+from app.db.indexes import provision_indexes_on_startup
+from app.db.journal import run_journal_flusher
+from app.middleware.state_metrics import (
+    STATE_METRICS_ROUTE,
+    state_metrics,
+    state_metrics_enabled,
+    state_metrics_endpoint,
+)
 
 app = rx.App(theme=rx.theme(appearance="light"))
+app.register_lifespan_task(provision_indexes_on_startup)
+app.register_lifespan_task(run_journal_flusher)
+app.api.add_api_route(
+    IMPORT_ROUTE,
+    import_handovers_endpoint,
+    methods=["POST"],
+)
+app.api.add_api_route(
+    EXPORT_ROUTE,
+    export_handovers_endpoint,
+    methods=["GET"],
+)
+if state_metrics_enabled():
+    app.add_middleware(state_metrics)
+    app.api.add_api_route(
+        STATE_METRICS_ROUTE,
+        state_metrics_endpoint,
+        methods=["GET"],
+    )
 app.add_page(sign_in_page, route="/sign-in")
 app.add_page(sign_in_page, route="/")
 app.add_page(
@@ -28,6 +72,27 @@ app.add_page(
     route="/submissions",
     on_load=[
         AuthState.check_session,
-        CylinderState.fetch_db_submissions,
+        CylinderState.sync_db_submissions,
+    ],
+)
+app.add_page(
+    import_page,
+    route="/import",
+    on_load=AuthState.check_session,
+)
+app.add_page(
+    dashboard_page,
+    route="/dashboard",
+    on_load=[
+        AuthState.check_session,
+        DashboardState.load_dashboard,
+    ],
+)
+app.add_page(
+    cylinder_history_page,
+    route="/cylinders",
+    on_load=[
+        AuthState.check_session,
+        CylinderHistoryState.load_cylinder_history,
     ],
 )
\ No newline at end of file
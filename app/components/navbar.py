@@ -2,6 +2,8 @@ import reflex as rx
 from app.states.auth_state import AuthState
 from app.states.cylinder_state import CylinderState
 
+PENDING_SYNC_REFRESH_INTERVAL_MS = 10000
+
 
 def navbar() -> rx.Component:
     return rx.el.nav(
@@ -23,6 +25,35 @@ def navbar() -> rx.Component:
                     href="/submissions",
                     class_name="text-gray-300 hover:bg-indigo-700 hover:text-white px-3 py-2 rounded-md text-sm font-medium",
                 ),
+                rx.el.a(
+                    "Dashboard",
+                    href="/dashboard",
+                    class_name="text-gray-300 hover:bg-indigo-700 hover:text-white px-3 py-2 rounded-md text-sm font-medium",
+                ),
+                rx.el.a(
+                    "Cylinders",
+                    href="/cylinders",
+                    class_name="text-gray-300 hover:bg-indigo-700 hover:text-white px-3 py-2 rounded-md text-sm font-medium",
+                ),
+                rx.el.a(
+                    "Import",
+                    href="/import",
+                    class_name="text-gray-300 hover:bg-indigo-700 hover:text-white px-3 py-2 rounded-md text-sm font-medium",
+                ),
+                rx.cond(
+                    CylinderState.pending_sync_count > 0,
+                    rx.el.span(
+                        f"{CylinderState.pending_sync_count} pending sync",
+                        title="Saved locally, waiting to reach the database.",
+                        class_name="px-2 py-1 text-xs font-medium text-amber-900 bg-amber-200 rounded-full",
+                    ),
+                    rx.fragment(),
+                ),
+                rx.moment(
+                    interval=PENDING_SYNC_REFRESH_INTERVAL_MS,
+                    on_change=lambda _: CylinderState.refresh_pending_sync_count,
+                    display="none",
+                ),
                 rx.el.button(
                     "Sign Out",
                     on_click=AuthState.sign_out,
@@ -0,0 +1,210 @@
+from typing import Any, TypedDict
+
+from app.db.check_encoding import (
+    CHECK_ARRAY_FIELDS,
+    checks_expression,
+)
+from app.db.filters import (
+    HandoverFilters,
+    build_handover_query,
+)
+
+DASHBOARD_PERIODS = {"day": 10, "month": 7, "year": 4}
+_PERIOD_DATE_FORMATS = {
+    "day": "%Y-%m-%d",
+    "month": "%Y-%m",
+    "year": "%Y",
+}
+PURITY_BUCKETS = (
+    (0, "Below 90%"),
+    (90, "90–93%"),
+    (93, "93–95%"),
+    (95, "95–97%"),
+    (97, "97–99%"),
+    (100, None),
+)
+PRESSURE_BUCKETS = (
+    (0, "0–499"),
+    (500, "500–999"),
+    (1000, "1000–1499"),
+    (1500, "1500–2000"),
+    (2001, None),
+)
+OTHER_BUCKET_LABEL = "Missing / out of range"
+
+
+class FacilityPeriodTotal(TypedDict):
+    facility: str
+    period: str
+    handovers: int
+    qty_2m: int
+    qty_4m: int
+    qty_7m: int
+
+
+class DistributionBucket(TypedDict):
+    label: str
+    count: int
+    percent: float
+
+
+class DashboardSummary(TypedDict):
+    totals: list[FacilityPeriodTotal]
+    purity: list[DistributionBucket]
+    pressure: list[DistributionBucket]
+
+
+def _bucket_stage(
+    field: str, buckets: tuple[tuple[float, Any], ...]
+) -> dict[str, Any]:
+    return {
+        "$bucket": {
+            "groupBy": f"$check.{field}",
+            "boundaries": [bound for bound, _ in buckets],
+            "default": "other",
+            "output": {"count": {"$sum": 1}},
+        }
+    }
+
+
+def _unwound_checks_stages() -> list[dict[str, Any]]:
+    return [
+        {
+            "$project": {
+                "check": {
+                    "$concatArrays": [
+                        checks_expression(field)
+                        for field in CHECK_ARRAY_FIELDS
+                    ]
+                }
+            }
+        },
+        {"$unwind": "$check"},
+    ]
+
+
+def _period_expression(period: str) -> dict[str, Any]:
+    return {
+        "$cond": [
+            {
+                "$eq": [
+                    {"$type": "$submission_timestamp"},
+                    "date",
+                ]
+            },
+            {
+                "$dateToString": {
+                    "date": "$submission_timestamp",
+                    "format": _PERIOD_DATE_FORMATS[period],
+                }
+            },
+            {
+                "$substrBytes": [
+                    "$submission_timestamp",
+                    0,
+                    DASHBOARD_PERIODS[period],
+                ]
+            },
+        ]
+    }
+
+
+def dashboard_pipeline(
+    filters: HandoverFilters | None, period: str
+) -> list[dict[str, Any]]:
+    """One round-trip: per facility/period totals plus reading histograms.
+
+    Periods are ``YYYY[-MM[-DD]]`` keys, taken from BSON dates or from
+    the prefix of legacy ISO strings, and every check array is unwound
+    server-side so only counts come back.
+    """
+    return [
+        {"$match": build_handover_query(filters)},
+        {
+            "$facet": {
+                "totals": [
+                    {
+                        "$group": {
+                            "_id": {
+                                "facility": "$facility",
+                                "period": _period_expression(
+                                    period
+                                ),
+                            },
+                            "handovers": {"$sum": 1},
+                            "qty_2m": {"$sum": "$qty_2m"},
+                            "qty_4m": {"$sum": "$qty_4m"},
+                            "qty_7m": {"$sum": "$qty_7m"},
+                        }
+                    },
+                    {
+                        "$sort": {
+                            "_id.period": -1,
+                            "_id.facility": 1,
+                        }
+                    },
+                ],
+                "purity": [
+                    *_unwound_checks_stages(),
+                    _bucket_stage("purity", PURITY_BUCKETS),
+                ],
+                "pressure": [
+                    *_unwound_checks_stages(),
+                    _bucket_stage(
+                        "pressure", PRESSURE_BUCKETS
+                    ),
+                ],
+            }
+        },
+    ]
+
+
+def _distribution(
+    rows: list[dict[str, Any]],
+    buckets: tuple[tuple[float, Any], ...],
+) -> list[DistributionBucket]:
+    counts = {row["_id"]: row["count"] for row in rows}
+    total = sum(counts.values()) or 1
+    labelled = [
+        (label, counts.get(bound, 0))
+        for bound, label in buckets
+        if label is not None
+    ]
+    if counts.get("other"):
+        labelled.append(
+            (OTHER_BUCKET_LABEL, counts["other"])
+        )
+    return [
+        {
+            "label": label,
+            "count": count,
+            "percent": round(count * 100 / total, 1),
+        }
+        for label, count in labelled
+    ]
+
+
+def shape_dashboard_result(
+    facets: dict[str, Any] | None,
+) -> DashboardSummary:
+    facets = facets or {}
+    return {
+        "totals": [
+            {
+                "facility": row["_id"].get("facility")
+                or "",
+                "period": row["_id"].get("period") or "",
+                "handovers": row["handovers"],
+                "qty_2m": row["qty_2m"],
+                "qty_4m": row["qty_4m"],
+                "qty_7m": row["qty_7m"],
+            }
+            for row in facets.get("totals", [])
+        ],
+        "purity": _distribution(
+            facets.get("purity", []), PURITY_BUCKETS
+        ),
+        "pressure": _distribution(
+            facets.get("pressure", []), PRESSURE_BUCKETS
+        ),
+    }
\ No newline at end of file
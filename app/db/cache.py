@@ -0,0 +1,249 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+import bson
+
+from app.db.shared import REDIS_URL_ENV
+
+CACHE_REDIS_URL_ENV = "SUBMISSIONS_CACHE_REDIS_URL"
+CACHE_TTL_SECONDS = 60
+CACHE_MAX_ENTRIES = 512
+CACHE_MAX_BYTES = 32 * 1024 * 1024
+CACHE_MAX_ENTRY_BYTES = 2 * 1024 * 1024
+
+
+class LocalCacheBackend:
+    def __init__(self, max_entries: int, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._generation = 0
+        self._entries: OrderedDict[
+            str, tuple[float, bytes]
+        ] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def generation(self) -> int:
+        return self._generation
+
+    def get(
+        self, key: str, generation: int
+    ) -> bytes | None:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, payload = item
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def set(
+        self,
+        key: str,
+        payload: bytes,
+        ttl: float,
+        generation: int,
+    ) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._pop(key)
+            self._entries[key] = (
+                time.monotonic() + ttl,
+                payload,
+            )
+            self._bytes += len(payload)
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or self._bytes > self.max_bytes
+            ):
+                self._pop(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+            self._bytes = 0
+
+    def _pop(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._bytes -= len(item[1])
+
+
+class RedisCacheBackend:
+    """Shares cached query results between workers.
+
+    Invalidation bumps a generation counter that is part of every key,
+    so stale entries are never read again and simply age out via TTL.
+    Callers read the generation before running their query and write
+    under it, so a result computed before an invalidation lands in a
+    generation nobody reads any more.
+
+    Keys are also listed in a sorted set by expiry, and the soonest to
+    expire are deleted once there are more than ``max_entries``, so
+    distinct filters and cursors cannot grow the cache without bound.
+    Entries are at most ``CACHE_MAX_ENTRY_BYTES`` each. Redis itself
+    should still run with a ``maxmemory`` limit and a ``volatile-lru``
+    (or ``allkeys-lru``) policy, since it also holds sessions.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        max_entries: int,
+        prefix: str = "handover-cache",
+    ):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self.max_entries = max_entries
+        self._prefix = prefix
+        self._generation_key = f"{prefix}:generation"
+        self._index_key = f"{prefix}:index"
+
+    def _key(self, key: str, generation: int) -> str:
+        return f"{self._prefix}:{generation}:{key}"
+
+    def generation(self) -> int:
+        return int(
+            self._redis.get(self._generation_key) or 0
+        )
+
+    def get(
+        self, key: str, generation: int
+    ) -> bytes | None:
+        return self._redis.get(self._key(key, generation))
+
+    def set(
+        self,
+        key: str,
+        payload: bytes,
+        ttl: float,
+        generation: int,
+    ) -> None:
+        redis_key = self._key(key, generation)
+        now = time.time()
+        pipeline = self._redis.pipeline(transaction=False)
+        pipeline.set(
+            redis_key, payload, ex=max(int(ttl), 1)
+        )
+        pipeline.zadd(
+            self._index_key, {redis_key: now + ttl}
+        )
+        pipeline.zremrangebyscore(
+            self._index_key, "-inf", now
+        )
+        pipeline.zcard(self._index_key)
+        entries = pipeline.execute()[-1]
+        if entries > self.max_entries:
+            evicted = [
+                member
+                for member, _ in self._redis.zpopmin(
+                    self._index_key,
+                    entries - self.max_entries,
+                )
+            ]
+            if evicted:
+                self._redis.delete(*evicted)
+
+    def clear(self) -> None:
+        self._redis.incr(self._generation_key)
+
+
+class QueryCache:
+    def __init__(
+        self,
+        backend: Any,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        max_entry_bytes: int = CACHE_MAX_ENTRY_BYTES,
+    ):
+        self.backend = backend
+        self.ttl_seconds = ttl_seconds
+        self.max_entry_bytes = max_entry_bytes
+        self.stats: dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "invalidations": 0,
+            "oversize": 0,
+            "backend_errors": 0,
+        }
+
+    def current_generation(self) -> int | None:
+        """Read before running the query, then pass to get and set.
+
+        ``None`` means the backend is unreachable; get and set then
+        skip it.
+        """
+        try:
+            return self.backend.generation()
+        except Exception:
+            self.stats["backend_errors"] += 1
+            return None
+
+    def get(
+        self, key: str, generation: int | None
+    ) -> Any | None:
+        if generation is None:
+            self.stats["misses"] += 1
+            return None
+        try:
+            payload = self.backend.get(key, generation)
+        except Exception:
+            self.stats["backend_errors"] += 1
+            return None
+        if payload is None:
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        return bson.decode(payload)["value"]
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        generation: int | None,
+    ) -> None:
+        if generation is None:
+            return
+        payload = bson.encode({"value": value})
+        if len(payload) > self.max_entry_bytes:
+            self.stats["oversize"] += 1
+            return
+        try:
+            self.backend.set(
+                key, payload, self.ttl_seconds, generation
+            )
+        except Exception:
+            self.stats["backend_errors"] += 1
+
+    def invalidate(self) -> None:
+        self.stats["invalidations"] += 1
+        try:
+            self.backend.clear()
+        except Exception:
+            self.stats["backend_errors"] += 1
+
+
+def _make_submissions_cache() -> QueryCache:
+    redis_url = os.environ.get(
+        CACHE_REDIS_URL_ENV
+    ) or os.environ.get(REDIS_URL_ENV)
+    if redis_url:
+        return QueryCache(
+            RedisCacheBackend(redis_url, CACHE_MAX_ENTRIES)
+        )
+    return QueryCache(
+        LocalCacheBackend(
+            CACHE_MAX_ENTRIES, CACHE_MAX_BYTES
+        )
+    )
+
+
+submissions_cache = _make_submissions_cache()
\ No newline at end of file
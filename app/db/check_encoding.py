@@ -0,0 +1,138 @@
+import os
+from typing import Any
+
+from app.validation.cylinder_checks import SIZE_KEYS
+
+CHECK_ENCODING_ENV = "HANDOVER_CHECK_ENCODING"
+ROW_ENCODING = "rows"
+COLUMN_ENCODING = "columns"
+CHECK_ENCODINGS = (ROW_ENCODING, COLUMN_ENCODING)
+CHECK_FIELDS = ("cylinder_id", "purity", "pressure")
+CHECK_ARRAY_FIELDS = tuple(
+    f"cylinder_checks_{size_key}" for size_key in SIZE_KEYS
+)
+
+
+def configured_check_encoding() -> str:
+    encoding = os.environ.get(
+        CHECK_ENCODING_ENV, ROW_ENCODING
+    )
+    return (
+        encoding
+        if encoding in CHECK_ENCODINGS
+        else ROW_ENCODING
+    )
+
+
+def is_column_encoded(value: Any) -> bool:
+    return isinstance(value, dict)
+
+
+def encode_checks(
+    checks: list[dict[str, Any]],
+) -> dict[str, list[Any]] | list[dict[str, Any]]:
+    """Rows of checks as parallel arrays, one per field.
+
+    Field names are then stored once per size instead of once per check.
+    ``cylinder_checks_<size>.cylinder_id`` still resolves to the ids, so
+    the multikey indexes and queries on it work for both layouts. Empty
+    lists stay lists; they are smaller than three empty columns.
+    """
+    if not checks:
+        return []
+    return {
+        check_field: [
+            check.get(check_field) for check in checks
+        ]
+        for check_field in CHECK_FIELDS
+    }
+
+
+def decode_checks(value: Any) -> list[dict[str, Any]]:
+    """Rows of checks from either layout."""
+    if not value:
+        return []
+    if not is_column_encoded(value):
+        return value
+    columns = [
+        value.get(check_field) or []
+        for check_field in CHECK_FIELDS
+    ]
+    return [
+        {
+            check_field: column[position]
+            if position < len(column)
+            else None
+            for check_field, column in zip(
+                CHECK_FIELDS, columns
+            )
+        }
+        for position in range(
+            max(len(column) for column in columns)
+        )
+    ]
+
+
+def encode_handover_checks(
+    document: dict[str, Any],
+    encoding: str | None = None,
+) -> dict[str, Any]:
+    """Copy of ``document`` with its check arrays in ``encoding``
+    (the configured one by default)."""
+    encoding = encoding or configured_check_encoding()
+    encoded = dict(document)
+    for field in CHECK_ARRAY_FIELDS:
+        if field not in encoded:
+            continue
+        checks = decode_checks(encoded[field])
+        encoded[field] = (
+            encode_checks(checks)
+            if encoding == COLUMN_ENCODING
+            else checks
+        )
+    return encoded
+
+
+def decode_handover_checks(
+    document: dict[str, Any],
+) -> dict[str, Any]:
+    """Rewrite ``document``'s check arrays as rows, in place."""
+    for field in CHECK_ARRAY_FIELDS:
+        if is_column_encoded(document.get(field)):
+            document[field] = decode_checks(document[field])
+    return document
+
+
+def checks_expression(field: str) -> dict[str, Any]:
+    """Aggregation expression yielding ``field`` as rows of checks."""
+    return {
+        "$cond": [
+            {"$eq": [{"$type": f"${field}"}, "object"]},
+            {
+                "$map": {
+                    "input": {
+                        "$zip": {
+                            "inputs": [
+                                f"${field}.{check_field}"
+                                for check_field in CHECK_FIELDS
+                            ],
+                            "useLongestLength": True,
+                        }
+                    },
+                    "as": "check",
+                    "in": {
+                        check_field: {
+                            "$arrayElemAt": [
+                                "$$check",
+                                position,
+                            ]
+                        }
+                        for position, check_field in enumerate(
+                            CHECK_FIELDS
+                        )
+                    },
+                }
+            },
+            {"$ifNull": [f"${field}", []]},
+        ]
+    }
\ No newline at end of file
@@ -0,0 +1,247 @@
+import argparse
+import logging
+import os
+import time
+from typing import Any, TypedDict
+
+import bson
+from pymongo import ASCENDING, UpdateOne, errors
+
+from app.db.check_encoding import (
+    CHECK_ARRAY_FIELDS,
+    CHECK_ENCODINGS,
+    CHECK_FIELDS,
+    COLUMN_ENCODING,
+    encode_handover_checks,
+    is_column_encoded,
+)
+from app.db.timestamp_migration import (
+    MIGRATION_COLLECTION_NAME,
+)
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_BATCH_SIZE = 500
+
+
+class CheckMigrationProgress(TypedDict):
+    converted: int
+    bytes_before: int
+    bytes_after: int
+
+
+def _migration_id(encoding: str) -> str:
+    return f"cylinder_checks_to_{encoding}"
+
+
+def _needs_conversion_query(
+    encoding: str,
+) -> dict[str, Any]:
+    # Rows have an element 0; columns have an id array instead. Neither
+    # path matches the other layout.
+    if encoding == COLUMN_ENCODING:
+        clauses = [
+            {f"{field}.0": {"$exists": True}}
+            for field in CHECK_ARRAY_FIELDS
+        ]
+    else:
+        clauses = [
+            {
+                f"{field}.{CHECK_FIELDS[0]}": {
+                    "$type": "array"
+                }
+            }
+            for field in CHECK_ARRAY_FIELDS
+        ]
+    return {"$or": clauses}
+
+
+def _changed_fields(
+    document: dict[str, Any], encoding: str
+) -> dict[str, Any]:
+    encoded = encode_handover_checks(document, encoding)
+    return {
+        field: encoded[field]
+        for field in CHECK_ARRAY_FIELDS
+        if field in document
+        and is_column_encoded(document[field])
+        != is_column_encoded(encoded[field])
+    }
+
+
+def _encoded_size(fields: dict[str, Any]) -> int:
+    return len(bson.encode(fields)) if fields else 0
+
+
+def migrate_check_encoding(
+    database: Any,
+    handovers_collection_name: str,
+    encoding: str = COLUMN_ENCODING,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+    pause_seconds: float = 0.0,
+    restart: bool = False,
+) -> CheckMigrationProgress:
+    """Rewrite stored check arrays in ``encoding``.
+
+    Same shape as the timestamp migration: ``_id`` order, one unordered
+    ``bulk_write`` per batch and a checkpoint after each, so it can run
+    against a live collection and resume. Converting back to ``rows``
+    undoes it. Readers accept both layouts throughout.
+    """
+    handovers = database[handovers_collection_name]
+    migrations = database[MIGRATION_COLLECTION_NAME]
+    migration_id = _migration_id(encoding)
+    if restart:
+        migrations.delete_one({"_id": migration_id})
+    checkpoint = migrations.find_one(
+        {"_id": migration_id}
+    ) or {
+        "last_id": None,
+        "converted": 0,
+        "bytes_before": 0,
+        "bytes_after": 0,
+    }
+    last_id = checkpoint["last_id"]
+    progress: CheckMigrationProgress = {
+        "converted": checkpoint["converted"],
+        "bytes_before": checkpoint["bytes_before"],
+        "bytes_after": checkpoint["bytes_after"],
+    }
+    projection = {field: 1 for field in CHECK_ARRAY_FIELDS}
+    while True:
+        query = _needs_conversion_query(encoding)
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = list(
+            handovers.find(query, projection)
+            .sort("_id", ASCENDING)
+            .limit(batch_size)
+        )
+        if not batch:
+            break
+        operations = []
+        bytes_before = bytes_after = 0
+        for document in batch:
+            changed = _changed_fields(document, encoding)
+            if not changed:
+                continue
+            bytes_before += _encoded_size(
+                {
+                    field: document[field]
+                    for field in changed
+                }
+            )
+            bytes_after += _encoded_size(changed)
+            operations.append(
+                UpdateOne(
+                    {"_id": document["_id"]},
+                    {"$set": changed},
+                )
+            )
+        if operations:
+            try:
+                result = handovers.bulk_write(
+                    operations, ordered=False
+                )
+                progress["converted"] += (
+                    result.modified_count
+                )
+            except errors.BulkWriteError as e:
+                progress["converted"] += e.details.get(
+                    "nModified", 0
+                )
+                logger.warning(
+                    "%d check updates failed in batch",
+                    len(e.details.get("writeErrors", [])),
+                )
+            progress["bytes_before"] += bytes_before
+            progress["bytes_after"] += bytes_after
+        last_id = batch[-1]["_id"]
+        migrations.update_one(
+            {"_id": migration_id},
+            {"$set": {"last_id": last_id, **progress}},
+            upsert=True,
+        )
+        logger.info(
+            "Converted %d handovers to %s checks",
+            progress["converted"],
+            encoding,
+        )
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return progress
+
+
+def main() -> None:
+    from app.db.client_pool import client_pool
+    from app.db.repository import (
+        DB_NAME,
+        HANDOVER_COLLECTION_NAME,
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Convert stored cylinder check arrays between row and column layouts."
+    )
+    parser.add_argument(
+        "--username",
+        default=os.environ.get(
+            "MONGO_INDEX_ADMIN_USERNAME"
+        ),
+    )
+    parser.add_argument(
+        "--password",
+        default=os.environ.get(
+            "MONGO_INDEX_ADMIN_PASSWORD"
+        ),
+    )
+    parser.add_argument(
+        "--to",
+        dest="encoding",
+        choices=CHECK_ENCODINGS,
+        default=COLUMN_ENCODING,
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=MIGRATION_BATCH_SIZE,
+    )
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=0.0,
+        help="Seconds to sleep between batches.",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the saved checkpoint.",
+    )
+    args = parser.parse_args()
+    if not args.username or not args.password:
+        parser.error(
+            "--username and --password are required"
+        )
+    logging.basicConfig(level=logging.INFO)
+    client = client_pool.acquire(
+        args.username, args.password
+    )
+    try:
+        progress = migrate_check_encoding(
+            client[DB_NAME],
+            HANDOVER_COLLECTION_NAME,
+            args.encoding,
+            args.batch_size,
+            args.pause,
+            args.restart,
+        )
+    finally:
+        client_pool.release(client)
+        client_pool.close_all()
+    print(
+        f"Converted {progress['converted']} handovers to {args.encoding}; "
+        f"check arrays {progress['bytes_before']} -> {progress['bytes_after']} bytes."
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,91 @@
+from typing import Any, TypedDict
+
+from app.db.check_encoding import decode_checks
+from app.db.timestamps import format_timestamp
+from app.validation.cylinder_checks import SIZE_KEYS
+
+CYLINDER_HISTORY_PAGE_SIZE = 50
+CYLINDER_TREND_DAYS = 365
+CYLINDER_HISTORY_PROJECTION = {
+    "facility": 1,
+    "receiving_personnel": 1,
+    "submitted_by": 1,
+    "submission_timestamp": 1,
+    "cylinder_checks_2m": 1,
+    "cylinder_checks_4m": 1,
+    "cylinder_checks_7m": 1,
+}
+
+
+class CylinderReading(TypedDict):
+    handover_id: str
+    submission_timestamp: str
+    facility: str
+    receiving_personnel: str | None
+    submitted_by: str
+    size_key: str
+    check_number: int
+    purity: float | None
+    pressure: int | None
+
+
+class CylinderTrendPoint(TypedDict):
+    timestamp: str
+    purity: float | None
+    pressure: int | None
+
+
+def trend_points(
+    readings: list[dict[str, Any]],
+) -> list[CylinderTrendPoint]:
+    """Chart rows from the time-series readings, oldest first."""
+    return [
+        {
+            "timestamp": format_timestamp(
+                reading.get("timestamp")
+            ),
+            "purity": reading.get("purity"),
+            "pressure": reading.get("pressure"),
+        }
+        for reading in readings
+    ]
+
+
+def readings_for_cylinder(
+    document: dict[str, Any], cylinder_id: str
+) -> list[CylinderReading]:
+    """The checks of one handover that name ``cylinder_id``.
+
+    A cylinder normally appears once per handover, but nothing stops a
+    technician from entering the same id twice, so every match is kept.
+    """
+    readings: list[CylinderReading] = []
+    for size_key in SIZE_KEYS:
+        checks = decode_checks(
+            document.get(f"cylinder_checks_{size_key}")
+        )
+        for number, check in enumerate(checks, start=1):
+            if check.get("cylinder_id") != cylinder_id:
+                continue
+            readings.append(
+                {
+                    "handover_id": str(document["_id"]),
+                    "submission_timestamp": format_timestamp(
+                        document.get("submission_timestamp")
+                    ),
+                    "facility": document.get(
+                        "facility", ""
+                    ),
+                    "receiving_personnel": document.get(
+                        "receiving_personnel"
+                    ),
+                    "submitted_by": document.get(
+                        "submitted_by", "Unknown"
+                    ),
+                    "size_key": size_key,
+                    "check_number": number,
+                    "purity": check.get("purity"),
+                    "pressure": check.get("pressure"),
+                }
+            )
+    return readings
\ No newline at end of file
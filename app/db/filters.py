@@ -0,0 +1,84 @@
+import datetime
+import re
+from typing import Any, Mapping, TypedDict
+
+from app.db.timestamps import date_range_query
+from app.validation.cylinder_checks import SIZE_KEYS
+
+
+class HandoverFilters(TypedDict, total=False):
+    facility: str
+    submitted_by: str
+    date_from: str
+    date_to: str
+    receiving_personnel: str
+    cylinder_id: str
+
+
+FILTER_KEYS = tuple(HandoverFilters.__annotations__)
+
+
+def filters_from_params(
+    params: Mapping[str, str],
+) -> HandoverFilters:
+    filters: HandoverFilters = {}
+    for key in FILTER_KEYS:
+        value = (params.get(key) or "").strip()
+        if value:
+            filters[key] = value
+    return filters
+
+
+def _parse_day(value: str | None) -> datetime.date | None:
+    return (
+        datetime.date.fromisoformat(value)
+        if value
+        else None
+    )
+
+
+def build_handover_query(
+    filters: HandoverFilters | None,
+) -> dict[str, Any]:
+    """Translate list filters into a ``Handover_records`` query.
+
+    ``date_from``/``date_to`` are inclusive ``YYYY-MM-DD`` dates.
+    ``receiving_personnel`` matches as an anchored, case-sensitive
+    prefix so it can still use its index; every other filter is exact.
+    """
+    if not filters:
+        return {}
+    query: dict[str, Any] = {}
+    clauses: list[dict[str, Any]] = []
+    if filters.get("facility"):
+        query["facility"] = filters["facility"]
+    if filters.get("submitted_by"):
+        query["submitted_by"] = filters["submitted_by"]
+    if filters.get("receiving_personnel"):
+        query["receiving_personnel"] = {
+            "$regex": "^"
+            + re.escape(filters["receiving_personnel"])
+        }
+    if filters.get("date_from") or filters.get("date_to"):
+        clauses.append(
+            date_range_query(
+                _parse_day(filters.get("date_from")),
+                _parse_day(filters.get("date_to")),
+            )
+        )
+    if filters.get("cylinder_id"):
+        clauses.append(
+            {
+                "$or": [
+                    {
+                        f"cylinder_checks_{size_key}.cylinder_id": filters[
+                            "cylinder_id"
+                        ]
+                    }
+                    for size_key in SIZE_KEYS
+                ]
+            }
+        )
+    if clauses:
+        query["$and"] = clauses
+    return query
\ No newline at end of file
@@ -0,0 +1,248 @@
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+from pymongo import (
+    ASCENDING,
+    DESCENDING,
+    IndexModel,
+    errors,
+)
+
+from app.db.repository import (
+    DB_NAME,
+    HANDOVER_COLLECTION_NAME,
+    acquire_client,
+    run_db,
+)
+from app.db.client_pool import client_pool
+from app.db.readings import (
+    READINGS_COLLECTION_NAME,
+    READINGS_INDEXES,
+    ensure_readings_collection,
+)
+from app.db.rollups import (
+    ROLLUP_CHANGES_COLLECTION_NAME,
+    ROLLUP_CHANGES_INDEXES,
+    ROLLUP_COLLECTION_NAME,
+    ROLLUP_INDEXES,
+)
+from app.validation.cylinder_checks import SIZE_KEYS
+
+logger = logging.getLogger(__name__)
+
+INDEX_ADMIN_USERNAME_ENV = "MONGO_INDEX_ADMIN_USERNAME"
+INDEX_ADMIN_PASSWORD_ENV = "MONGO_INDEX_ADMIN_PASSWORD"
+
+HANDOVER_INDEXES = [
+    IndexModel(
+        [
+            ("submission_timestamp", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        name="submission_timestamp_id",
+    ),
+    IndexModel(
+        [
+            ("facility", ASCENDING),
+            ("submission_timestamp", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        name="facility_submission_timestamp",
+    ),
+    IndexModel(
+        [
+            ("submitted_by", ASCENDING),
+            ("submission_timestamp", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        name="submitted_by_submission_timestamp",
+    ),
+    IndexModel(
+        [
+            ("receiving_personnel", ASCENDING),
+            ("submission_timestamp", DESCENDING),
+            ("_id", DESCENDING),
+        ],
+        name="receiving_personnel_submission_timestamp",
+    ),
+    *(
+        IndexModel(
+            [
+                (
+                    f"cylinder_checks_{size_key}.cylinder_id",
+                    ASCENDING,
+                ),
+                ("submission_timestamp", DESCENDING),
+                ("_id", DESCENDING),
+            ],
+            name=f"cylinder_checks_{size_key}_cylinder_id_submission_timestamp",
+        )
+        for size_key in SIZE_KEYS
+    ),
+]
+
+COLLECTION_INDEXES = {
+    HANDOVER_COLLECTION_NAME: HANDOVER_INDEXES,
+    ROLLUP_COLLECTION_NAME: ROLLUP_INDEXES,
+    ROLLUP_CHANGES_COLLECTION_NAME: ROLLUP_CHANGES_INDEXES,
+    READINGS_COLLECTION_NAME: READINGS_INDEXES,
+}
+
+
+@dataclass
+class IndexReport:
+    created: list[str] = field(default_factory=list)
+    already_present: list[str] = field(default_factory=list)
+    missing: list[str] = field(default_factory=list)
+    undeclared: list[str] = field(default_factory=list)
+    unused: list[str] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+
+
+def ensure_indexes(
+    collection: Any, declared: list[IndexModel]
+) -> IndexReport:
+    report = IndexReport()
+    existing = collection.index_information()
+    declared_names = set()
+    for model in declared:
+        name = model.document["name"]
+        declared_names.add(name)
+        if name in existing:
+            report.already_present.append(name)
+            continue
+        try:
+            collection.create_indexes([model])
+            report.created.append(name)
+        except errors.OperationFailure as e:
+            report.missing.append(name)
+            report.errors[name] = str(e)
+    report.undeclared = sorted(
+        name
+        for name in existing
+        if name != "_id_" and name not in declared_names
+    )
+    try:
+        for stats in collection.aggregate(
+            [{"$indexStats": {}}]
+        ):
+            if (
+                stats["name"] != "_id_"
+                and stats["accesses"]["ops"] == 0
+            ):
+                report.unused.append(stats["name"])
+    except errors.OperationFailure as e:
+        report.errors["$indexStats"] = str(e)
+    report.unused.sort()
+    return report
+
+
+def log_index_report(
+    collection_name: str, report: IndexReport
+) -> None:
+    if report.created:
+        logger.info(
+            "Created indexes on %s: %s",
+            collection_name,
+            ", ".join(report.created),
+        )
+    if report.missing:
+        logger.warning(
+            "Missing indexes on %s (creation failed): %s",
+            collection_name,
+            "; ".join(
+                f"{name}: {report.errors.get(name, '')}"
+                for name in report.missing
+            ),
+        )
+    if report.undeclared:
+        logger.warning(
+            "Indexes on %s not declared by the app: %s",
+            collection_name,
+            ", ".join(report.undeclared),
+        )
+    if report.unused:
+        logger.warning(
+            "Indexes on %s unused since server start: %s",
+            collection_name,
+            ", ".join(report.unused),
+        )
+
+
+_provisioned = False
+_provision_lock = asyncio.Lock()
+_background_tasks: set[asyncio.Task] = set()
+
+
+async def provision_indexes(
+    username: str, password: str
+) -> dict[str, IndexReport] | None:
+    global _provisioned
+    async with _provision_lock:
+        if _provisioned:
+            return None
+        try:
+            client = await acquire_client(
+                username, password
+            )
+        except errors.PyMongoError as e:
+            logger.warning(
+                "Index provisioning skipped: %s", e
+            )
+            return None
+        reports: dict[str, IndexReport] = {}
+        try:
+            await run_db(
+                ensure_readings_collection,
+                client[DB_NAME],
+            )
+            for (
+                collection_name,
+                declared,
+            ) in COLLECTION_INDEXES.items():
+                reports[collection_name] = await run_db(
+                    ensure_indexes,
+                    client[DB_NAME][collection_name],
+                    declared,
+                )
+        except errors.PyMongoError as e:
+            logger.warning(
+                "Index provisioning failed: %s", e
+            )
+            return None
+        finally:
+            client_pool.release(client)
+        _provisioned = not any(
+            report.missing for report in reports.values()
+        )
+        for collection_name, report in reports.items():
+            log_index_report(collection_name, report)
+        return reports
+
+
+async def provision_indexes_on_startup() -> None:
+    username = os.environ.get(INDEX_ADMIN_USERNAME_ENV)
+    password = os.environ.get(INDEX_ADMIN_PASSWORD_ENV)
+    if not username or not password:
+        logger.info(
+            "%s/%s not set; indexes will be provisioned with the first signed-in user's credentials.",
+            INDEX_ADMIN_USERNAME_ENV,
+            INDEX_ADMIN_PASSWORD_ENV,
+        )
+        return
+    await provision_indexes(username, password)
+
+
+def schedule_index_provisioning(
+    username: str, password: str
+) -> None:
+    if _provisioned or _provision_lock.locked():
+        return
+    task = asyncio.get_running_loop().create_task(
+        provision_indexes(username, password)
+    )
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
\ No newline at end of file
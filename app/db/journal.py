@@ -0,0 +1,504 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from typing import Any, Callable, TypeVar
+
+import bson
+from bson.objectid import ObjectId
+from pymongo import errors
+
+from app.db.repository import HandoverRepository
+
+logger = logging.getLogger(__name__)
+
+JOURNAL_PATH_ENV = "HANDOVER_JOURNAL_PATH"
+DEFAULT_JOURNAL_PATH = "handover_journal.db"
+JOURNAL_FLUSH_BATCH_SIZE = 100
+JOURNAL_FLUSH_INTERVAL_SECONDS = 5.0
+JOURNAL_RETRY_BASE_SECONDS = 2.0
+JOURNAL_RETRY_MAX_SECONDS = 300.0
+JOURNAL_CLAIM_SECONDS = 60.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_handovers (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    handover_id TEXT NOT NULL UNIQUE,
+    username TEXT NOT NULL,
+    document BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS pending_handovers_due
+    ON pending_handovers (next_attempt_at);
+CREATE INDEX IF NOT EXISTS pending_handovers_username
+    ON pending_handovers (username);
+"""
+
+T = TypeVar("T")
+
+
+@dataclass
+class JournalEntry:
+    id: int
+    username: str
+    document: dict[str, Any]
+    attempts: int
+
+
+def _entry_from_row(row: tuple[Any, ...]) -> JournalEntry:
+    return JournalEntry(
+        id=row[0],
+        username=row[1],
+        document=bson.decode(row[2]),
+        attempts=row[3],
+    )
+
+
+class HandoverJournal:
+    """Durable local queue of handovers awaiting their Mongo insert.
+
+    Entries live in a SQLite database in WAL mode with full fsync, so an
+    acknowledged submission survives a crash or restart. Each document
+    gets its ``_id`` before it is journaled, which makes replaying an
+    entry that already reached Mongo harmless.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=FULL")
+            connection.executescript(_SCHEMA)
+            self._connection = connection
+        return self._connection
+
+    def append(
+        self,
+        username: str,
+        document: dict[str, Any],
+        now: float | None = None,
+    ) -> str:
+        handover_id = document.setdefault("_id", ObjectId())
+        now = time.time() if now is None else now
+        with self._lock:
+            self._connect().execute(
+                "INSERT INTO pending_handovers"
+                " (handover_id, username, document, created_at, next_attempt_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (
+                    str(handover_id),
+                    username,
+                    bson.encode(document),
+                    now,
+                    now,
+                ),
+            )
+        return str(handover_id)
+
+    def _claim(
+        self,
+        condition: str,
+        params: tuple[Any, ...],
+        limit: int,
+        now: float,
+    ) -> list[JournalEntry]:
+        # The journal file may be shared by several workers on a host.
+        # Claimed entries are hidden from the others for a lease, so one
+        # write is never replayed by two workers at once.
+        with self._lock:
+            connection = self._connect()
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = connection.execute(
+                    "SELECT id, username, document, attempts"
+                    " FROM pending_handovers"
+                    f" WHERE next_attempt_at <= ? AND {condition}"
+                    " ORDER BY id LIMIT ?",
+                    (now, *params, limit),
+                ).fetchall()
+                if rows:
+                    connection.execute(
+                        "UPDATE pending_handovers"
+                        " SET next_attempt_at = ?"
+                        f" WHERE id IN ({','.join('?' * len(rows))})",
+                        (
+                            now + JOURNAL_CLAIM_SECONDS,
+                            *(row[0] for row in rows),
+                        ),
+                    )
+                connection.execute("COMMIT")
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+        return [_entry_from_row(row) for row in rows]
+
+    def due(
+        self,
+        limit: int,
+        usernames: list[str],
+        now: float | None = None,
+    ) -> list[JournalEntry]:
+        """Claim due entries of ``usernames``, the users this worker can
+        write for.
+
+        Other users' entries are left exactly as they are, for a worker
+        that holds those credentials.
+        """
+        if not usernames:
+            return []
+        return self._claim(
+            f"username IN ({','.join('?' * len(usernames))})",
+            tuple(usernames),
+            limit,
+            time.time() if now is None else now,
+        )
+
+    def claim(
+        self,
+        handover_ids: list[str],
+        now: float | None = None,
+    ) -> list[JournalEntry]:
+        if not handover_ids:
+            return []
+        return self._claim(
+            f"handover_id IN ({','.join('?' * len(handover_ids))})",
+            tuple(handover_ids),
+            len(handover_ids),
+            time.time() if now is None else now,
+        )
+
+    def get(
+        self, handover_ids: list[str]
+    ) -> list[JournalEntry]:
+        if not handover_ids:
+            return []
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute(
+                    "SELECT id, username, document, attempts"
+                    " FROM pending_handovers WHERE handover_id IN"
+                    f" ({','.join('?' * len(handover_ids))})"
+                    " ORDER BY id",
+                    handover_ids,
+                )
+                .fetchall()
+            )
+        return [_entry_from_row(row) for row in rows]
+
+    def remove(self, entry_ids: list[int]) -> None:
+        if not entry_ids:
+            return
+        with self._lock:
+            self._connect().execute(
+                "DELETE FROM pending_handovers WHERE id IN"
+                f" ({','.join('?' * len(entry_ids))})",
+                entry_ids,
+            )
+
+    def defer(
+        self,
+        entry_ids: list[int],
+        error: str,
+        now: float | None = None,
+    ) -> None:
+        """Push entries back with exponential backoff."""
+        if not entry_ids:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            self._connect().execute(
+                "UPDATE pending_handovers SET"
+                " attempts = attempts + 1,"
+                " last_error = ?,"
+                " next_attempt_at = ? + min(?, ? * (1 << min(attempts, 16)))"
+                f" WHERE id IN ({','.join('?' * len(entry_ids))})",
+                (
+                    error,
+                    now,
+                    JOURNAL_RETRY_MAX_SECONDS,
+                    JOURNAL_RETRY_BASE_SECONDS,
+                    *entry_ids,
+                ),
+            )
+
+    def retry_now(
+        self, username: str, now: float | None = None
+    ) -> None:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._connect().execute(
+                "UPDATE pending_handovers SET next_attempt_at = ?"
+                " WHERE username = ? AND next_attempt_at > ?",
+                (now, username, now),
+            )
+
+    def pending_count(
+        self, username: str | None = None
+    ) -> int:
+        with self._lock:
+            connection = self._connect()
+            if username is None:
+                row = connection.execute(
+                    "SELECT count(*) FROM pending_handovers"
+                ).fetchone()
+            else:
+                row = connection.execute(
+                    "SELECT count(*) FROM pending_handovers"
+                    " WHERE username = ?",
+                    (username,),
+                ).fetchone()
+        return row[0]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+handover_journal = HandoverJournal(
+    os.environ.get(JOURNAL_PATH_ENV, DEFAULT_JOURNAL_PATH)
+)
+
+_journal_executor = ThreadPoolExecutor(
+    max_workers=1, thread_name_prefix="handover-journal"
+)
+_flusher_credentials: dict[str, str] = {}
+_signed_out_usernames: set[str] = set()
+_flusher_wakeup: asyncio.Event | None = None
+
+
+async def run_journal(
+    fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _journal_executor, partial(fn, *args, **kwargs)
+    )
+
+
+def remember_flusher_credentials(
+    username: str, password: str
+) -> None:
+    """Let the flusher write ``username``'s entries.
+
+    The plaintext password is kept in this process's memory, never on
+    disk, from the user's first submission until they sign out and
+    their last journaled entry has been written (see
+    :func:`forget_flusher_credentials`), or until the process exits.
+    Entries journaled before a restart therefore wait until their
+    submitter signs in again.
+    """
+    _signed_out_usernames.discard(username)
+    known = _flusher_credentials.get(username) == password
+    _flusher_credentials[username] = password
+    if not known:
+        _journal_executor.submit(
+            handover_journal.retry_now, username
+        )
+        wake_journal_flusher()
+
+
+async def forget_flusher_credentials(username: str) -> None:
+    """Drop ``username``'s password once nothing of theirs is pending.
+
+    Entries still journaled at sign-out keep it until they are written.
+    """
+    _signed_out_usernames.add(username)
+    await _release_flusher_credentials(username)
+
+
+async def _release_flusher_credentials(
+    username: str,
+) -> None:
+    if username not in _signed_out_usernames:
+        return
+    if await run_journal(
+        handover_journal.pending_count, username
+    ):
+        return
+    _signed_out_usernames.discard(username)
+    _flusher_credentials.pop(username, None)
+
+
+def wake_journal_flusher() -> None:
+    if _flusher_wakeup is not None:
+        _flusher_wakeup.set()
+
+
+async def _flush_user_entries(
+    username: str, entries: list[JournalEntry]
+) -> int:
+    entry_ids = [entry.id for entry in entries]
+    password = _flusher_credentials.get(username)
+    if password is None:
+        # Left untouched for a worker that has the credentials.
+        return 0
+    try:
+        repository = await HandoverRepository.connect(
+            username, password
+        )
+    except errors.PyMongoError as e:
+        await run_journal(
+            handover_journal.defer, entry_ids, str(e)
+        )
+        return 0
+    try:
+        failures = await repository.insert_handovers(
+            [entry.document for entry in entries]
+        )
+    except errors.PyMongoError as e:
+        await run_journal(
+            handover_journal.defer, entry_ids, str(e)
+        )
+        return 0
+    finally:
+        repository.close()
+    written = [
+        entry.id
+        for position, entry in enumerate(entries)
+        if position not in failures
+    ]
+    await run_journal(handover_journal.remove, written)
+    await _release_flusher_credentials(username)
+    for position, message in failures.items():
+        logger.warning(
+            "Journaled handover %s rejected: %s",
+            entries[position].document["_id"],
+            message,
+        )
+        await run_journal(
+            handover_journal.defer,
+            [entries[position].id],
+            message,
+        )
+    return len(written)
+
+
+async def _flush_entries(
+    entries: list[JournalEntry],
+) -> int:
+    by_username: dict[str, list[JournalEntry]] = (
+        defaultdict(list)
+    )
+    for entry in entries:
+        by_username[entry.username].append(entry)
+    flushed = 0
+    for username, user_entries in by_username.items():
+        flushed += await _flush_user_entries(
+            username, user_entries
+        )
+    return flushed
+
+
+async def _stored_handover_ids(
+    username: str, handover_ids: list[str]
+) -> set[str]:
+    password = _flusher_credentials.get(username)
+    if password is None or not handover_ids:
+        return set()
+    try:
+        repository = await HandoverRepository.connect(
+            username, password
+        )
+    except errors.PyMongoError:
+        return set()
+    try:
+        return await repository.existing_handover_ids(
+            handover_ids
+        )
+    except errors.PyMongoError:
+        return set()
+    finally:
+        repository.close()
+
+
+async def sync_journal_entries(
+    username: str,
+    handover_ids: list[str],
+) -> int:
+    """Write the given handovers now instead of waiting for the flusher.
+
+    Returns how many are still pending. An id that is not in this
+    worker's journal (written by the flusher, or journaled by another
+    worker) only counts as synced once it is found in Mongo.
+    """
+    entries = await run_journal(
+        handover_journal.claim, handover_ids
+    )
+    await _flush_entries(entries)
+    claimed = {
+        str(entry.document["_id"]) for entry in entries
+    }
+    still_journaled = {
+        str(entry.document["_id"])
+        for entry in await run_journal(
+            handover_journal.get, handover_ids
+        )
+    }
+    unconfirmed = [
+        handover_id
+        for handover_id in handover_ids
+        if handover_id not in claimed
+        and handover_id not in still_journaled
+    ]
+    stored = await _stored_handover_ids(
+        username, unconfirmed
+    )
+    return len(still_journaled) + len(
+        set(unconfirmed) - stored
+    )
+
+
+async def flush_journal(
+    batch_size: int = JOURNAL_FLUSH_BATCH_SIZE,
+) -> int:
+    """Send one batch of due entries to Mongo; returns how many landed."""
+    entries = await run_journal(
+        handover_journal.due,
+        batch_size,
+        list(_flusher_credentials),
+    )
+    return await _flush_entries(entries)
+
+
+async def run_journal_flusher() -> None:
+    global _flusher_wakeup
+    _flusher_wakeup = asyncio.Event()
+    while True:
+        try:
+            flushed = await flush_journal()
+        except Exception:
+            logger.exception(
+                "Handover journal flush failed"
+            )
+            flushed = 0
+        if flushed:
+            continue
+        try:
+            await asyncio.wait_for(
+                _flusher_wakeup.wait(),
+                JOURNAL_FLUSH_INTERVAL_SECONDS,
+            )
+        except asyncio.TimeoutError:
+            pass
+        _flusher_wakeup.clear()
\ No newline at end of file
@@ -0,0 +1,205 @@
+import argparse
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any
+
+from pymongo import errors
+
+from app.db.filters import (
+    FILTER_KEYS,
+    HandoverFilters,
+    build_handover_query,
+)
+
+logger = logging.getLogger(__name__)
+
+LIST_SORT = [
+    ("submission_timestamp", -1),
+    ("_id", -1),
+]
+COLLECTION_SCAN_STAGE = "COLLSCAN"
+
+# A representative value per filter, for explaining plans from the CLI.
+SAMPLE_FILTER_VALUES: HandoverFilters = {
+    "facility": "sample",
+    "submitted_by": "sample",
+    "date_from": "2025-01-01",
+    "date_to": "2025-01-31",
+    "receiving_personnel": "sample",
+    "cylinder_id": "sample",
+}
+
+
+@dataclass
+class QueryPlanReport:
+    filter_keys: tuple[str, ...]
+    stages: list[str] = field(default_factory=list)
+    indexes: list[str] = field(default_factory=list)
+
+    @property
+    def uses_collection_scan(self) -> bool:
+        return COLLECTION_SCAN_STAGE in self.stages
+
+
+def _walk_plan(
+    plan: dict[str, Any], report: QueryPlanReport
+) -> None:
+    # Slot-based engines nest the classic plan under "queryPlan".
+    plan = plan.get("queryPlan", plan)
+    if "stage" in plan:
+        report.stages.append(plan["stage"])
+    if plan.get("indexName"):
+        report.indexes.append(plan["indexName"])
+    for key in ("inputStage", "outerStage", "innerStage"):
+        if isinstance(plan.get(key), dict):
+            _walk_plan(plan[key], report)
+    for child in plan.get("inputStages") or ():
+        _walk_plan(child, report)
+
+
+def plan_report(
+    explain: dict[str, Any], filter_keys: tuple[str, ...]
+) -> QueryPlanReport:
+    report = QueryPlanReport(filter_keys)
+    winning_plan = explain.get("queryPlanner", {}).get(
+        "winningPlan", {}
+    )
+    _walk_plan(winning_plan, report)
+    return report
+
+
+def explain_handover_query(
+    collection: Any,
+    query: dict[str, Any],
+    filter_keys: tuple[str, ...],
+    limit: int = 25,
+) -> QueryPlanReport:
+    explain = (
+        collection.find(query, {"_id": 1})
+        .sort(LIST_SORT)
+        .limit(limit)
+        .explain()
+    )
+    return plan_report(explain, filter_keys)
+
+
+_checked_filter_keys: set[tuple[str, ...]] = set()
+_checked_lock = threading.Lock()
+
+
+def check_filter_plan_once(
+    collection: Any,
+    query: dict[str, Any],
+    filters: HandoverFilters | None,
+) -> QueryPlanReport | None:
+    """Explain the first list query for each combination of filters and
+    log a warning if MongoDB answers it with a collection scan.
+
+    Runs on the DB thread after the page has been fetched; later queries
+    with the same filter keys are not explained again.
+    """
+    filter_keys = tuple(sorted(filters or {}))
+    if not filter_keys:
+        return None
+    with _checked_lock:
+        if filter_keys in _checked_filter_keys:
+            return None
+        _checked_filter_keys.add(filter_keys)
+    try:
+        report = explain_handover_query(
+            collection, query, filter_keys
+        )
+    except errors.PyMongoError as e:
+        logger.info(
+            "Query plan check skipped for %s: %s",
+            ", ".join(filter_keys),
+            e,
+        )
+        return None
+    if report.uses_collection_scan:
+        logger.warning(
+            "Submissions filtered by %s fall back to a collection scan (%s); "
+            "check that the declared indexes were provisioned.",
+            ", ".join(filter_keys),
+            " > ".join(report.stages),
+        )
+    return report
+
+
+def check_all_filter_plans(
+    collection: Any,
+) -> list[QueryPlanReport]:
+    """Explain the list query for each filter on its own and for all of
+    them combined."""
+    combinations = [(key,) for key in FILTER_KEYS]
+    combinations.append(tuple(FILTER_KEYS))
+    reports = []
+    for filter_keys in combinations:
+        filters: HandoverFilters = {
+            key: SAMPLE_FILTER_VALUES[key]
+            for key in filter_keys
+        }
+        reports.append(
+            explain_handover_query(
+                collection,
+                build_handover_query(filters),
+                filter_keys,
+            )
+        )
+    return reports
+
+
+def main() -> None:
+    from app.db.client_pool import client_pool
+    from app.db.repository import (
+        DB_NAME,
+        HANDOVER_COLLECTION_NAME,
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Explain the submissions list query for every filter."
+    )
+    parser.add_argument(
+        "--username",
+        default=os.environ.get(
+            "MONGO_INDEX_ADMIN_USERNAME"
+        ),
+    )
+    parser.add_argument(
+        "--password",
+        default=os.environ.get(
+            "MONGO_INDEX_ADMIN_PASSWORD"
+        ),
+    )
+    args = parser.parse_args()
+    if not args.username or not args.password:
+        parser.error(
+            "--username and --password are required"
+        )
+    client = client_pool.acquire(
+        args.username, args.password
+    )
+    try:
+        reports = check_all_filter_plans(
+            client[DB_NAME][HANDOVER_COLLECTION_NAME]
+        )
+    finally:
+        client_pool.release(client)
+        client_pool.close_all()
+    scans = 0
+    for report in reports:
+        scans += report.uses_collection_scan
+        print(
+            f"{'SCAN' if report.uses_collection_scan else 'ok':<5}"
+            f"{'+'.join(report.filter_keys):<40}"
+            f"{' > '.join(report.stages)}"
+            f"  [{', '.join(report.indexes) or '-'}]"
+        )
+    if scans:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
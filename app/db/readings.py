@@ -0,0 +1,380 @@
+import argparse
+import datetime
+import logging
+import os
+import time
+from typing import Any, Iterable, TypedDict
+
+from pymongo import ASCENDING, IndexModel, errors
+
+from app.db.check_encoding import decode_checks
+from app.db.timestamp_migration import (
+    MIGRATION_COLLECTION_NAME,
+)
+from app.db.timestamps import parse_timestamp
+from app.validation.cylinder_checks import SIZE_KEYS
+
+logger = logging.getLogger(__name__)
+
+READINGS_COLLECTION_NAME = "Cylinder_readings"
+READINGS_TIME_FIELD = "timestamp"
+READINGS_META_FIELD = "meta"
+READINGS_COLLECTION_OPTIONS = {
+    "timeseries": {
+        "timeField": READINGS_TIME_FIELD,
+        "metaField": READINGS_META_FIELD,
+        "granularity": "hours",
+    }
+}
+READINGS_INDEXES = [
+    IndexModel(
+        [
+            (
+                f"{READINGS_META_FIELD}.cylinder_id",
+                ASCENDING,
+            ),
+            (READINGS_TIME_FIELD, ASCENDING),
+        ],
+        name="cylinder_id_timestamp",
+    ),
+    IndexModel(
+        [
+            (f"{READINGS_META_FIELD}.facility", ASCENDING),
+            (f"{READINGS_META_FIELD}.size", ASCENDING),
+            (READINGS_TIME_FIELD, ASCENDING),
+        ],
+        name="facility_size_timestamp",
+    ),
+    IndexModel(
+        [("handover_id", ASCENDING)],
+        name="handover_id",
+    ),
+]
+READINGS_SOURCE_PROJECTION = {
+    "facility": 1,
+    "submission_timestamp": 1,
+    "cylinder_checks_2m": 1,
+    "cylinder_checks_4m": 1,
+    "cylinder_checks_7m": 1,
+}
+READINGS_BACKFILL_ID = "cylinder_readings_backfill"
+READINGS_BACKFILL_BATCH_SIZE = 500
+READINGS_QUERY_LIMIT = 5000
+
+
+class ReadingsBackfillProgress(TypedDict):
+    handovers: int
+    readings: int
+    skipped: int
+
+
+def _reading_time(value: Any) -> datetime.datetime | None:
+    if isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return parse_timestamp(value)
+        except ValueError:
+            return None
+    return None
+
+
+def readings_from_handover(
+    document: dict[str, Any],
+) -> list[dict[str, Any]]:
+    """One time-series measurement per check of ``document``.
+
+    The time field must be a BSON date, so a handover whose legacy
+    timestamp cannot be parsed yields nothing.
+    """
+    timestamp = _reading_time(
+        document.get("submission_timestamp")
+    )
+    if timestamp is None:
+        return []
+    facility = document.get("facility") or ""
+    readings = []
+    for size_key in SIZE_KEYS:
+        checks = decode_checks(
+            document.get(f"cylinder_checks_{size_key}")
+        )
+        for number, check in enumerate(checks, start=1):
+            readings.append(
+                {
+                    READINGS_TIME_FIELD: timestamp,
+                    READINGS_META_FIELD: {
+                        "cylinder_id": check.get(
+                            "cylinder_id"
+                        ),
+                        "size": size_key,
+                        "facility": facility,
+                    },
+                    "handover_id": document["_id"],
+                    "check_number": number,
+                    "purity": check.get("purity"),
+                    "pressure": check.get("pressure"),
+                }
+            )
+    return readings
+
+
+def ensure_readings_collection(database: Any) -> bool:
+    """Create the time-series collection if it does not exist yet.
+
+    Must run before its indexes are created: creating an index on a
+    missing collection would silently make a regular one.
+    """
+    if (
+        READINGS_COLLECTION_NAME
+        in database.list_collection_names(
+            filter={"name": READINGS_COLLECTION_NAME}
+        )
+    ):
+        return False
+    try:
+        database.create_collection(
+            READINGS_COLLECTION_NAME,
+            **READINGS_COLLECTION_OPTIONS,
+        )
+    except errors.CollectionInvalid:
+        return False
+    return True
+
+
+def insert_readings(
+    readings_collection: Any,
+    documents: Iterable[dict[str, Any]],
+) -> int:
+    readings = [
+        reading
+        for document in documents
+        for reading in readings_from_handover(document)
+    ]
+    if readings:
+        readings_collection.insert_many(
+            readings, ordered=False
+        )
+    return len(readings)
+
+
+def delete_readings(
+    readings_collection: Any, handover_ids: list[Any]
+) -> int:
+    """Remove the measurements written for ``handover_ids``.
+
+    ``handover_id`` is a measurement field, not metadata, and deleting
+    from a time-series collection by anything other than the
+    ``metaField`` needs MongoDB 7.0 or later. Older servers reject the
+    delete with an ``OperationFailure``.
+    """
+    if not handover_ids:
+        return 0
+    return readings_collection.delete_many(
+        {"handover_id": {"$in": handover_ids}}
+    ).deleted_count
+
+
+def readings_range_query(
+    cylinder_id: str | None = None,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    facility: str | None = None,
+    size: str | None = None,
+) -> dict[str, Any]:
+    """Measurements in ``[start, end)`` for the given metadata.
+
+    Metadata equality and a time range are what bucket pruning works on,
+    so these are the only filters offered.
+    """
+    query: dict[str, Any] = {}
+    for key, value in (
+        ("cylinder_id", cylinder_id),
+        ("facility", facility),
+        ("size", size),
+    ):
+        if value:
+            query[f"{READINGS_META_FIELD}.{key}"] = value
+    time_range: dict[str, datetime.datetime] = {}
+    if start is not None:
+        time_range["$gte"] = start
+    if end is not None:
+        time_range["$lt"] = end
+    if time_range:
+        query[READINGS_TIME_FIELD] = time_range
+    return query
+
+
+def find_readings(
+    readings_collection: Any,
+    cylinder_id: str | None = None,
+    start: datetime.datetime | None = None,
+    end: datetime.datetime | None = None,
+    facility: str | None = None,
+    size: str | None = None,
+    limit: int = READINGS_QUERY_LIMIT,
+) -> list[dict[str, Any]]:
+    return list(
+        readings_collection.find(
+            readings_range_query(
+                cylinder_id, start, end, facility, size
+            ),
+            {"_id": 0},
+        )
+        .sort(READINGS_TIME_FIELD, ASCENDING)
+        .limit(limit)
+    )
+
+
+def backfill_readings(
+    database: Any,
+    handovers_collection_name: str,
+    batch_size: int = READINGS_BACKFILL_BATCH_SIZE,
+    pause_seconds: float = 0.0,
+    restart: bool = False,
+) -> ReadingsBackfillProgress:
+    """Write readings for handovers stored before live writes began.
+
+    Same shape as the other migrations: ``_id`` order, ``batch_size`` at
+    a time, checkpointed after each batch. Time-series collections have
+    no unique indexes, so handovers that already have readings (written
+    live, or by an interrupted batch) are skipped by ``handover_id``.
+    """
+    ensure_readings_collection(database)
+    handovers = database[handovers_collection_name]
+    readings = database[READINGS_COLLECTION_NAME]
+    migrations = database[MIGRATION_COLLECTION_NAME]
+    if restart:
+        migrations.delete_one({"_id": READINGS_BACKFILL_ID})
+    checkpoint = migrations.find_one(
+        {"_id": READINGS_BACKFILL_ID}
+    ) or {
+        "last_id": None,
+        "handovers": 0,
+        "readings": 0,
+        "skipped": 0,
+    }
+    last_id = checkpoint["last_id"]
+    progress: ReadingsBackfillProgress = {
+        "handovers": checkpoint["handovers"],
+        "readings": checkpoint["readings"],
+        "skipped": checkpoint["skipped"],
+    }
+    while True:
+        query = (
+            {}
+            if last_id is None
+            else {"_id": {"$gt": last_id}}
+        )
+        batch = list(
+            handovers.find(
+                query, READINGS_SOURCE_PROJECTION
+            )
+            .sort("_id", ASCENDING)
+            .limit(batch_size)
+        )
+        if not batch:
+            break
+        written = set(
+            readings.distinct(
+                "handover_id",
+                {
+                    "handover_id": {
+                        "$in": [
+                            document["_id"]
+                            for document in batch
+                        ]
+                    }
+                },
+            )
+        )
+        pending = [
+            document
+            for document in batch
+            if document["_id"] not in written
+        ]
+        progress["skipped"] += len(batch) - len(pending)
+        progress["readings"] += insert_readings(
+            readings, pending
+        )
+        progress["handovers"] += len(pending)
+        last_id = batch[-1]["_id"]
+        migrations.update_one(
+            {"_id": READINGS_BACKFILL_ID},
+            {"$set": {"last_id": last_id, **progress}},
+            upsert=True,
+        )
+        logger.info(
+            "Backfilled readings for %d handovers",
+            progress["handovers"],
+        )
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return progress
+
+
+def main() -> None:
+    from app.db.client_pool import client_pool
+    from app.db.repository import (
+        DB_NAME,
+        HANDOVER_COLLECTION_NAME,
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Backfill the cylinder readings time-series collection."
+    )
+    parser.add_argument(
+        "--username",
+        default=os.environ.get(
+            "MONGO_INDEX_ADMIN_USERNAME"
+        ),
+    )
+    parser.add_argument(
+        "--password",
+        default=os.environ.get(
+            "MONGO_INDEX_ADMIN_PASSWORD"
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=READINGS_BACKFILL_BATCH_SIZE,
+    )
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=0.0,
+        help="Seconds to sleep between batches.",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the saved checkpoint.",
+    )
+    args = parser.parse_args()
+    if not args.username or not args.password:
+        parser.error(
+            "--username and --password are required"
+        )
+    logging.basicConfig(level=logging.INFO)
+    client = client_pool.acquire(
+        args.username, args.password
+    )
+    try:
+        progress = backfill_readings(
+            client[DB_NAME],
+            HANDOVER_COLLECTION_NAME,
+            args.batch_size,
+            args.pause,
+            args.restart,
+        )
+    finally:
+        client_pool.release(client)
+        client_pool.close_all()
+    print(
+        f"Wrote {progress['readings']} readings from {progress['handovers']} handovers; "
+        f"{progress['skipped']} already had readings."
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,779 @@
+import asyncio
+import datetime
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    TextIO,
+    TypeVar,
+)
+
+from bson.objectid import ObjectId
+from pymongo import errors
+
+from app.db.aggregations import (
+    DashboardSummary,
+    dashboard_pipeline,
+    shape_dashboard_result,
+)
+from app.db.cache import submissions_cache
+from app.db.check_encoding import (
+    decode_handover_checks,
+    encode_handover_checks,
+)
+from app.db.client_pool import client_pool
+from app.db.cylinder_history import (
+    CYLINDER_HISTORY_PAGE_SIZE,
+    CYLINDER_HISTORY_PROJECTION,
+)
+from app.db.filters import (
+    HandoverFilters,
+    build_handover_query,
+)
+from app.db.query_plans import (
+    LIST_SORT,
+    check_filter_plan_once,
+)
+from app.db.readings import (
+    READINGS_COLLECTION_NAME,
+    READINGS_QUERY_LIMIT,
+    delete_readings,
+    find_readings,
+    insert_readings,
+)
+from app.db.rollups import (
+    ROLLUP_CHANGES_COLLECTION_NAME,
+    ROLLUP_COLLECTION_NAME,
+    ROLLUP_SOURCE_PROJECTION,
+    apply_rollups,
+    can_use_rollups,
+    recompute_rollups,
+    record_rollup_changes,
+    refresh_rollup_extremes,
+    rollup_dashboard_pipeline,
+    rollup_facets_to_dashboard,
+    rollup_day,
+    rollups_rebuilt,
+)
+from app.db.shared import shared_redis
+from app.db.timestamps import (
+    keyset_query,
+    keyset_sort_key,
+)
+from app.importers.handover_import import (
+    ImportReport,
+    import_handovers,
+)
+
+logger = logging.getLogger(__name__)
+
+DB_NAME = "Cylinder_Inventory"
+HANDOVER_COLLECTION_NAME = "Handover_records"
+DB_WORKER_THREADS = 16
+EXPORT_BATCH_SIZE = 1000
+DUPLICATE_KEY_ERROR = 11000
+HISTORY_GENERATION_KEY = "handover-history:generation"
+
+SUMMARY_PROJECTION = {
+    "facility": 1,
+    "bmt_in_charge": 1,
+    "receiving_personnel": 1,
+    "qty_2m": 1,
+    "qty_4m": 1,
+    "qty_7m": 1,
+    "submitted_by": 1,
+    "submission_timestamp": 1,
+}
+CHECKS_PROJECTION = {
+    "cylinder_checks_2m": 1,
+    "cylinder_checks_4m": 1,
+    "cylinder_checks_7m": 1,
+}
+
+T = TypeVar("T")
+
+_history_generation = 0
+_rollups_rebuilt = False
+
+_db_executor = ThreadPoolExecutor(
+    max_workers=DB_WORKER_THREADS,
+    thread_name_prefix="mongo-io",
+)
+
+
+async def run_db(
+    fn: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _db_executor, partial(fn, *args, **kwargs)
+    )
+
+
+def _read_history_generation() -> int:
+    redis_client = shared_redis()
+    if redis_client is not None:
+        try:
+            return int(
+                redis_client.get(HISTORY_GENERATION_KEY)
+                or 0
+            )
+        except Exception:
+            logger.warning(
+                "Shared history generation unavailable"
+            )
+    return _history_generation
+
+
+async def history_generation() -> int:
+    """Bumped whenever older history changes (deletes, imports, late
+    syncs); shared through Redis when several workers serve the app."""
+    return await run_db(_read_history_generation)
+
+
+def _publish_history_change() -> None:
+    redis_client = shared_redis()
+    if redis_client is not None:
+        try:
+            redis_client.incr(HISTORY_GENERATION_KEY)
+        except Exception:
+            logger.warning(
+                "Shared history generation not bumped"
+            )
+    submissions_cache.invalidate()
+
+
+async def _record_history_change(
+    changed_count: int,
+) -> None:
+    global _history_generation
+    if changed_count:
+        _history_generation += 1
+        await run_db(_publish_history_change)
+
+
+def _filtered_query(
+    query: dict[str, Any], filters: HandoverFilters | None
+) -> dict[str, Any]:
+    filter_query = build_handover_query(filters)
+    if not filter_query:
+        return query
+    if not query:
+        return filter_query
+    return {"$and": [filter_query, query]}
+
+
+async def acquire_client(
+    username: str, password: str
+) -> Any:
+    return await run_db(
+        client_pool.acquire, username, password
+    )
+
+
+class HandoverRepository:
+    """Async facade over ``Handover_records``.
+
+    pymongo is synchronous, so every call (including cursor iteration)
+    runs on a dedicated thread pool and the Reflex event loop stays free
+    for other sessions while a round-trip is in flight.
+    """
+
+    def __init__(self, client: Any, username: str):
+        self._client = client
+        # Cached results are scoped per database user, since users can
+        # hold different Mongo roles.
+        self.username = username
+        self.db = client[DB_NAME]
+        self.collection = self.db[HANDOVER_COLLECTION_NAME]
+        self.rollups = self.db[ROLLUP_COLLECTION_NAME]
+        self.rollup_changes = self.db[
+            ROLLUP_CHANGES_COLLECTION_NAME
+        ]
+        self.readings = self.db[READINGS_COLLECTION_NAME]
+
+    @classmethod
+    async def connect(
+        cls, username: str, password: str
+    ) -> "HandoverRepository":
+        return cls(
+            await acquire_client(username, password),
+            username,
+        )
+
+    def close(self) -> None:
+        client_pool.release(self._client)
+
+    def _update_rollups(
+        self, documents: list[dict[str, Any]], sign: int
+    ) -> None:
+        try:
+            facility_days = apply_rollups(
+                self.rollups, documents, sign
+            )
+            if sign < 0:
+                refresh_rollup_extremes(
+                    self.collection,
+                    self.rollups,
+                    facility_days,
+                )
+            record_rollup_changes(
+                self.rollup_changes, facility_days
+            )
+        except errors.PyMongoError as e:
+            logger.warning(
+                "Daily rollups not updated, rebuild with `python -m app.db.rollups`: %s",
+                e,
+            )
+
+    def _can_read_rollups(self) -> bool:
+        """Rollups are only complete once a full rebuild has run."""
+        global _rollups_rebuilt
+        if not _rollups_rebuilt:
+            try:
+                _rollups_rebuilt = rollups_rebuilt(self.db)
+            except errors.PyMongoError:
+                return False
+        return _rollups_rebuilt
+
+    def _recompute_rollups(
+        self, documents: list[dict[str, Any]]
+    ) -> None:
+        facility_days = {
+            (
+                document.get("facility") or "",
+                rollup_day(
+                    document.get("submission_timestamp")
+                ),
+            )
+            for document in documents
+        }
+        try:
+            recompute_rollups(
+                self.collection, self.rollups, facility_days
+            )
+            record_rollup_changes(
+                self.rollup_changes, facility_days
+            )
+        except errors.PyMongoError as e:
+            logger.warning(
+                "Daily rollups not updated, rebuild with `python -m app.db.rollups`: %s",
+                e,
+            )
+
+    def _write_readings(
+        self, documents: list[dict[str, Any]]
+    ) -> None:
+        try:
+            insert_readings(self.readings, documents)
+        except errors.PyMongoError as e:
+            logger.warning(
+                "Cylinder readings not written, backfill with `python -m app.db.readings`: %s",
+                e,
+            )
+
+    def _delete_readings(
+        self, handover_ids: list[Any]
+    ) -> None:
+        try:
+            delete_readings(self.readings, handover_ids)
+        except errors.OperationFailure as e:
+            logger.warning(
+                "Cylinder readings of deleted handovers not removed; "
+                "deleting time-series measurements needs MongoDB 7.0+: %s",
+                e,
+            )
+        except errors.PyMongoError as e:
+            logger.warning(
+                "Cylinder readings of deleted handovers not removed: %s",
+                e,
+            )
+
+    def _after_insert(
+        self, documents: list[dict[str, Any]]
+    ) -> None:
+        self._update_rollups(documents, 1)
+        self._write_readings(documents)
+
+    def _after_duplicate_insert(
+        self, documents: list[dict[str, Any]]
+    ) -> None:
+        """Finish the post-insert work of a retried write.
+
+        A duplicate key means an earlier attempt landed but never got
+        far enough to report back, so its rollups and readings are
+        most likely missing. Readings already written are skipped by
+        ``handover_id``.
+        """
+        self._update_rollups(documents, 1)
+        try:
+            written = set(
+                self.readings.distinct(
+                    "handover_id",
+                    {
+                        "handover_id": {
+                            "$in": [
+                                document["_id"]
+                                for document in documents
+                            ]
+                        }
+                    },
+                )
+            )
+        except errors.PyMongoError as e:
+            logger.warning(
+                "Cylinder readings not written, backfill with `python -m app.db.readings`: %s",
+                e,
+            )
+            return
+        self._write_readings(
+            [
+                document
+                for document in documents
+                if document["_id"] not in written
+            ]
+        )
+
+    async def insert_handovers(
+        self, documents: list[dict[str, Any]]
+    ) -> dict[int, str]:
+        """Insert documents that already carry their ``_id``.
+
+        Duplicate keys mean an earlier attempt landed, so they count as
+        written. Returns the positions that failed for any other reason.
+        """
+        documents = [
+            encode_handover_checks(document)
+            for document in documents
+        ]
+
+        def _insert() -> tuple[int, bool, dict[int, str]]:
+            failures: dict[int, str] = {}
+            duplicates: set[int] = set()
+            newest = self.collection.find_one(
+                {},
+                {"submission_timestamp": 1},
+                sort=LIST_SORT,
+            )
+            try:
+                self.collection.insert_many(
+                    documents, ordered=False
+                )
+            except errors.BulkWriteError as e:
+                for write_error in e.details.get(
+                    "writeErrors", []
+                ):
+                    if (
+                        write_error.get("code")
+                        == DUPLICATE_KEY_ERROR
+                    ):
+                        duplicates.add(write_error["index"])
+                    else:
+                        failures[write_error["index"]] = (
+                            write_error.get(
+                                "errmsg", "Write failed."
+                            )
+                        )
+            inserted = [
+                document
+                for position, document in enumerate(
+                    documents
+                )
+                if position not in failures
+                and position not in duplicates
+            ]
+            if inserted:
+                self._after_insert(inserted)
+            if duplicates:
+                self._after_duplicate_insert(
+                    [
+                        documents[position]
+                        for position in duplicates
+                    ]
+                )
+            landed = [
+                document
+                for position, document in enumerate(
+                    documents
+                )
+                if position not in failures
+            ]
+            late = newest is not None and any(
+                keyset_sort_key(
+                    document.get("submission_timestamp"),
+                    document["_id"],
+                )
+                < keyset_sort_key(
+                    newest.get("submission_timestamp"),
+                    newest["_id"],
+                )
+                for document in landed
+            )
+            if landed and not late:
+                submissions_cache.invalidate()
+            return len(inserted), late, failures
+
+        inserted_count, late, failures = await run_db(
+            _insert
+        )
+        # Open views only track handovers above their watermark, which is
+        # at most the newest stored one; anything newer than that reaches
+        # them through the delta query. A late sync lands below it.
+        if late:
+            await _record_history_change(inserted_count)
+        return failures
+
+    async def import_handovers(
+        self,
+        stream: TextIO,
+        import_format: str,
+        submitted_by: str,
+        bmt_in_charge: str,
+    ) -> ImportReport:
+        report = await run_db(
+            import_handovers,
+            self.collection,
+            stream,
+            import_format,
+            submitted_by,
+            bmt_in_charge,
+            after_insert=self._after_insert,
+        )
+        await _record_history_change(report.inserted)
+        return report
+
+    def _page_cache_key(
+        self,
+        after: tuple[Any, str] | None,
+        limit: int,
+        filters: HandoverFilters | None,
+    ) -> str:
+        return f"{self.username}:handover_page:{sorted((filters or {}).items())!r}:{after!r}:{limit}"
+
+    async def cached_handovers_page(
+        self,
+        after: tuple[Any, str] | None = None,
+        limit: int = 25,
+        filters: HandoverFilters | None = None,
+    ) -> tuple[list[dict[str, Any]], bool] | None:
+        """``list_handovers_page`` from the cache alone, else ``None``.
+
+        Never queries MongoDB, so callers can try it before deciding
+        whether to show a loading state.
+        """
+        cache_key = self._page_cache_key(
+            after, limit, filters
+        )
+
+        def _get() -> list[dict[str, Any]] | None:
+            return submissions_cache.get(
+                cache_key,
+                submissions_cache.current_generation(),
+            )
+
+        documents = await run_db(_get)
+        if documents is None:
+            return None
+        return documents[:limit], len(documents) > limit
+
+    async def list_handovers_page(
+        self,
+        after: tuple[Any, str] | None = None,
+        limit: int = 25,
+        filters: HandoverFilters | None = None,
+    ) -> tuple[list[dict[str, Any]], bool]:
+        query = _filtered_query(
+            {} if after is None else keyset_query(after),
+            filters,
+        )
+        cache_key = self._page_cache_key(
+            after, limit, filters
+        )
+
+        def _fetch() -> list[dict[str, Any]]:
+            generation = (
+                submissions_cache.current_generation()
+            )
+            cached = submissions_cache.get(
+                cache_key, generation
+            )
+            if cached is not None:
+                return cached
+            documents = list(
+                self.collection.find(
+                    query, SUMMARY_PROJECTION
+                )
+                .sort(LIST_SORT)
+                .limit(limit + 1)
+            )
+            submissions_cache.set(
+                cache_key, documents, generation
+            )
+            check_filter_plan_once(
+                self.collection, query, filters
+            )
+            return documents
+
+        documents = await run_db(_fetch)
+        return documents[:limit], len(documents) > limit
+
+    async def list_handovers_newer_than(
+        self,
+        watermark: tuple[Any, str],
+        limit: int,
+        filters: HandoverFilters | None = None,
+    ) -> list[dict[str, Any]]:
+        query = _filtered_query(
+            keyset_query(watermark, newer=True), filters
+        )
+
+        def _fetch() -> list[dict[str, Any]]:
+            return list(
+                self.collection.find(
+                    query, SUMMARY_PROJECTION
+                )
+                .sort(
+                    [
+                        ("submission_timestamp", 1),
+                        ("_id", 1),
+                    ]
+                )
+                .limit(limit)
+            )
+
+        return await run_db(_fetch)
+
+    async def list_cylinder_history(
+        self,
+        cylinder_id: str,
+        after: tuple[Any, str] | None = None,
+        limit: int = CYLINDER_HISTORY_PAGE_SIZE,
+    ) -> tuple[list[dict[str, Any]], bool]:
+        """Handovers that checked ``cylinder_id``, newest first.
+
+        Each size's ``(cylinder_id, submission_timestamp, _id)`` multikey
+        index answers one ``$or`` branch already in list order, so a page
+        reads about ``limit`` index keys however long the history is.
+        """
+        query = _filtered_query(
+            {} if after is None else keyset_query(after),
+            {"cylinder_id": cylinder_id},
+        )
+
+        def _fetch() -> list[dict[str, Any]]:
+            return list(
+                self.collection.find(
+                    query, CYLINDER_HISTORY_PROJECTION
+                )
+                .sort(LIST_SORT)
+                .limit(limit + 1)
+            )
+
+        documents = await run_db(_fetch)
+        return documents[:limit], len(documents) > limit
+
+    async def list_cylinder_readings(
+        self,
+        cylinder_id: str | None = None,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+        facility: str | None = None,
+        size: str | None = None,
+        limit: int = READINGS_QUERY_LIMIT,
+    ) -> list[dict[str, Any]]:
+        """Check readings in ``[start, end)``, oldest first.
+
+        Reads the time-series collection, where one cylinder's readings
+        sit together in a few buckets instead of being unwound from
+        every handover that mentions it.
+        """
+        return await run_db(
+            find_readings,
+            self.readings,
+            cylinder_id,
+            start,
+            end,
+            facility,
+            size,
+            limit,
+        )
+
+    async def iter_handover_batches(
+        self,
+        filters: HandoverFilters | None = None,
+        batch_size: int = EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        cursor = (
+            self.collection.find(
+                build_handover_query(filters)
+            )
+            .sort(
+                [
+                    ("submission_timestamp", -1),
+                    ("_id", -1),
+                ]
+            )
+            .batch_size(batch_size)
+        )
+        try:
+            while True:
+                documents = await run_db(
+                    lambda: list(islice(cursor, batch_size))
+                )
+                if not documents:
+                    return
+                yield documents
+        finally:
+            await run_db(cursor.close)
+
+    async def dashboard_summary(
+        self,
+        filters: HandoverFilters | None = None,
+        period: str = "month",
+    ) -> DashboardSummary:
+        cache_key = f"{self.username}:handover_dashboard:{sorted((filters or {}).items())!r}:{period}"
+
+        def _aggregate() -> DashboardSummary:
+            generation = (
+                submissions_cache.current_generation()
+            )
+            cached = submissions_cache.get(
+                cache_key, generation
+            )
+            if cached is not None:
+                return cached
+            if (
+                can_use_rollups(filters)
+                and self._can_read_rollups()
+            ):
+                facets = rollup_facets_to_dashboard(
+                    next(
+                        self.rollups.aggregate(
+                            rollup_dashboard_pipeline(
+                                filters, period
+                            )
+                        ),
+                        None,
+                    )
+                )
+            else:
+                facets = next(
+                    self.collection.aggregate(
+                        dashboard_pipeline(filters, period)
+                    ),
+                    None,
+                )
+            summary = shape_dashboard_result(facets)
+            submissions_cache.set(
+                cache_key, summary, generation
+            )
+            return summary
+
+        return await run_db(_aggregate)
+
+    async def existing_handover_ids(
+        self, handover_ids: list[str]
+    ) -> set[str]:
+        if not handover_ids:
+            return set()
+
+        def _fetch() -> set[str]:
+            return {
+                str(document["_id"])
+                for document in self.collection.find(
+                    {
+                        "_id": {
+                            "$in": [
+                                ObjectId(handover_id)
+                                for handover_id in handover_ids
+                            ]
+                        }
+                    },
+                    {"_id": 1},
+                )
+            }
+
+        return await run_db(_fetch)
+
+    async def get_handover_checks(
+        self, submission_id: str
+    ) -> dict[str, Any] | None:
+        cache_key = f"{self.username}:handover_checks:{submission_id}"
+
+        def _fetch() -> dict[str, Any] | None:
+            generation = (
+                submissions_cache.current_generation()
+            )
+            cached = submissions_cache.get(
+                cache_key, generation
+            )
+            if cached is not None:
+                return cached
+            document = self.collection.find_one(
+                {"_id": ObjectId(submission_id)},
+                CHECKS_PROJECTION,
+            )
+            if document is not None:
+                submissions_cache.set(
+                    cache_key, document, generation
+                )
+            return document
+
+        document = await run_db(_fetch)
+        return (
+            None
+            if document is None
+            else decode_handover_checks(document)
+        )
+
+    def _delete_with_rollups(
+        self, submission_ids: list[str]
+    ) -> int:
+        ids = [
+            ObjectId(submission_id)
+            for submission_id in submission_ids
+        ]
+        deleted = list(
+            self.collection.find(
+                {"_id": {"$in": ids}},
+                ROLLUP_SOURCE_PROJECTION,
+            )
+        )
+        if not deleted:
+            return 0
+        deleted_ids = [
+            document["_id"] for document in deleted
+        ]
+        deleted_count = self.collection.delete_many(
+            {"_id": {"$in": deleted_ids}}
+        ).deleted_count
+        if deleted_count == len(deleted):
+            self._update_rollups(deleted, -1)
+        else:
+            # Another request removed some of these in between, and
+            # which ones is unknown, so recount the days instead.
+            self._recompute_rollups(deleted)
+        self._delete_readings(deleted_ids)
+        return deleted_count
+
+    async def delete_handover(
+        self, submission_id: str
+    ) -> int:
+        deleted_count = await run_db(
+            self._delete_with_rollups, [submission_id]
+        )
+        await _record_history_change(deleted_count)
+        return deleted_count
+
+    async def delete_handovers(
+        self, submission_ids: list[str]
+    ) -> int:
+        deleted_count = await run_db(
+            self._delete_with_rollups, submission_ids
+        )
+        await _record_history_change(deleted_count)
+        return deleted_count
\ No newline at end of file
@@ -0,0 +1,658 @@
+import argparse
+import datetime
+import logging
+import os
+import time
+from collections import defaultdict
+from typing import Any, Iterable
+
+from bson.objectid import ObjectId
+from pymongo import (
+    ASCENDING,
+    DeleteOne,
+    IndexModel,
+    UpdateOne,
+)
+
+from app.db.aggregations import (
+    DASHBOARD_PERIODS,
+    PRESSURE_BUCKETS,
+    PURITY_BUCKETS,
+)
+from app.db.check_encoding import decode_checks
+from app.db.filters import (
+    HandoverFilters,
+    build_handover_query,
+)
+from app.db.timestamp_migration import (
+    MIGRATION_COLLECTION_NAME,
+)
+from app.validation.cylinder_checks import SIZE_KEYS
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_COLLECTION_NAME = "Handover_daily_rollups"
+ROLLUP_CHANGES_COLLECTION_NAME = "Handover_rollup_changes"
+ROLLUP_REBUILD_ID = "handover_daily_rollups"
+# Change marks only matter while a rebuild runs, so they expire well
+# after any rebuild would have finished.
+ROLLUP_CHANGES_TTL_SECONDS = 24 * 60 * 60
+# How long the last replay waits after the swap for writes that were
+# already in flight to land in the new collection.
+ROLLUP_SWAP_GRACE_SECONDS = 2.0
+ROLLUP_REPLAY_MAX_PASSES = 5
+ROLLUP_ALL_SIZES = "all"
+ROLLUP_REBUILD_BATCH_SIZE = 1000
+ROLLUP_FILTER_KEYS = frozenset(
+    ("facility", "date_from", "date_to")
+)
+ROLLUP_SOURCE_PROJECTION = {
+    "facility": 1,
+    "submission_timestamp": 1,
+    "qty_2m": 1,
+    "qty_4m": 1,
+    "qty_7m": 1,
+    "cylinder_checks_2m": 1,
+    "cylinder_checks_4m": 1,
+    "cylinder_checks_7m": 1,
+}
+ROLLUP_INDEXES = [
+    IndexModel(
+        [
+            ("facility", ASCENDING),
+            ("day", ASCENDING),
+            ("size", ASCENDING),
+        ],
+        name="facility_day_size",
+        unique=True,
+    ),
+    IndexModel(
+        [("day", ASCENDING), ("size", ASCENDING)],
+        name="day_size",
+    ),
+]
+ROLLUP_CHANGES_INDEXES = [
+    IndexModel(
+        [("at", ASCENDING)],
+        name="at_ttl",
+        expireAfterSeconds=ROLLUP_CHANGES_TTL_SECONDS,
+    ),
+]
+
+_READINGS = (
+    ("purity", PURITY_BUCKETS),
+    ("pressure", PRESSURE_BUCKETS),
+)
+_COUNTERS = (
+    "handovers",
+    "quantity",
+    "checks",
+    "purity_count",
+    "purity_sum",
+    "pressure_count",
+    "pressure_sum",
+)
+_EXTREMES = (
+    "purity_min",
+    "purity_max",
+    "pressure_min",
+    "pressure_max",
+)
+
+RollupKey = tuple[str, str, str]
+
+
+def rollup_day(timestamp: Any) -> str:
+    if isinstance(timestamp, datetime.datetime):
+        return timestamp.date().isoformat()
+    return str(timestamp or "")[:10]
+
+
+def _bucket_key(
+    value: float, buckets: tuple[tuple[float, Any], ...]
+) -> str:
+    for (low, _), (high, _) in zip(buckets, buckets[1:]):
+        if low <= value < high:
+            return str(low)
+    return "other"
+
+
+def _is_reading(value: Any) -> bool:
+    return isinstance(
+        value, (int, float)
+    ) and not isinstance(value, bool)
+
+
+def _empty_rollup() -> dict[str, Any]:
+    rollup: dict[str, Any] = dict.fromkeys(_COUNTERS, 0)
+    rollup.update(dict.fromkeys(_EXTREMES))
+    for reading, _ in _READINGS:
+        rollup[f"{reading}_buckets"] = {}
+    return rollup
+
+
+def _add_check(
+    rollup: dict[str, Any], check: dict[str, Any]
+) -> None:
+    rollup["checks"] += 1
+    for reading, buckets in _READINGS:
+        value = check.get(reading)
+        bucket = (
+            _bucket_key(value, buckets)
+            if _is_reading(value)
+            else "other"
+        )
+        histogram = rollup[f"{reading}_buckets"]
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+        if not _is_reading(value):
+            continue
+        rollup[f"{reading}_count"] += 1
+        rollup[f"{reading}_sum"] += value
+        low, high = (
+            rollup[f"{reading}_min"],
+            rollup[f"{reading}_max"],
+        )
+        rollup[f"{reading}_min"] = (
+            value if low is None else min(low, value)
+        )
+        rollup[f"{reading}_max"] = (
+            value if high is None else max(high, value)
+        )
+
+
+def summarize_handovers(
+    documents: Iterable[dict[str, Any]],
+) -> dict[RollupKey, dict[str, Any]]:
+    """Fold handovers into per facility/day/size rollup values.
+
+    Every handover also lands in a ``size="all"`` row, which is the only
+    place a handover is counted once regardless of how many sizes it has.
+    """
+    rollups: dict[RollupKey, dict[str, Any]] = defaultdict(
+        _empty_rollup
+    )
+    for document in documents:
+        facility = document.get("facility") or ""
+        day = rollup_day(
+            document.get("submission_timestamp")
+        )
+        overall = rollups[(facility, day, ROLLUP_ALL_SIZES)]
+        overall["handovers"] += 1
+        for size_key in SIZE_KEYS:
+            quantity = document.get(f"qty_{size_key}") or 0
+            checks = decode_checks(
+                document.get(f"cylinder_checks_{size_key}")
+            )
+            if not quantity and not checks:
+                continue
+            sized = rollups[(facility, day, size_key)]
+            sized["handovers"] += 1
+            sized["quantity"] += quantity
+            overall["quantity"] += quantity
+            for check in checks:
+                _add_check(sized, check)
+                _add_check(overall, check)
+    return dict(rollups)
+
+
+def _rollup_filter(key: RollupKey) -> dict[str, str]:
+    facility, day, size = key
+    return {"facility": facility, "day": day, "size": size}
+
+
+def _increment(
+    key: RollupKey, rollup: dict[str, Any], sign: int
+) -> UpdateOne:
+    increments = {
+        counter: sign * rollup[counter]
+        for counter in _COUNTERS
+    }
+    for reading, _ in _READINGS:
+        for bucket, count in rollup[
+            f"{reading}_buckets"
+        ].items():
+            increments[f"{reading}_buckets.{bucket}"] = (
+                sign * count
+            )
+    update: dict[str, Any] = {"$inc": increments}
+    if sign > 0:
+        for operator, suffix in (
+            ("$min", "_min"),
+            ("$max", "_max"),
+        ):
+            extremes = {
+                f"{reading}{suffix}": rollup[
+                    f"{reading}{suffix}"
+                ]
+                for reading, _ in _READINGS
+                if rollup[f"{reading}{suffix}"] is not None
+            }
+            if extremes:
+                update[operator] = extremes
+    return UpdateOne(
+        _rollup_filter(key), update, upsert=sign > 0
+    )
+
+
+def apply_rollups(
+    rollups_collection: Any,
+    documents: Iterable[dict[str, Any]],
+    sign: int = 1,
+) -> set[tuple[str, str]]:
+    """``$inc`` the rollups by ``sign`` times ``documents``.
+
+    Returns the touched ``(facility, day)`` pairs. ``$inc`` cannot undo a
+    minimum or maximum, so after a decrement callers pass these pairs to
+    :func:`refresh_rollup_extremes`.
+    """
+    summary = summarize_handovers(documents)
+    if summary:
+        rollups_collection.bulk_write(
+            [
+                _increment(key, rollup, sign)
+                for key, rollup in summary.items()
+            ],
+            ordered=False,
+        )
+    return {(facility, day) for facility, day, _ in summary}
+
+
+def refresh_rollup_extremes(
+    handovers_collection: Any,
+    rollups_collection: Any,
+    facility_days: Iterable[tuple[str, str]],
+) -> None:
+    """Recompute min/max for facility/day groups after a decrement.
+
+    Counters stay with ``$inc``; only the extremes are re-read from
+    ``Handover_records``, and rows whose handovers dropped to zero go.
+    """
+    operations: list[Any] = []
+    for facility, day in facility_days:
+        documents = handovers_collection.find(
+            build_handover_query(
+                {
+                    "facility": facility,
+                    "date_from": day,
+                    "date_to": day,
+                }
+            ),
+            ROLLUP_SOURCE_PROJECTION,
+        )
+        summary = summarize_handovers(documents)
+        for size in (*SIZE_KEYS, ROLLUP_ALL_SIZES):
+            key = (facility, day, size)
+            if key in summary:
+                operations.append(
+                    UpdateOne(
+                        _rollup_filter(key),
+                        {
+                            "$set": {
+                                extreme: summary[key][
+                                    extreme
+                                ]
+                                for extreme in _EXTREMES
+                            }
+                        },
+                    )
+                )
+            else:
+                operations.append(
+                    DeleteOne(
+                        {
+                            **_rollup_filter(key),
+                            "handovers": {"$lte": 0},
+                        }
+                    )
+                )
+    if operations:
+        rollups_collection.bulk_write(
+            operations, ordered=False
+        )
+
+
+def record_rollup_changes(
+    changes_collection: Any,
+    facility_days: Iterable[tuple[str, str]],
+) -> None:
+    """Note which facility/days a live write just touched.
+
+    Written after the ``$inc``, so a rebuild that reads these marks can
+    recompute the days whose increments landed in the collection it is
+    about to replace.
+    """
+    now = datetime.datetime.utcnow()
+    marks = [
+        {"facility": facility, "day": day, "at": now}
+        for facility, day in facility_days
+    ]
+    if marks:
+        changes_collection.insert_many(marks, ordered=False)
+
+
+def recompute_rollups(
+    handovers_collection: Any,
+    rollups_collection: Any,
+    facility_days: Iterable[tuple[str, str]],
+) -> None:
+    """Replace the rows of the given facility/days with fresh totals."""
+    facility_days = set(facility_days)
+    if not facility_days:
+        return
+    rollups_collection.delete_many(
+        {
+            "$or": [
+                {"facility": facility, "day": day}
+                for facility, day in facility_days
+            ]
+        }
+    )
+    apply_rollups(
+        rollups_collection,
+        (
+            document
+            for facility, day in facility_days
+            for document in handovers_collection.find(
+                build_handover_query(
+                    {
+                        "facility": facility,
+                        "date_from": day,
+                        "date_to": day,
+                    }
+                ),
+                ROLLUP_SOURCE_PROJECTION,
+            )
+        ),
+    )
+
+
+def _changed_since(
+    changes_collection: Any, since: datetime.datetime
+) -> set[tuple[str, str]]:
+    return {
+        (mark["facility"], mark["day"])
+        for mark in changes_collection.find(
+            {"at": {"$gte": since}},
+            {"_id": 0, "facility": 1, "day": 1},
+        )
+    }
+
+
+def rollups_rebuilt(database: Any) -> bool:
+    """Whether a full rebuild has ever finished.
+
+    Until then the live rows only hold handovers written since rollups
+    were introduced, so the dashboard must not read them.
+    """
+    marker = database[MIGRATION_COLLECTION_NAME].find_one(
+        {"_id": ROLLUP_REBUILD_ID}, {"completed_at": 1}
+    )
+    return bool(marker and marker.get("completed_at"))
+
+
+def rebuild_rollups(
+    database: Any,
+    handovers_collection_name: str,
+    batch_size: int = ROLLUP_REBUILD_BATCH_SIZE,
+    grace_seconds: float = ROLLUP_SWAP_GRACE_SECONDS,
+) -> int:
+    """Rebuild the rollups from scratch into a staging collection.
+
+    Handovers are read in ``_id`` order, ``batch_size`` at a time, and
+    folded in with the same upserts as live writes. Live writes keep
+    ``$inc``-ing the old collection meanwhile and mark the days they
+    touch, and the scan may or may not have seen them, so those days are
+    recomputed in staging before it replaces the live collection in a
+    single rename. Days touched around the rename are recomputed once
+    more in the new live collection, and only then is the rebuild marked
+    complete.
+    """
+    handovers = database[handovers_collection_name]
+    changes = database[ROLLUP_CHANGES_COLLECTION_NAME]
+    staging_name = f"{ROLLUP_COLLECTION_NAME}_rebuild"
+    database.drop_collection(staging_name)
+    staging = database[staging_name]
+    staging.create_indexes(ROLLUP_INDEXES)
+    since = datetime.datetime.utcnow()
+    last_id: ObjectId | None = None
+    processed = 0
+    while True:
+        query = (
+            {}
+            if last_id is None
+            else {"_id": {"$gt": last_id}}
+        )
+        batch = list(
+            handovers.find(query, ROLLUP_SOURCE_PROJECTION)
+            .sort("_id", ASCENDING)
+            .limit(batch_size)
+        )
+        if not batch:
+            break
+        apply_rollups(staging, batch)
+        processed += len(batch)
+        last_id = batch[-1]["_id"]
+        logger.info("Rolled up %d handovers", processed)
+    for _ in range(ROLLUP_REPLAY_MAX_PASSES):
+        replay_started = datetime.datetime.utcnow()
+        changed = _changed_since(changes, since)
+        since = replay_started
+        if not changed:
+            break
+        recompute_rollups(handovers, staging, changed)
+        logger.info(
+            "Recomputed %d facility days written during the rebuild",
+            len(changed),
+        )
+    staging.rename(ROLLUP_COLLECTION_NAME, dropTarget=True)
+    if grace_seconds:
+        time.sleep(grace_seconds)
+    recompute_rollups(
+        handovers,
+        database[ROLLUP_COLLECTION_NAME],
+        _changed_since(changes, since),
+    )
+    database[MIGRATION_COLLECTION_NAME].update_one(
+        {"_id": ROLLUP_REBUILD_ID},
+        {
+            "$set": {
+                "completed_at": datetime.datetime.utcnow(),
+                "handovers": processed,
+            }
+        },
+        upsert=True,
+    )
+    return processed
+
+
+def can_use_rollups(
+    filters: HandoverFilters | None,
+) -> bool:
+    return set(filters or {}) <= ROLLUP_FILTER_KEYS
+
+
+def rollup_dashboard_pipeline(
+    filters: HandoverFilters | None, period: str
+) -> list[dict[str, Any]]:
+    match: dict[str, Any] = {}
+    filters = filters or {}
+    if filters.get("facility"):
+        match["facility"] = filters["facility"]
+    day_range: dict[str, str] = {}
+    if filters.get("date_from"):
+        day_range["$gte"] = datetime.date.fromisoformat(
+            filters["date_from"]
+        ).isoformat()
+    if filters.get("date_to"):
+        day_range["$lte"] = datetime.date.fromisoformat(
+            filters["date_to"]
+        ).isoformat()
+    if day_range:
+        match["day"] = day_range
+    return [
+        {"$match": match},
+        {
+            "$facet": {
+                "totals": [
+                    {
+                        "$group": {
+                            "_id": {
+                                "facility": "$facility",
+                                "period": {
+                                    "$substrBytes": [
+                                        "$day",
+                                        0,
+                                        DASHBOARD_PERIODS[
+                                            period
+                                        ],
+                                    ]
+                                },
+                            },
+                            "handovers": {
+                                "$sum": {
+                                    "$cond": [
+                                        {
+                                            "$eq": [
+                                                "$size",
+                                                ROLLUP_ALL_SIZES,
+                                            ]
+                                        },
+                                        "$handovers",
+                                        0,
+                                    ]
+                                }
+                            },
+                            **{
+                                f"qty_{size_key}": {
+                                    "$sum": {
+                                        "$cond": [
+                                            {
+                                                "$eq": [
+                                                    "$size",
+                                                    size_key,
+                                                ]
+                                            },
+                                            "$quantity",
+                                            0,
+                                        ]
+                                    }
+                                }
+                                for size_key in SIZE_KEYS
+                            },
+                        }
+                    },
+                    {
+                        "$sort": {
+                            "_id.period": -1,
+                            "_id.facility": 1,
+                        }
+                    },
+                ],
+                "histograms": [
+                    {"$match": {"size": ROLLUP_ALL_SIZES}},
+                    {
+                        "$group": {
+                            "_id": None,
+                            **{
+                                f"{reading}_{bucket}": {
+                                    "$sum": f"${reading}_buckets.{bucket}"
+                                }
+                                for reading, buckets in _READINGS
+                                for bucket in [
+                                    *(
+                                        str(bound)
+                                        for bound, label in buckets
+                                        if label is not None
+                                    ),
+                                    "other",
+                                ]
+                            },
+                        }
+                    },
+                ],
+            }
+        },
+    ]
+
+
+def rollup_facets_to_dashboard(
+    facets: dict[str, Any] | None,
+) -> dict[str, Any]:
+    """Reshape rollup histograms like ``$bucket`` output so the dashboard
+    can share :func:`shape_dashboard_result` with the raw pipeline."""
+    facets = facets or {}
+    histograms = (facets.get("histograms") or [{}])[0]
+    reshaped: dict[str, Any] = {
+        "totals": facets.get("totals", [])
+    }
+    for reading, buckets in _READINGS:
+        reshaped[reading] = [
+            {
+                "_id": bound,
+                "count": histograms.get(
+                    f"{reading}_{bound}", 0
+                ),
+            }
+            for bound, label in buckets
+            if label is not None
+        ] + [
+            {
+                "_id": "other",
+                "count": histograms.get(
+                    f"{reading}_other", 0
+                ),
+            }
+        ]
+    return reshaped
+
+
+def main() -> None:
+    from app.db.client_pool import client_pool
+    from app.db.repository import (
+        DB_NAME,
+        HANDOVER_COLLECTION_NAME,
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Rebuild the daily handover rollups."
+    )
+    parser.add_argument(
+        "--username",
+        default=os.environ.get(
+            "MONGO_INDEX_ADMIN_USERNAME"
+        ),
+    )
+    parser.add_argument(
+        "--password",
+        default=os.environ.get(
+            "MONGO_INDEX_ADMIN_PASSWORD"
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=ROLLUP_REBUILD_BATCH_SIZE,
+    )
+    args = parser.parse_args()
+    if not args.username or not args.password:
+        parser.error(
+            "--username and --password are required"
+        )
+    logging.basicConfig(level=logging.INFO)
+    client = client_pool.acquire(
+        args.username, args.password
+    )
+    try:
+        processed = rebuild_rollups(
+            client[DB_NAME],
+            HANDOVER_COLLECTION_NAME,
+            args.batch_size,
+        )
+    finally:
+        client_pool.release(client)
+        client_pool.close_all()
+    print(f"Rebuilt rollups from {processed} handovers.")
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
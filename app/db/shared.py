@@ -0,0 +1,21 @@
+import functools
+import os
+from typing import Any
+
+REDIS_URL_ENV = "REDIS_URL"
+
+
+@functools.cache
+def shared_redis() -> Any | None:
+    """Redis shared by every app worker, if ``REDIS_URL`` is set.
+
+    This is the same variable Reflex uses for its state manager, so one
+    setting moves sessions and the app's own cross-worker bookkeeping
+    onto the same server.
+    """
+    url = os.environ.get(REDIS_URL_ENV)
+    if not url:
+        return None
+    import redis
+
+    return redis.Redis.from_url(url)
\ No newline at end of file
@@ -0,0 +1,197 @@
+import argparse
+import logging
+import os
+import time
+from typing import Any, TypedDict
+
+from pymongo import ASCENDING, UpdateOne, errors
+
+from app.db.timestamps import parse_timestamp
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_COLLECTION_NAME = "Migrations"
+MIGRATION_ID = "submission_timestamp_to_date"
+MIGRATION_BATCH_SIZE = 500
+
+
+class MigrationProgress(TypedDict):
+    converted: int
+    unparseable: int
+
+
+def _load_checkpoint(
+    migrations: Any, restart: bool
+) -> dict[str, Any]:
+    if restart:
+        migrations.delete_one({"_id": MIGRATION_ID})
+    return migrations.find_one({"_id": MIGRATION_ID}) or {
+        "last_id": None,
+        "converted": 0,
+        "unparseable": 0,
+    }
+
+
+def migrate_submission_timestamps(
+    database: Any,
+    handovers_collection_name: str,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+    pause_seconds: float = 0.0,
+    restart: bool = False,
+) -> MigrationProgress:
+    """Convert ISO-string ``submission_timestamp`` values to BSON dates.
+
+    Documents are walked in ``_id`` order ``batch_size`` at a time and
+    each batch is one unordered ``bulk_write``. The last ``_id`` is
+    checkpointed after every batch, so an interrupted run resumes where
+    it stopped. Updates match on the original string, so a document
+    rewritten concurrently is left alone rather than overwritten.
+    """
+    handovers = database[handovers_collection_name]
+    migrations = database[MIGRATION_COLLECTION_NAME]
+    checkpoint = _load_checkpoint(migrations, restart)
+    last_id = checkpoint["last_id"]
+    converted = checkpoint["converted"]
+    unparseable = checkpoint["unparseable"]
+    while True:
+        query: dict[str, Any] = {
+            "submission_timestamp": {"$type": "string"}
+        }
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = list(
+            handovers.find(
+                query, {"submission_timestamp": 1}
+            )
+            .sort("_id", ASCENDING)
+            .limit(batch_size)
+        )
+        if not batch:
+            break
+        operations = []
+        for document in batch:
+            original = document["submission_timestamp"]
+            try:
+                timestamp = parse_timestamp(original)
+            except ValueError:
+                unparseable += 1
+                logger.warning(
+                    "Unparseable submission_timestamp %r on %s",
+                    original,
+                    document["_id"],
+                )
+                continue
+            operations.append(
+                UpdateOne(
+                    {
+                        "_id": document["_id"],
+                        "submission_timestamp": original,
+                    },
+                    {
+                        "$set": {
+                            "submission_timestamp": timestamp
+                        }
+                    },
+                )
+            )
+        if operations:
+            try:
+                result = handovers.bulk_write(
+                    operations, ordered=False
+                )
+                converted += result.modified_count
+            except errors.BulkWriteError as e:
+                converted += e.details.get("nModified", 0)
+                logger.warning(
+                    "%d timestamp updates failed in batch",
+                    len(e.details.get("writeErrors", [])),
+                )
+        last_id = batch[-1]["_id"]
+        migrations.update_one(
+            {"_id": MIGRATION_ID},
+            {
+                "$set": {
+                    "last_id": last_id,
+                    "converted": converted,
+                    "unparseable": unparseable,
+                }
+            },
+            upsert=True,
+        )
+        logger.info(
+            "Converted %d submission timestamps", converted
+        )
+        if pause_seconds:
+            time.sleep(pause_seconds)
+    return {
+        "converted": converted,
+        "unparseable": unparseable,
+    }
+
+
+def main() -> None:
+    from app.db.client_pool import client_pool
+    from app.db.repository import (
+        DB_NAME,
+        HANDOVER_COLLECTION_NAME,
+    )
+
+    parser = argparse.ArgumentParser(
+        description="Convert submission timestamps to BSON dates."
+    )
+    parser.add_argument(
+        "--username",
+        default=os.environ.get(
+            "MONGO_INDEX_ADMIN_USERNAME"
+        ),
+    )
+    parser.add_argument(
+        "--password",
+        default=os.environ.get(
+            "MONGO_INDEX_ADMIN_PASSWORD"
+        ),
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=MIGRATION_BATCH_SIZE,
+    )
+    parser.add_argument(
+        "--pause",
+        type=float,
+        default=0.0,
+        help="Seconds to sleep between batches.",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the saved checkpoint.",
+    )
+    args = parser.parse_args()
+    if not args.username or not args.password:
+        parser.error(
+            "--username and --password are required"
+        )
+    logging.basicConfig(level=logging.INFO)
+    client = client_pool.acquire(
+        args.username, args.password
+    )
+    try:
+        progress = migrate_submission_timestamps(
+            client[DB_NAME],
+            HANDOVER_COLLECTION_NAME,
+            args.batch_size,
+            args.pause,
+            args.restart,
+        )
+    finally:
+        client_pool.release(client)
+        client_pool.close_all()
+    print(
+        f"Converted {progress['converted']} timestamps, "
+        f"{progress['unparseable']} unparseable."
+    )
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,92 @@
+import datetime
+from typing import Any
+
+from bson.objectid import ObjectId
+
+
+def parse_timestamp(value: str) -> datetime.datetime:
+    parsed = datetime.datetime.fromisoformat(value.strip())
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(
+            datetime.timezone.utc
+        ).replace(tzinfo=None)
+    return parsed
+
+
+def format_timestamp(value: Any) -> str:
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value or ""
+
+
+def keyset_sort_key(
+    timestamp: Any, document_id: Any
+) -> tuple[bool, Any, ObjectId]:
+    """Python sort key matching ``LIST_SORT`` order (ascending).
+
+    Dates sort above legacy ISO strings, as they do in MongoDB.
+    """
+    if isinstance(timestamp, datetime.datetime):
+        return True, timestamp, ObjectId(document_id)
+    return (
+        False,
+        str(timestamp or ""),
+        ObjectId(document_id),
+    )
+
+
+def keyset_query(
+    cursor: tuple[Any, str], newer: bool = False
+) -> dict[str, Any]:
+    """Documents strictly after ``cursor`` in ``submission_timestamp``,
+    ``_id`` order (descending unless ``newer``).
+
+    Range operators only match values of the same BSON type, and dates
+    sort above strings, so while legacy ISO strings remain the cursor's
+    type decides which of them fall on the far side.
+    """
+    timestamp, document_id = cursor
+    operator = "$gt" if newer else "$lt"
+    clauses: list[dict[str, Any]] = [
+        {"submission_timestamp": {operator: timestamp}},
+        {
+            "submission_timestamp": timestamp,
+            "_id": {operator: ObjectId(document_id)},
+        },
+    ]
+    is_date = isinstance(timestamp, datetime.datetime)
+    if is_date and not newer:
+        clauses.append(
+            {"submission_timestamp": {"$type": "string"}}
+        )
+    elif not is_date and newer:
+        clauses.append(
+            {"submission_timestamp": {"$type": "date"}}
+        )
+    return {"$or": clauses}
+
+
+def date_range_query(
+    date_from: datetime.date | None,
+    date_to: datetime.date | None,
+) -> dict[str, Any]:
+    """Inclusive day range matching both BSON dates and ISO strings."""
+    date_bounds: dict[str, datetime.datetime] = {}
+    string_bounds: dict[str, str] = {}
+    if date_from is not None:
+        date_bounds["$gte"] = datetime.datetime.combine(
+            date_from, datetime.time()
+        )
+        string_bounds["$gte"] = date_from.isoformat()
+    if date_to is not None:
+        day_after = date_to + datetime.timedelta(days=1)
+        date_bounds["$lt"] = datetime.datetime.combine(
+            day_after, datetime.time()
+        )
+        string_bounds["$lt"] = day_after.isoformat()
+    return {
+        "$or": [
+            {"submission_timestamp": date_bounds},
+            {"submission_timestamp": string_bounds},
+        ]
+    }
\ No newline at end of file
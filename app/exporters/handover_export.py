@@ -0,0 +1,268 @@
+import csv
+import io
+import re
+import zipfile
+from typing import Any, AsyncIterator, Iterator
+from xml.sax.saxutils import escape
+
+from app.db.check_encoding import decode_checks
+from app.db.timestamps import format_timestamp
+from app.validation.cylinder_checks import SIZE_KEYS
+
+EXPORT_FORMATS = ("csv", "xlsx")
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+EXPORT_COLUMNS = (
+    "submission_id",
+    "facility",
+    "bmt_in_charge",
+    "receiving_personnel",
+    "qty_2m",
+    "qty_4m",
+    "qty_7m",
+    "submitted_by",
+    "submission_timestamp",
+    "cylinder_size",
+    "check_number",
+    "cylinder_id",
+    "purity",
+    "pressure",
+)
+XLSX_MAX_ROWS_PER_SHEET = 1_048_576
+
+_HANDOVER_COLUMNS = EXPORT_COLUMNS[1:9]
+_CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+_XML_ILLEGAL_CHARS = re.compile(
+    "[\x00-\x08\x0b\x0c\x0e-\x1f]"
+)
+
+
+def flatten_handover(
+    document: dict[str, Any],
+) -> Iterator[list[Any]]:
+    """One row per cylinder check, handover fields repeated on each."""
+    handover = [str(document["_id"])] + [
+        document.get(column) for column in _HANDOVER_COLUMNS
+    ]
+    handover[-1] = format_timestamp(handover[-1]) or None
+    emitted = False
+    for size_key in SIZE_KEYS:
+        for number, check in enumerate(
+            decode_checks(
+                document.get(f"cylinder_checks_{size_key}")
+            ),
+            start=1,
+        ):
+            emitted = True
+            yield handover + [
+                size_key,
+                number,
+                check.get("cylinder_id"),
+                check.get("purity"),
+                check.get("pressure"),
+            ]
+    if not emitted:
+        yield handover + [None] * 5
+
+
+def _csv_cell(value: Any) -> Any:
+    """Keep spreadsheets from running free text as a formula.
+
+    Text such as a receiving personnel name or cylinder id that starts
+    with ``=``, ``+``, ``-`` or ``@`` is prefixed with ``'``. Numbers
+    are left alone, so negative values stay numeric. XLSX cells are
+    inline strings, which are never evaluated, and need no prefix.
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(
+        _CSV_FORMULA_PREFIXES
+    ):
+        return "'" + value
+    return value
+
+
+def _csv_bytes(rows: Iterator[list[Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [_csv_cell(value) for value in row] for row in rows
+    )
+    return buffer.getvalue().encode("utf-8")
+
+
+async def stream_csv(
+    batches: AsyncIterator[list[dict[str, Any]]],
+) -> AsyncIterator[bytes]:
+    yield "\ufeff".encode("utf-8") + _csv_bytes(
+        iter([list(EXPORT_COLUMNS)])
+    )
+    async for documents in batches:
+        yield _csv_bytes(
+            row
+            for document in documents
+            for row in flatten_handover(document)
+        )
+
+
+class _ChunkSink(io.RawIOBase):
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _xlsx_cell(value: Any) -> str:
+    if value is None:
+        return "<c/>"
+    if isinstance(value, (int, float)) and not isinstance(
+        value, bool
+    ):
+        return f"<c><v>{value}</v></c>"
+    text = escape(_XML_ILLEGAL_CHARS.sub("", str(value)))
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>'
+
+
+def _xlsx_row(row: list[Any]) -> str:
+    return (
+        "<row>"
+        + "".join(_xlsx_cell(value) for value in row)
+        + "</row>"
+    )
+
+
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+
+class XlsxStreamWriter:
+    """Writes a minimal XLSX workbook without buffering it.
+
+    Rows go straight into a deflated zip entry whose compressed bytes are
+    handed back by :meth:`write_rows`; a new sheet is started whenever the
+    Excel row limit is reached.
+    """
+
+    def __init__(self):
+        self._sink = _ChunkSink()
+        self._zip = zipfile.ZipFile(
+            self._sink, "w", zipfile.ZIP_DEFLATED
+        )
+        self._sheet: Any = None
+        self._sheet_count = 0
+        self._sheet_rows = 0
+
+    def _start_sheet(self) -> None:
+        self._sheet_count += 1
+        self._sheet = self._zip.open(
+            f"xl/worksheets/sheet{self._sheet_count}.xml",
+            "w",
+            force_zip64=True,
+        )
+        self._sheet.write(
+            (
+                f'{_XML_HEADER}<worksheet xmlns="{_MAIN_NS}"><sheetData>'
+                + _xlsx_row(list(EXPORT_COLUMNS))
+            ).encode("utf-8")
+        )
+        self._sheet_rows = 1
+
+    def _end_sheet(self) -> None:
+        self._sheet.write(b"</sheetData></worksheet>")
+        self._sheet.close()
+        self._sheet = None
+
+    def write_rows(
+        self, rows: Iterator[list[Any]]
+    ) -> bytes:
+        if self._sheet is None:
+            self._start_sheet()
+        parts: list[str] = []
+        for row in rows:
+            if self._sheet_rows >= XLSX_MAX_ROWS_PER_SHEET:
+                self._sheet.write(
+                    "".join(parts).encode("utf-8")
+                )
+                parts = []
+                self._end_sheet()
+                self._start_sheet()
+            parts.append(_xlsx_row(row))
+            self._sheet_rows += 1
+        self._sheet.write("".join(parts).encode("utf-8"))
+        return self._sink.drain()
+
+    def close(self) -> bytes:
+        if self._sheet is None:
+            self._start_sheet()
+        self._end_sheet()
+        sheet_numbers = range(1, self._sheet_count + 1)
+        self._zip.writestr(
+            "[Content_Types].xml",
+            _XML_HEADER
+            + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            + '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            + '<Default Extension="xml" ContentType="application/xml"/>'
+            + '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            + "".join(
+                f'<Override PartName="/xl/worksheets/sheet{n}.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+                for n in sheet_numbers
+            )
+            + "</Types>",
+        )
+        self._zip.writestr(
+            "_rels/.rels",
+            _XML_HEADER
+            + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + f'<Relationship Id="rId1" Type="{_REL_NS}/officeDocument" Target="xl/workbook.xml"/>'
+            + "</Relationships>",
+        )
+        self._zip.writestr(
+            "xl/workbook.xml",
+            _XML_HEADER
+            + f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_REL_NS}"><sheets>'
+            + "".join(
+                f'<sheet name="Handovers {n}" sheetId="{n}" r:id="rId{n}"/>'
+                for n in sheet_numbers
+            )
+            + "</sheets></workbook>",
+        )
+        self._zip.writestr(
+            "xl/_rels/workbook.xml.rels",
+            _XML_HEADER
+            + '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            + "".join(
+                f'<Relationship Id="rId{n}" Type="{_REL_NS}/worksheet" Target="worksheets/sheet{n}.xml"/>'
+                for n in sheet_numbers
+            )
+            + "</Relationships>",
+        )
+        self._zip.close()
+        return self._sink.drain()
+
+
+async def stream_xlsx(
+    batches: AsyncIterator[list[dict[str, Any]]],
+) -> AsyncIterator[bytes]:
+    writer = XlsxStreamWriter()
+    async for documents in batches:
+        chunk = writer.write_rows(
+            row
+            for document in documents
+            for row in flatten_handover(document)
+        )
+        if chunk:
+            yield chunk
+    yield writer.close()
\ No newline at end of file
@@ -0,0 +1,418 @@
+import csv
+import datetime
+import json
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    TextIO,
+    TypedDict,
+)
+
+from pymongo import errors
+
+from app.db.check_encoding import encode_handover_checks
+from app.db.timestamps import parse_timestamp
+from app.validation.cylinder_checks import (
+    SIZE_KEYS,
+    validate_check_columns,
+)
+from app.validation.handover import (
+    FACILITIES,
+    MAX_CHECKS_PER_SIZE,
+    expected_check_count,
+    validate_handover_header,
+)
+
+IMPORT_FORMATS = ("csv", "jsonl")
+IMPORT_CHUNK_SIZE = 500
+MAX_REPORTED_FAILURES = 200
+CHECK_FIELDS = ("cylinder_id", "purity", "pressure")
+
+
+class ImportFailure(TypedDict):
+    line: int
+    errors: list[str]
+
+
+@dataclass
+class ImportReport:
+    rows_read: int = 0
+    inserted: int = 0
+    failed: int = 0
+    failures: list[ImportFailure] = field(
+        default_factory=list
+    )
+
+    def add_failure(
+        self, line: int, messages: list[str]
+    ) -> None:
+        self.failed += 1
+        if len(self.failures) < MAX_REPORTED_FAILURES:
+            self.failures.append(
+                {"line": line, "errors": messages}
+            )
+
+    def as_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class _ParsedRow:
+    line: int
+    record: dict[str, Any]
+    errors: list[str] = field(default_factory=list)
+
+
+def detect_import_format(filename: str) -> str | None:
+    name = filename.lower()
+    if name.endswith(".csv"):
+        return "csv"
+    if name.endswith((".jsonl", ".ndjson")):
+        return "jsonl"
+    return None
+
+
+def _blank(value: Any) -> bool:
+    return value is None or (
+        isinstance(value, str) and not value.strip()
+    )
+
+
+def _coerce_number(value: Any, cast: type) -> Any:
+    if _blank(value):
+        return None
+    if isinstance(value, str):
+        try:
+            return cast(value.strip())
+        except ValueError:
+            return value
+    if (
+        cast is float
+        and isinstance(value, int)
+        and not isinstance(value, bool)
+    ):
+        return float(value)
+    return value
+
+
+def _coerce_quantity(
+    name: str, value: Any, errors_out: list[str]
+) -> int:
+    if _blank(value):
+        return 0
+    if isinstance(value, int) and not isinstance(
+        value, bool
+    ):
+        return value
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            pass
+    errors_out.append(f"{name} must be a whole number.")
+    return 0
+
+
+def _coerce_timestamp(
+    value: Any, errors_out: list[str]
+) -> datetime.datetime | None:
+    if _blank(value):
+        return datetime.datetime.utcnow()
+    if isinstance(value, datetime.datetime):
+        return parse_timestamp(value.isoformat())
+    try:
+        return parse_timestamp(str(value))
+    except ValueError:
+        errors_out.append(
+            "submission_timestamp must be an ISO 8601 date-time."
+        )
+        return None
+
+
+def _normalise_record(
+    line: int,
+    raw: dict[str, Any],
+    checks_by_size: dict[str, list[dict[str, Any]]],
+    extra_checks: dict[str, int],
+) -> _ParsedRow:
+    messages: list[str] = []
+    quantities = {
+        size_key: _coerce_quantity(
+            f"qty_{size_key}",
+            raw.get(f"qty_{size_key}"),
+            messages,
+        )
+        for size_key in SIZE_KEYS
+    }
+    facility = str(raw.get("facility") or "").strip()
+    header_error = validate_handover_header(
+        facility, quantities
+    )
+    if header_error:
+        messages.append(header_error)
+    elif facility not in FACILITIES:
+        messages.append(f"Unknown facility: {facility}.")
+    for size_key in SIZE_KEYS:
+        expected = expected_check_count(
+            quantities[size_key]
+        )
+        found = len(
+            checks_by_size[size_key]
+        ) + extra_checks.get(size_key, 0)
+        if quantities[size_key] >= 0 and found != expected:
+            messages.append(
+                f"qty_{size_key} of {quantities[size_key]} expects {expected} {size_key} cylinder check(s), found {found}."
+            )
+    receiving_personnel = (
+        str(raw.get("receiving_personnel") or "")
+    ).strip()
+    record: dict[str, Any] = {
+        "facility": facility,
+        "bmt_in_charge": (
+            str(raw.get("bmt_in_charge") or "")
+        ).strip(),
+        "receiving_personnel": receiving_personnel or None,
+    }
+    for size_key in SIZE_KEYS:
+        record[f"qty_{size_key}"] = quantities[size_key]
+    for size_key in SIZE_KEYS:
+        record[f"cylinder_checks_{size_key}"] = [
+            {
+                "cylinder_id": (
+                    str(check.get("cylinder_id")).strip()
+                    if not _blank(check.get("cylinder_id"))
+                    else None
+                ),
+                "purity": _coerce_number(
+                    check.get("purity"), float
+                ),
+                "pressure": _coerce_number(
+                    check.get("pressure"), int
+                ),
+            }
+            for check in checks_by_size[size_key]
+        ]
+    record["submitted_by"] = None
+    record["submission_timestamp"] = _coerce_timestamp(
+        raw.get("submission_timestamp"), messages
+    )
+    return _ParsedRow(line, record, messages)
+
+
+def iter_csv_rows(stream: TextIO) -> Iterator[_ParsedRow]:
+    """One handover per row.
+
+    Checks are flattened into ``<size>_<n>_<field>`` columns with ``n``
+    starting at 1, e.g. ``2m_1_cylinder_id``, ``2m_1_purity``.
+    """
+    reader = csv.DictReader(stream)
+    for row in reader:
+        line = reader.line_num
+        checks_by_size: dict[str, list[dict[str, Any]]] = {}
+        extra_checks: dict[str, int] = {}
+        for size_key in SIZE_KEYS:
+            try:
+                expected = expected_check_count(
+                    int(row.get(f"qty_{size_key}") or 0)
+                )
+            except ValueError:
+                expected = 0
+            checks = []
+            for number in range(1, MAX_CHECKS_PER_SIZE + 1):
+                check = {
+                    check_field: row.get(
+                        f"{size_key}_{number}_{check_field}"
+                    )
+                    for check_field in CHECK_FIELDS
+                }
+                if number <= expected:
+                    checks.append(check)
+                elif not all(
+                    _blank(value)
+                    for value in check.values()
+                ):
+                    extra_checks[size_key] = (
+                        extra_checks.get(size_key, 0) + 1
+                    )
+            checks_by_size[size_key] = checks
+        yield _normalise_record(
+            line, row, checks_by_size, extra_checks
+        )
+
+
+def iter_jsonl_rows(stream: TextIO) -> Iterator[_ParsedRow]:
+    """One JSON object per line, checks as ``cylinder_checks_<size>`` arrays."""
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+        try:
+            raw = json.loads(text)
+        except json.JSONDecodeError as e:
+            yield _ParsedRow(
+                line, {}, [f"Invalid JSON: {e.msg}."]
+            )
+            continue
+        if not isinstance(raw, dict):
+            yield _ParsedRow(
+                line, {}, ["Expected a JSON object."]
+            )
+            continue
+        checks_by_size: dict[str, list[dict[str, Any]]] = {}
+        messages: list[str] = []
+        for size_key in SIZE_KEYS:
+            checks = (
+                raw.get(f"cylinder_checks_{size_key}") or []
+            )
+            if not isinstance(checks, list) or not all(
+                isinstance(check, dict) for check in checks
+            ):
+                messages.append(
+                    f"cylinder_checks_{size_key} must be a list of objects."
+                )
+                checks = []
+            checks_by_size[size_key] = checks
+        parsed = _normalise_record(
+            line, raw, checks_by_size, {}
+        )
+        parsed.errors[:0] = messages
+        yield parsed
+
+
+def _validate_chunk_checks(rows: list[_ParsedRow]) -> None:
+    for size_key in SIZE_KEYS:
+        owners: list[_ParsedRow] = []
+        numbers: list[int] = []
+        columns: dict[str, list[Any]] = {
+            check_field: [] for check_field in CHECK_FIELDS
+        }
+        for row in rows:
+            for number, check in enumerate(
+                row.record.get(
+                    f"cylinder_checks_{size_key}", ()
+                ),
+                start=1,
+            ):
+                owners.append(row)
+                numbers.append(number)
+                for check_field in CHECK_FIELDS:
+                    columns[check_field].append(
+                        check[check_field]
+                    )
+        if not owners:
+            continue
+        for position, _, message in validate_check_columns(
+            size_key, columns, numbers
+        ):
+            owners[position].errors.append(message)
+
+
+def _insert_chunk(
+    collection: Any,
+    rows: list[_ParsedRow],
+    report: ImportReport,
+    after_insert: Callable[[list[dict[str, Any]]], None]
+    | None = None,
+) -> bool:
+    """Insert ``rows``; ``False`` if the import cannot go on.
+
+    Only a ``BulkWriteError`` says which rows failed. Any other database
+    error leaves the chunk's outcome unknown and the connection
+    suspect, so every row of the chunk is reported failed.
+    """
+    if not rows:
+        return True
+    documents = [
+        encode_handover_checks(row.record) for row in rows
+    ]
+    try:
+        result = collection.insert_many(
+            documents, ordered=False
+        )
+        report.inserted += len(result.inserted_ids)
+    except errors.BulkWriteError as e:
+        report.inserted += e.details.get("nInserted", 0)
+        failed_positions = set()
+        for write_error in e.details.get("writeErrors", []):
+            failed_positions.add(write_error["index"])
+            report.add_failure(
+                rows[write_error["index"]].line,
+                [
+                    write_error.get(
+                        "errmsg", "Write failed."
+                    )
+                ],
+            )
+        documents = [
+            document
+            for position, document in enumerate(documents)
+            if position not in failed_positions
+        ]
+    except errors.PyMongoError as e:
+        for row in rows:
+            report.add_failure(
+                row.line,
+                [f"Not imported, import stopped: {e}"],
+            )
+        return False
+    if after_insert is not None and documents:
+        after_insert(documents)
+    return True
+
+
+def _chunks(
+    rows: Iterable[_ParsedRow], size: int
+) -> Iterator[list[_ParsedRow]]:
+    iterator = iter(rows)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def import_handovers(
+    collection: Any,
+    stream: TextIO,
+    import_format: str,
+    submitted_by: str,
+    bmt_in_charge: str,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    after_insert: Callable[[list[dict[str, Any]]], None]
+    | None = None,
+) -> ImportReport:
+    """Validate and insert handovers from ``stream`` chunk by chunk.
+
+    At most ``chunk_size`` parsed rows are held at once, so memory stays
+    flat however large the file is. Failing rows are reported by line and
+    never abort the rest of the import; a database error other than a
+    failed write stops it, and the report covers the rows read so far.
+    ``after_insert`` receives each chunk's successfully inserted
+    documents.
+    """
+    rows = (
+        iter_csv_rows(stream)
+        if import_format == "csv"
+        else iter_jsonl_rows(stream)
+    )
+    report = ImportReport()
+    for chunk in _chunks(rows, chunk_size):
+        report.rows_read += len(chunk)
+        _validate_chunk_checks(
+            [row for row in chunk if row.record]
+        )
+        valid_rows = []
+        for row in chunk:
+            if row.errors:
+                report.add_failure(row.line, row.errors)
+                continue
+            row.record["bmt_in_charge"] = (
+                row.record["bmt_in_charge"] or bmt_in_charge
+            )
+            row.record["submitted_by"] = submitted_by
+            valid_rows.append(row)
+        if not _insert_chunk(
+            collection, valid_rows, report, after_insert
+        ):
+            break
+    return report
\ No newline at end of file
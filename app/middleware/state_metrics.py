@@ -0,0 +1,142 @@
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from reflex.event import Event
+from reflex.middleware import Middleware
+from reflex.state import BaseState, StateUpdate
+from reflex.utils import format
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+
+logger = logging.getLogger(__name__)
+
+STATE_METRICS_ENV = "STATE_METRICS"
+STATE_METRICS_ROUTE = "/api/state-metrics"
+
+
+@dataclass
+class EventStateMetrics:
+    updates: int = 0
+    delta_bytes: int = 0
+    max_delta_bytes: int = 0
+    state_bytes: int = 0
+    max_state_bytes: int = 0
+
+
+def _event_label(event: Event) -> str:
+    state_path, _, handler = event.name.rpartition(".")
+    state_name = state_path.rpartition(".")[2].rpartition(
+        "____"
+    )[2]
+    return f"{state_name}.{handler}"
+
+
+def _loaded_states(state: BaseState) -> list[BaseState]:
+    states = [state]
+    for substate in state.substates.values():
+        states.extend(_loaded_states(substate))
+    return states
+
+
+def serialized_state_sizes(
+    state: BaseState,
+) -> dict[str, int]:
+    """Pickled size of each loaded substate, as a Redis state
+    manager would store it."""
+    sizes: dict[str, int] = {}
+    for substate in _loaded_states(state):
+        try:
+            sizes[substate.get_full_name()] = len(
+                substate._serialize()
+            )
+        except Exception:
+            sizes[substate.get_full_name()] = -1
+    return sizes
+
+
+class StateMetricsMiddleware(Middleware):
+    """Measures every state update sent to the browser.
+
+    Delta bytes are the JSON the websocket carries for the update; state
+    bytes are the serialized session state a Redis state manager would
+    persist. Both are logged per update and aggregated per event.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, EventStateMetrics] = {}
+        self._lock = threading.Lock()
+
+    async def preprocess(
+        self, app: Any, state: BaseState, event: Event
+    ) -> StateUpdate | None:
+        return None
+
+    async def postprocess(
+        self,
+        app: Any,
+        state: BaseState,
+        event: Event,
+        update: StateUpdate,
+    ) -> StateUpdate:
+        delta_bytes = len(
+            format.json_dumps(update.delta).encode()
+        )
+        state_sizes = serialized_state_sizes(state)
+        state_bytes = sum(
+            size
+            for size in state_sizes.values()
+            if size > 0
+        )
+        label = _event_label(event)
+        with self._lock:
+            metrics = self._metrics.setdefault(
+                label, EventStateMetrics()
+            )
+            metrics.updates += 1
+            metrics.delta_bytes += delta_bytes
+            metrics.max_delta_bytes = max(
+                metrics.max_delta_bytes, delta_bytes
+            )
+            metrics.state_bytes = state_bytes
+            metrics.max_state_bytes = max(
+                metrics.max_state_bytes, state_bytes
+            )
+        logger.info(
+            "%s delta=%dB state=%dB %s",
+            label,
+            delta_bytes,
+            state_bytes,
+            state_sizes,
+        )
+        return update
+
+    def snapshot(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            return {
+                label: asdict(metrics)
+                for label, metrics in sorted(
+                    self._metrics.items()
+                )
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._metrics.clear()
+
+
+state_metrics = StateMetricsMiddleware()
+
+
+def state_metrics_enabled() -> bool:
+    return os.environ.get(
+        STATE_METRICS_ENV, ""
+    ).lower() in ("1", "true", "yes")
+
+
+async def state_metrics_endpoint(
+    request: Request,
+) -> JSONResponse:
+    return JSONResponse(state_metrics.snapshot())
\ No newline at end of file
@@ -0,0 +1,210 @@
+import reflex as rx
+from app.db.cylinder_history import CylinderReading
+from app.states.cylinder_history_state import (
+    CylinderHistoryState,
+)
+from app.components.navbar import main_layout
+
+TABLE_HEADER_CLASS = "px-3 py-2 text-left text-xs font-semibold text-gray-500 uppercase"
+TABLE_CELL_CLASS = "px-3 py-2 text-sm text-gray-700"
+HISTORY_COLUMNS = (
+    "Submitted",
+    "Facility",
+    "Size",
+    "Purity (%)",
+    "Pressure (psi)",
+    "Received by",
+    "Submitted by",
+)
+
+
+def cylinder_search() -> rx.Component:
+    return rx.el.form(
+        rx.el.div(
+            rx.el.label(
+                "Cylinder ID",
+                class_name="block text-sm font-medium text-gray-700",
+            ),
+            rx.el.input(
+                name="cylinder_id",
+                default_value=CylinderHistoryState.cylinder_id,
+                placeholder="e.g. CYL-2M-0001",
+                class_name="mt-1 block w-full px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm",
+            ),
+            class_name="flex-1",
+        ),
+        rx.el.button(
+            "Search",
+            type="submit",
+            class_name="self-end px-6 py-2 bg-indigo-600 text-white font-semibold rounded-md shadow-sm hover:bg-indigo-700",
+        ),
+        on_submit=CylinderHistoryState.search_cylinder,
+        reset_on_submit=False,
+        class_name="flex gap-4 mb-8 p-6 bg-white rounded-lg shadow border",
+    )
+
+
+def facility_trail() -> rx.Component:
+    return rx.el.p(
+        "Facilities, newest first: ",
+        rx.foreach(
+            CylinderHistoryState.facility_trail,
+            lambda facility, index: rx.el.span(
+                rx.cond(index > 0, " ← ", ""),
+                facility,
+            ),
+        ),
+        class_name="text-sm text-gray-600 mb-4",
+    )
+
+
+def reading_row(
+    reading: rx.Var[CylinderReading],
+) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(
+            reading["submission_timestamp"],
+            class_name=TABLE_CELL_CLASS,
+        ),
+        rx.el.td(
+            reading["facility"], class_name=TABLE_CELL_CLASS
+        ),
+        rx.el.td(
+            f"{reading['size_key']} #{reading['check_number']}",
+            class_name=TABLE_CELL_CLASS,
+        ),
+        rx.el.td(
+            reading["purity"], class_name=TABLE_CELL_CLASS
+        ),
+        rx.el.td(
+            reading["pressure"], class_name=TABLE_CELL_CLASS
+        ),
+        rx.el.td(
+            rx.cond(
+                reading["receiving_personnel"],
+                reading["receiving_personnel"],
+                "N/A",
+            ),
+            class_name=TABLE_CELL_CLASS,
+        ),
+        rx.el.td(
+            reading["submitted_by"],
+            class_name=TABLE_CELL_CLASS,
+        ),
+    )
+
+
+def trend_chart() -> rx.Component:
+    return rx.el.section(
+        rx.el.h2(
+            "Purity and pressure, last 12 months",
+            class_name="text-xl font-semibold text-gray-700 mb-4 border-b pb-2",
+        ),
+        rx.recharts.line_chart(
+            rx.recharts.line(
+                data_key="purity",
+                name="Purity (%)",
+                y_axis_id="purity",
+                stroke="#4f46e5",
+            ),
+            rx.recharts.line(
+                data_key="pressure",
+                name="Pressure (psi)",
+                y_axis_id="pressure",
+                stroke="#059669",
+            ),
+            rx.recharts.x_axis(data_key="timestamp"),
+            rx.recharts.y_axis(y_axis_id="purity"),
+            rx.recharts.y_axis(
+                y_axis_id="pressure",
+                orientation="right",
+            ),
+            rx.recharts.graphing_tooltip(),
+            rx.recharts.legend(),
+            data=CylinderHistoryState.trend,
+            width="100%",
+            height=300,
+        ),
+        class_name="p-6 mb-8 bg-white rounded-lg shadow border",
+    )
+
+
+def history_table() -> rx.Component:
+    return rx.el.section(
+        rx.el.h2(
+            f"History of {CylinderHistoryState.cylinder_id}",
+            class_name="text-xl font-semibold text-gray-700 mb-4 border-b pb-2",
+        ),
+        facility_trail(),
+        rx.el.table(
+            rx.el.thead(
+                rx.el.tr(
+                    *[
+                        rx.el.th(
+                            column,
+                            class_name=TABLE_HEADER_CLASS,
+                        )
+                        for column in HISTORY_COLUMNS
+                    ]
+                )
+            ),
+            rx.el.tbody(
+                rx.foreach(
+                    CylinderHistoryState.readings,
+                    reading_row,
+                )
+            ),
+            class_name="min-w-full divide-y divide-gray-200",
+        ),
+        rx.cond(
+            CylinderHistoryState.has_more_history,
+            rx.el.button(
+                rx.cond(
+                    CylinderHistoryState.is_loading_history,
+                    "Loading...",
+                    "Load more",
+                ),
+                on_click=CylinderHistoryState.load_more_history,
+                disabled=CylinderHistoryState.is_loading_history,
+                class_name="w-full mt-4 py-2 text-sm font-medium text-gray-600 bg-white border border-gray-300 rounded-md hover:bg-gray-50 disabled:opacity-60",
+            ),
+            rx.fragment(),
+        ),
+        class_name="p-6 bg-white rounded-lg shadow border",
+    )
+
+
+def cylinder_history_page() -> rx.Component:
+    return main_layout(
+        rx.el.div(
+            rx.el.h1(
+                "Cylinder History",
+                class_name="text-3xl font-bold text-gray-800 mb-8",
+            ),
+            cylinder_search(),
+            rx.cond(
+                CylinderHistoryState.trend.length() > 0,
+                trend_chart(),
+                rx.fragment(),
+            ),
+            rx.cond(
+                CylinderHistoryState.readings.length() > 0,
+                history_table(),
+                rx.cond(
+                    CylinderHistoryState.is_loading_history,
+                    rx.el.div(
+                        rx.icon(
+                            tag="loader",
+                            class_name="animate-spin h-10 w-10 text-indigo-600 mx-auto",
+                        ),
+                        class_name="flex justify-center py-10",
+                    ),
+                    rx.el.p(
+                        "Search for a cylinder ID to see every handover it appeared in.",
+                        class_name="text-gray-600 text-center py-10",
+                    ),
+                ),
+            ),
+            class_name="p-4",
+        )
+    )
\ No newline at end of file
@@ -0,0 +1,235 @@
+import reflex as rx
+from app.db.aggregations import (
+    DistributionBucket,
+    FacilityPeriodTotal,
+)
+from app.states.dashboard_state import DashboardState
+from app.components.navbar import main_layout
+
+FILTER_INPUT_CLASS = "mt-1 block w-full px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm"
+TABLE_HEADER_CLASS = "px-3 py-2 text-left text-xs font-semibold text-gray-500 uppercase"
+TABLE_CELL_CLASS = "px-3 py-2 text-sm text-gray-700"
+
+
+def dashboard_filters() -> rx.Component:
+    return rx.el.form(
+        rx.el.div(
+            rx.el.label(
+                "Facility",
+                class_name="block text-sm font-medium text-gray-700",
+            ),
+            rx.el.select(
+                rx.el.option("All facilities", value=""),
+                rx.foreach(
+                    DashboardState.facilities,
+                    lambda facility: rx.el.option(
+                        facility, value=facility
+                    ),
+                ),
+                name="facility",
+                default_value=DashboardState.filter_facility,
+                class_name=FILTER_INPUT_CLASS,
+            ),
+        ),
+        rx.el.div(
+            rx.el.label(
+                "From",
+                class_name="block text-sm font-medium text-gray-700",
+            ),
+            rx.el.input(
+                type="date",
+                name="date_from",
+                default_value=DashboardState.filter_date_from,
+                class_name=FILTER_INPUT_CLASS,
+            ),
+        ),
+        rx.el.div(
+            rx.el.label(
+                "To",
+                class_name="block text-sm font-medium text-gray-700",
+            ),
+            rx.el.input(
+                type="date",
+                name="date_to",
+                default_value=DashboardState.filter_date_to,
+                class_name=FILTER_INPUT_CLASS,
+            ),
+        ),
+        rx.el.div(
+            rx.el.label(
+                "Group by",
+                class_name="block text-sm font-medium text-gray-700",
+            ),
+            rx.el.select(
+                rx.foreach(
+                    DashboardState.periods,
+                    lambda period: rx.el.option(
+                        period.capitalize(), value=period
+                    ),
+                ),
+                name="period",
+                default_value=DashboardState.period,
+                class_name=FILTER_INPUT_CLASS,
+            ),
+        ),
+        rx.el.button(
+            "Apply",
+            type="submit",
+            class_name="self-end px-6 py-2 bg-indigo-600 text-white font-semibold rounded-md shadow-sm hover:bg-indigo-700",
+        ),
+        on_submit=DashboardState.apply_dashboard_filters,
+        reset_on_submit=False,
+        class_name="grid grid-cols-1 md:grid-cols-5 gap-4 mb-8 p-6 bg-white rounded-lg shadow border",
+    )
+
+
+def totals_row(
+    total: rx.Var[FacilityPeriodTotal],
+) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(
+            total["period"], class_name=TABLE_CELL_CLASS
+        ),
+        rx.el.td(
+            total["facility"], class_name=TABLE_CELL_CLASS
+        ),
+        rx.el.td(
+            total["handovers"], class_name=TABLE_CELL_CLASS
+        ),
+        rx.el.td(
+            total["qty_2m"], class_name=TABLE_CELL_CLASS
+        ),
+        rx.el.td(
+            total["qty_4m"], class_name=TABLE_CELL_CLASS
+        ),
+        rx.el.td(
+            total["qty_7m"], class_name=TABLE_CELL_CLASS
+        ),
+    )
+
+
+def totals_table() -> rx.Component:
+    return rx.el.section(
+        rx.el.h2(
+            "Cylinder Totals",
+            class_name="text-xl font-semibold text-gray-700 mb-4 border-b pb-2",
+        ),
+        rx.cond(
+            DashboardState.totals.length() > 0,
+            rx.el.table(
+                rx.el.thead(
+                    rx.el.tr(
+                        rx.el.th(
+                            "Period",
+                            class_name=TABLE_HEADER_CLASS,
+                        ),
+                        rx.el.th(
+                            "Facility",
+                            class_name=TABLE_HEADER_CLASS,
+                        ),
+                        rx.el.th(
+                            "Handovers",
+                            class_name=TABLE_HEADER_CLASS,
+                        ),
+                        rx.el.th(
+                            "2m³",
+                            class_name=TABLE_HEADER_CLASS,
+                        ),
+                        rx.el.th(
+                            "4m³",
+                            class_name=TABLE_HEADER_CLASS,
+                        ),
+                        rx.el.th(
+                            "7m³",
+                            class_name=TABLE_HEADER_CLASS,
+                        ),
+                    )
+                ),
+                rx.el.tbody(
+                    rx.foreach(
+                        DashboardState.totals, totals_row
+                    )
+                ),
+                class_name="min-w-full divide-y divide-gray-200",
+            ),
+            rx.el.p(
+                "No handovers match these filters.",
+                class_name="text-gray-600 text-center py-6",
+            ),
+        ),
+        class_name="mb-8 p-6 bg-white rounded-lg shadow border",
+    )
+
+
+def distribution_bar(
+    bucket: rx.Var[DistributionBucket],
+) -> rx.Component:
+    return rx.el.div(
+        rx.el.span(
+            bucket["label"],
+            class_name="w-40 text-sm text-gray-700",
+        ),
+        rx.el.div(
+            rx.el.div(
+                class_name="h-4 bg-indigo-500 rounded",
+                style={"width": f"{bucket['percent']}%"},
+            ),
+            class_name="flex-1 bg-gray-100 rounded mx-3",
+        ),
+        rx.el.span(
+            bucket["count"],
+            class_name="w-16 text-right text-sm text-gray-600",
+        ),
+        class_name="flex items-center mb-2",
+    )
+
+
+def distribution_panel(
+    title: str,
+    buckets: rx.Var[list[DistributionBucket]],
+) -> rx.Component:
+    return rx.el.section(
+        rx.el.h2(
+            title,
+            class_name="text-xl font-semibold text-gray-700 mb-4 border-b pb-2",
+        ),
+        rx.foreach(buckets, distribution_bar),
+        class_name="p-6 bg-white rounded-lg shadow border",
+    )
+
+
+def dashboard_page() -> rx.Component:
+    return main_layout(
+        rx.el.div(
+            rx.el.h1(
+                "Handover Dashboard",
+                class_name="text-3xl font-bold text-gray-800 mb-8",
+            ),
+            dashboard_filters(),
+            rx.cond(
+                DashboardState.is_loading_dashboard,
+                rx.el.div(
+                    rx.icon(
+                        tag="loader",
+                        class_name="animate-spin h-10 w-10 text-indigo-600 mx-auto",
+                    ),
+                    class_name="flex justify-center py-10",
+                ),
+                rx.el.div(
+                    totals_table(),
+                    rx.el.div(
+                        distribution_panel(
+                            "Purity Readings",
+                            DashboardState.purity_distribution,
+                        ),
+                        distribution_panel(
+                            "Pressure Readings (psi)",
+                            DashboardState.pressure_distribution,
+                        ),
+                        class_name="grid grid-cols-1 md:grid-cols-2 gap-6",
+                    ),
+                ),
+            ),
+            class_name="p-4",
+        )
+    )
\ No newline at end of file
@@ -7,6 +7,22 @@ from app.components.navbar import main_layout
 from typing import List
 
 
+def cylinder_check_field_error(
+    size_key: str, index: int, field_name: str
+) -> rx.Component:
+    error_key = f"{size_key}_{index}_{field_name}"
+    return rx.cond(
+        CylinderState.cylinder_check_errors.contains(
+            error_key
+        ),
+        rx.el.p(
+            CylinderState.cylinder_check_errors[error_key],
+            class_name="mt-1 text-xs text-red-600",
+        ),
+        rx.fragment(),
+    )
+
+
 def cylinder_check_row(
     size_key: str,
     check_data_list_var: rx.Var[List[CylinderCheckData]],
@@ -25,14 +41,17 @@ def cylinder_check_row(
             ),
             rx.el.input(
                 type="text",
-                default_value=check_data_list_var[index][
-                    "cylinder_id"
-                ].to_string(),
-                on_change=lambda val: CylinderState.update_cylinder_check_field(
-                    size_key, index, "cylinder_id", val
+                default_value=rx.cond(
+                    check_data_list_var[index]["cylinder_id"],
+                    check_data_list_var[index]["cylinder_id"],
+                    "",
                 ),
+                name=f"{size_key}_{index}_cylinder_id",
                 class_name="mt-1 block w-full px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm",
             ),
+            cylinder_check_field_error(
+                size_key, index, "cylinder_id"
+            ),
             class_name="mb-4",
         ),
         rx.el.div(
@@ -45,15 +64,22 @@ def cylinder_check_row(
                 min="0",
                 max="99",
                 step="0.1",
-                default_value=check_data_list_var[index][
-                    "purity"
-                ].to_string(),
-                on_change=lambda val: CylinderState.update_cylinder_check_field(
-                    size_key, index, "purity", val
+                default_value=rx.cond(
+                    check_data_list_var[index][
+                        "purity"
+                    ].is_not_none(),
+                    check_data_list_var[index][
+                        "purity"
+                    ].to_string(),
+                    "",
                 ),
+                name=f"{size_key}_{index}_purity",
                 required=True,
                 class_name="mt-1 block w-full px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm",
             ),
+            cylinder_check_field_error(
+                size_key, index, "purity"
+            ),
             class_name="mb-4",
         ),
         rx.el.div(
@@ -66,15 +92,22 @@ def cylinder_check_row(
                 min="0",
                 max="2000",
                 step="1",
-                default_value=check_data_list_var[index][
-                    "pressure"
-                ].to_string(),
-                on_change=lambda val: CylinderState.update_cylinder_check_field(
-                    size_key, index, "pressure", val
+                default_value=rx.cond(
+                    check_data_list_var[index][
+                        "pressure"
+                    ].is_not_none(),
+                    check_data_list_var[index][
+                        "pressure"
+                    ].to_string(),
+                    "",
                 ),
+                name=f"{size_key}_{index}_pressure",
                 required=True,
                 class_name="mt-1 block w-full px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm",
             ),
+            cylinder_check_field_error(
+                size_key, index, "pressure"
+            ),
             class_name="mb-4",
         ),
         class_name="p-6 bg-white rounded-lg shadow-md border border-gray-200 mb-6 transition-all hover:shadow-lg",
@@ -152,14 +185,9 @@ def handover_entry_page_2() -> rx.Component:
                     ),
                 ),
                 rx.el.div(
-                    rx.el.button(
-                        "Previous",
-                        on_click=CylinderState.go_to_page_1,
-                        class_name="mt-8 py-2 px-6 border border-gray-300 rounded-md shadow-sm text-sm font-medium text-gray-700 bg-white hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-indigo-500",
-                    ),
                     rx.el.button(
                         "Submit Handover",
-                        on_click=CylinderState.submit_final_form,
+                        type="submit",
                         disabled=CylinderState.total_forms_to_show
                         <= 0,
                         class_name=rx.cond(
@@ -169,8 +197,19 @@ def handover_entry_page_2() -> rx.Component:
                             "mt-8 py-2 px-6 border border-transparent rounded-md shadow-sm text-sm font-medium text-white bg-green-600 hover:bg-green-700 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-green-500",
                         ),
                     ),
-                    class_name="flex justify-between mt-10",
+                    rx.el.button(
+                        "Previous",
+                        type="submit",
+                        form_no_validate=True,
+                        on_click=CylinderState.set_page_2_intent(
+                            "previous"
+                        ),
+                        class_name="mt-8 py-2 px-6 border border-gray-300 rounded-md shadow-sm text-sm font-medium text-gray-700 bg-white hover:bg-gray-50 focus:outline-none focus:ring-2 focus:ring-offset-2 focus:ring-indigo-500",
+                    ),
+                    class_name="flex flex-row-reverse justify-between mt-10",
                 ),
+                on_submit=CylinderState.handle_page_2_submit,
+                reset_on_submit=False,
                 class_name="space-y-8",
             ),
             class_name="max-w-3xl mx-auto pb-12",
@@ -0,0 +1,112 @@
+import reflex as rx
+from app.states.import_state import (
+    IMPORT_FILE_INPUT_ID,
+    ImportState,
+)
+from app.importers.handover_import import ImportFailure
+from app.components.navbar import main_layout
+
+
+def import_failure_row(
+    failure: rx.Var[ImportFailure],
+) -> rx.Component:
+    return rx.el.tr(
+        rx.el.td(
+            failure["line"],
+            class_name="px-3 py-2 text-sm text-gray-700 align-top",
+        ),
+        rx.el.td(
+            rx.foreach(
+                failure["errors"],
+                lambda message: rx.el.p(
+                    message,
+                    class_name="text-sm text-red-600",
+                ),
+            ),
+            class_name="px-3 py-2",
+        ),
+    )
+
+
+def import_report() -> rx.Component:
+    return rx.el.div(
+        rx.el.p(
+            f"Rows read: {ImportState.import_rows_read} · Imported: {ImportState.import_inserted} · Failed: {ImportState.import_failed}",
+            class_name="text-md font-medium text-gray-700 mb-4",
+        ),
+        rx.cond(
+            ImportState.import_failures.length() > 0,
+            rx.el.table(
+                rx.el.thead(
+                    rx.el.tr(
+                        rx.el.th(
+                            "Line",
+                            class_name="px-3 py-2 text-left text-xs font-semibold text-gray-500 uppercase",
+                        ),
+                        rx.el.th(
+                            "Problems",
+                            class_name="px-3 py-2 text-left text-xs font-semibold text-gray-500 uppercase",
+                        ),
+                    )
+                ),
+                rx.el.tbody(
+                    rx.foreach(
+                        ImportState.import_failures,
+                        import_failure_row,
+                    )
+                ),
+                class_name="min-w-full divide-y divide-gray-200 border",
+            ),
+            rx.fragment(),
+        ),
+        rx.cond(
+            ImportState.import_failed
+            > ImportState.import_failures.length(),
+            rx.el.p(
+                f"Showing the first {ImportState.import_failures.length()} failed rows.",
+                class_name="text-sm text-gray-500 mt-2",
+            ),
+            rx.fragment(),
+        ),
+        class_name="mt-6 p-6 bg-white rounded-lg shadow border",
+    )
+
+
+def import_page() -> rx.Component:
+    return main_layout(
+        rx.el.div(
+            rx.el.h1(
+                "Import Handovers",
+                class_name="text-3xl font-bold text-gray-800 mb-8",
+            ),
+            rx.el.section(
+                rx.el.p(
+                    "Upload a CSV file (one handover per row, checks in columns such as 2m_1_cylinder_id, 2m_1_purity, 2m_1_pressure) or a JSONL file (one handover object per line). Rows are checked against the same rules as the entry form; rows that fail are listed below and the rest are imported.",
+                    class_name="text-sm text-gray-600 mb-4",
+                ),
+                rx.el.input(
+                    type="file",
+                    id=IMPORT_FILE_INPUT_ID,
+                    accept=".csv,.jsonl,.ndjson",
+                    class_name="block w-full text-sm text-gray-700 mb-4",
+                ),
+                rx.el.button(
+                    rx.cond(
+                        ImportState.is_importing,
+                        "Importing...",
+                        "Import",
+                    ),
+                    on_click=ImportState.start_import,
+                    disabled=ImportState.is_importing,
+                    class_name="px-6 py-2 bg-indigo-600 text-white font-semibold rounded-md shadow-sm hover:bg-indigo-700 disabled:opacity-50",
+                ),
+                class_name="p-6 bg-white rounded-lg shadow border",
+            ),
+            rx.cond(
+                ImportState.has_import_report,
+                import_report(),
+                rx.fragment(),
+            ),
+            class_name="p-4",
+        )
+    )
\ No newline at end of file
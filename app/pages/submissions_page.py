@@ -2,6 +2,7 @@ import reflex as rx
 from app.states.cylinder_state import (
     CylinderState,
     HandoverEntry,
+    HandoverCheckDetail,
     CylinderCheckData,
 )
 from app.components.navbar import main_layout
@@ -26,7 +27,16 @@ def display_cylinder_checks_for_size(
                         f"Cylinder {idx + 1}: ID: {rx.cond(check['cylinder_id'], check['cylinder_id'], 'N/A')}, Purity: {check['purity']}%, Pressure: {check['pressure']} psi",
                         class_name="text-xs text-gray-600",
                     ),
-                    class_name="ml-4 mb-1",
+                    rx.cond(
+                        check["cylinder_id"],
+                        rx.el.a(
+                            "History",
+                            href=f"/cylinders?cylinder_id={check['cylinder_id']}",
+                            class_name="text-xs text-indigo-600 hover:underline",
+                        ),
+                        rx.fragment(),
+                    ),
+                    class_name="ml-4 mb-1 flex items-center gap-2",
                 ),
             ),
         ),
@@ -34,15 +44,48 @@ def display_cylinder_checks_for_size(
     )
 
 
-def submission_card(
+def submission_checks_detail(
+    detail: rx.Var[HandoverCheckDetail],
+) -> rx.Component:
+    return rx.cond(
+        (detail["cylinder_checks_2m"].length() > 0)
+        | (detail["cylinder_checks_4m"].length() > 0)
+        | (detail["cylinder_checks_7m"].length() > 0),
+        rx.el.div(
+            rx.el.h4(
+                "Cylinder Checks:",
+                class_name="text-md font-medium text-gray-700 mt-3 mb-1",
+            ),
+            display_cylinder_checks_for_size(
+                detail["cylinder_checks_2m"],
+                "2m³",
+            ),
+            display_cylinder_checks_for_size(
+                detail["cylinder_checks_4m"],
+                "4m³",
+            ),
+            display_cylinder_checks_for_size(
+                detail["cylinder_checks_7m"],
+                "7m³",
+            ),
+            class_name="mt-2",
+        ),
+        rx.fragment(),
+    )
+
+
+def submission_details(
     submission: rx.Var[HandoverEntry], index: rx.Var[int]
 ) -> rx.Component:
     return rx.el.details(
         rx.el.summary(
             rx.el.h3(
-                f"Submission #{index + 1} - Facility: {submission['facility']}",
+                f"Submission #{index + CylinderState.submissions_window_offset + 1} - Facility: {submission['facility']}",
                 class_name="text-lg font-semibold text-indigo-700 cursor-pointer",
-            )
+            ),
+            on_click=CylinderState.toggle_submission_details(
+                submission["_id"]
+            ),
         ),
         rx.el.div(
             rx.el.p(
@@ -77,44 +120,18 @@ def submission_card(
                 class_name="mt-2",
             ),
             rx.cond(
-                (
-                    submission[
-                        "cylinder_checks_2m"
-                    ].length()
-                    > 0
-                )
-                | (
-                    submission[
-                        "cylinder_checks_4m"
-                    ].length()
-                    > 0
-                )
-                | (
-                    submission[
-                        "cylinder_checks_7m"
-                    ].length()
-                    > 0
+                CylinderState.open_submission_details.contains(
+                    submission["_id"]
                 ),
-                rx.el.div(
-                    rx.el.h4(
-                        "Cylinder Checks:",
-                        class_name="text-md font-medium text-gray-700 mt-3 mb-1",
-                    ),
-                    display_cylinder_checks_for_size(
-                        submission["cylinder_checks_2m"],
-                        "2m³",
-                    ),
-                    display_cylinder_checks_for_size(
-                        submission["cylinder_checks_4m"],
-                        "4m³",
-                    ),
-                    display_cylinder_checks_for_size(
-                        submission["cylinder_checks_7m"],
-                        "7m³",
-                    ),
-                    class_name="mt-2",
+                submission_checks_detail(
+                    CylinderState.open_submission_details[
+                        submission["_id"]
+                    ]
+                ),
+                rx.el.p(
+                    "Loading cylinder checks...",
+                    class_name="text-xs text-gray-500 mt-3",
                 ),
-                rx.fragment(),
             ),
             rx.el.button(
                 "Delete",
@@ -125,17 +142,280 @@ def submission_card(
             ),
             class_name="pt-2 pb-4 px-4",
         ),
-        class_name="bg-white p-4 rounded-lg shadow border mb-6",
+        class_name="flex-1 bg-white p-4 rounded-lg shadow border",
+    )
+
+
+def submission_card(
+    submission: rx.Var[HandoverEntry], index: rx.Var[int]
+) -> rx.Component:
+    return rx.el.div(
+        rx.el.input(
+            type="checkbox",
+            checked=CylinderState.selected_submission_ids.contains(
+                submission["_id"]
+            ),
+            on_change=lambda _: CylinderState.toggle_submission_selection(
+                submission["_id"]
+            ),
+            class_name="mt-6 h-4 w-4 text-indigo-600 border-gray-300 rounded",
+        ),
+        submission_details(submission, index),
+        class_name="flex items-start gap-3 mb-6",
+    )
+
+
+SUBMISSION_FILTERS_FORM_ID = "submission-filters"
+FILTER_LABEL_CLASS = "block text-sm font-medium text-gray-700"
+FILTER_INPUT_CLASS = "mt-1 block w-full px-3 py-2 bg-white border border-gray-300 rounded-md shadow-sm focus:outline-none focus:ring-indigo-500 focus:border-indigo-500 sm:text-sm"
+CLEAR_FILTERS_SCRIPT = (
+    """
+document
+  .querySelectorAll("#%s input, #%s select")
+  .forEach((el) => (el.value = ""));
+"""
+    % (
+        SUBMISSION_FILTERS_FORM_ID,
+        SUBMISSION_FILTERS_FORM_ID,
+    )
+)
+
+
+def filter_field(
+    label: str, control: rx.Component
+) -> rx.Component:
+    return rx.el.div(
+        rx.el.label(label, class_name=FILTER_LABEL_CLASS),
+        control,
+    )
+
+
+def filter_text_input(
+    name: str, value: rx.Var[str], placeholder: str
+) -> rx.Component:
+    return rx.el.input(
+        name=name,
+        default_value=value,
+        placeholder=placeholder,
+        class_name=FILTER_INPUT_CLASS,
+    )
+
+
+def submission_filters() -> rx.Component:
+    return rx.el.form(
+        filter_field(
+            "Facility",
+            rx.el.select(
+                rx.el.option("All facilities", value=""),
+                rx.foreach(
+                    CylinderState.facilities,
+                    lambda facility: rx.el.option(
+                        facility, value=facility
+                    ),
+                ),
+                name="facility",
+                default_value=CylinderState.filter_facility,
+                class_name=FILTER_INPUT_CLASS,
+            ),
+        ),
+        filter_field(
+            "From",
+            rx.el.input(
+                type="date",
+                name="date_from",
+                default_value=CylinderState.filter_date_from,
+                class_name=FILTER_INPUT_CLASS,
+            ),
+        ),
+        filter_field(
+            "To",
+            rx.el.input(
+                type="date",
+                name="date_to",
+                default_value=CylinderState.filter_date_to,
+                class_name=FILTER_INPUT_CLASS,
+            ),
+        ),
+        filter_field(
+            "Submitted by",
+            filter_text_input(
+                "submitted_by",
+                CylinderState.filter_submitted_by,
+                "Username",
+            ),
+        ),
+        filter_field(
+            "Receiving personnel",
+            filter_text_input(
+                "receiving_personnel",
+                CylinderState.filter_receiving_personnel,
+                "Starts with...",
+            ),
+        ),
+        filter_field(
+            "Cylinder ID",
+            filter_text_input(
+                "cylinder_id",
+                CylinderState.filter_cylinder_id,
+                "Exact ID",
+            ),
+        ),
+        rx.el.div(
+            rx.el.button(
+                "Clear",
+                type="button",
+                on_click=[
+                    rx.call_script(CLEAR_FILTERS_SCRIPT),
+                    CylinderState.clear_submission_filters,
+                ],
+                class_name="mr-2 px-4 py-2 text-sm font-medium bg-gray-200 text-gray-700 rounded-md hover:bg-gray-300",
+            ),
+            rx.el.button(
+                "Apply",
+                type="submit",
+                class_name="px-6 py-2 bg-indigo-600 text-white font-semibold rounded-md shadow-sm hover:bg-indigo-700",
+            ),
+            class_name="md:col-span-3 flex justify-end",
+        ),
+        id=SUBMISSION_FILTERS_FORM_ID,
+        on_submit=CylinderState.apply_submission_filters,
+        reset_on_submit=False,
+        class_name="grid grid-cols-1 md:grid-cols-3 gap-4 mb-8 p-6 bg-white rounded-lg shadow border",
+    )
+
+
+def bulk_selection_toolbar() -> rx.Component:
+    return rx.cond(
+        CylinderState.selected_submission_ids.length() > 0,
+        rx.el.div(
+            rx.el.span(
+                f"{CylinderState.selected_submission_ids.length()} selected",
+                class_name="text-sm font-medium text-gray-700",
+            ),
+            rx.el.div(
+                rx.el.button(
+                    "Clear",
+                    on_click=CylinderState.clear_submission_selection,
+                    class_name="mr-2 px-3 py-1.5 text-xs font-medium bg-gray-200 text-gray-700 rounded-md hover:bg-gray-300",
+                ),
+                rx.el.button(
+                    "Delete selected",
+                    on_click=CylinderState.prepare_bulk_delete_submissions,
+                    class_name="px-3 py-1.5 text-xs font-medium text-white bg-red-600 rounded-md shadow-sm hover:bg-red-700",
+                ),
+            ),
+            class_name="sticky top-0 z-10 flex items-center justify-between mb-6 p-3 bg-white rounded-lg shadow border",
+        ),
+        rx.fragment(),
+    )
+
+
+LOAD_MORE_BUTTON_ID = "load-more-submissions"
+SUBMISSIONS_REFRESH_INTERVAL_MS = 30000
+
+INFINITE_SCROLL_SCRIPT = (
+    """
+(function () {
+  if (window.__submissionsInfiniteScroll) return;
+  window.__submissionsInfiniteScroll = true;
+  let observed = null;
+  const isVisible = (el) => {
+    const rect = el.getBoundingClientRect();
+    return rect.top < window.innerHeight + 400;
+  };
+  const trigger = (el) => {
+    if (el && !el.disabled && isVisible(el)) el.click();
+  };
+  const intersection = new IntersectionObserver(
+    (entries) => entries.forEach((e) => e.isIntersecting && trigger(e.target)),
+    { rootMargin: "400px" }
+  );
+  const bind = () => {
+    const el = document.getElementById("%s");
+    if (el !== observed) {
+      if (observed) intersection.unobserve(observed);
+      observed = el;
+      if (el) intersection.observe(el);
+    }
+    trigger(el);
+  };
+  new MutationObserver(bind).observe(document.body, {
+    childList: true,
+    subtree: true,
+    attributes: true,
+    attributeFilter: ["disabled"],
+  });
+  bind();
+})();
+"""
+    % LOAD_MORE_BUTTON_ID
+)
+
+
+def submissions_window_controls_top() -> rx.Component:
+    return rx.cond(
+        CylinderState.has_newer_submissions,
+        rx.el.button(
+            "Show newer submissions",
+            on_click=CylinderState.load_newer_submissions,
+            disabled=CylinderState.is_loading_more_submissions,
+            class_name="w-full mb-6 py-2 text-sm font-medium text-indigo-700 bg-indigo-50 border border-indigo-200 rounded-md hover:bg-indigo-100",
+        ),
+        rx.fragment(),
+    )
+
+
+def submissions_window_controls_bottom() -> rx.Component:
+    return rx.el.div(
+        rx.el.button(
+            rx.cond(
+                CylinderState.is_loading_more_submissions,
+                "Loading...",
+                rx.cond(
+                    CylinderState.has_more_submissions,
+                    "Load more",
+                    "No more submissions",
+                ),
+            ),
+            id=LOAD_MORE_BUTTON_ID,
+            on_click=CylinderState.load_more_submissions,
+            disabled=~CylinderState.has_more_submissions
+            | CylinderState.is_loading_more_submissions,
+            class_name="w-full py-2 text-sm font-medium text-gray-600 bg-white border border-gray-300 rounded-md hover:bg-gray-50 disabled:opacity-60 disabled:cursor-default",
+        ),
+        rx.script(INFINITE_SCROLL_SCRIPT),
+        class_name="mb-6",
     )
 
 
 def submissions_page() -> rx.Component:
     return main_layout(
         rx.el.div(
-            rx.el.h1(
-                "Submitted Handover Entries",
-                class_name="text-3xl font-bold text-gray-800 mb-8",
+            rx.el.div(
+                rx.el.h1(
+                    "Submitted Handover Entries",
+                    class_name="text-3xl font-bold text-gray-800",
+                ),
+                rx.el.div(
+                    rx.el.button(
+                        "Export CSV",
+                        on_click=CylinderState.export_submissions(
+                            "csv"
+                        ),
+                        class_name="px-4 py-2 bg-white border border-gray-300 text-gray-700 text-sm font-medium rounded-md shadow-sm hover:bg-gray-50",
+                    ),
+                    rx.el.button(
+                        "Export XLSX",
+                        on_click=CylinderState.export_submissions(
+                            "xlsx"
+                        ),
+                        class_name="px-4 py-2 bg-white border border-gray-300 text-gray-700 text-sm font-medium rounded-md shadow-sm hover:bg-gray-50",
+                    ),
+                    class_name="flex space-x-2",
+                ),
+                class_name="flex items-center justify-between mb-8",
             ),
+            submission_filters(),
             rx.cond(
                 CylinderState.is_loading_submissions,
                 rx.el.div(
@@ -149,12 +429,15 @@ def submissions_page() -> rx.Component:
                     CylinderState.all_submissions.length()
                     > 0,
                     rx.el.div(
+                        bulk_selection_toolbar(),
+                        submissions_window_controls_top(),
                         rx.foreach(
                             CylinderState.all_submissions,
-                            lambda sub, idx: submission_card(
-                                sub, idx
+                            lambda sub, idx: (
+                                submission_card(sub, idx)
                             ),
-                        )
+                        ),
+                        submissions_window_controls_bottom(),
                     ),
                     rx.el.p(
                         "No submissions found.",
@@ -162,6 +445,11 @@ def submissions_page() -> rx.Component:
                     ),
                 ),
             ),
+            rx.moment(
+                interval=SUBMISSIONS_REFRESH_INTERVAL_MS,
+                on_change=lambda _: CylinderState.refresh_submissions,
+                display="none",
+            ),
             rx.dialog.root(
                 rx.dialog.trigger(rx.fragment()),
                 rx.dialog.content(
@@ -170,7 +458,11 @@ def submissions_page() -> rx.Component:
                         class_name="text-lg font-bold text-gray-800 mb-2",
                     ),
                     rx.dialog.description(
-                        "Are you sure you want to delete this submission? This action cannot be undone.",
+                        rx.cond(
+                            CylinderState.is_bulk_delete,
+                            f"Are you sure you want to delete the {CylinderState.selected_submission_ids.length()} selected submissions? This action cannot be undone.",
+                            "Are you sure you want to delete this submission? This action cannot be undone.",
+                        ),
                         class_name="text-sm text-gray-600 mb-4",
                     ),
                     rx.el.div(
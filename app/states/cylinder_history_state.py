@@ -0,0 +1,134 @@
+import datetime
+import reflex as rx
+from typing import Any
+from pymongo import errors
+from app.db.cylinder_history import (
+    CYLINDER_TREND_DAYS,
+    CylinderReading,
+    CylinderTrendPoint,
+    readings_for_cylinder,
+    trend_points,
+)
+from app.states.repository_mixin import RepositoryMixin
+
+
+class CylinderHistoryState(RepositoryMixin, rx.State):
+    cylinder_id: str = ""
+    readings: list[CylinderReading] = []
+    trend: list[CylinderTrendPoint] = []
+    is_loading_history: bool = False
+    has_more_history: bool = False
+    _history_cursor: Any = None
+
+    @rx.var
+    def facility_trail(self) -> list[str]:
+        trail: list[str] = []
+        for reading in self.readings:
+            if (
+                not trail
+                or trail[-1] != reading["facility"]
+            ):
+                trail.append(reading["facility"])
+        return trail
+
+    async def _fetch_history_page(self):
+        repository = await self._get_repository()
+        if repository is None:
+            self.is_loading_history = False
+            yield rx.toast.error(
+                "Database connection not available for fetching. Please sign in again."
+            )
+            return
+        first_page = self._history_cursor is None
+        try:
+            (
+                documents,
+                has_more,
+            ) = await repository.list_cylinder_history(
+                self.cylinder_id, self._history_cursor
+            )
+            if first_page:
+                self.trend = trend_points(
+                    await repository.list_cylinder_readings(
+                        self.cylinder_id,
+                        start=datetime.datetime.now(
+                            datetime.timezone.utc
+                        )
+                        - datetime.timedelta(
+                            days=CYLINDER_TREND_DAYS
+                        ),
+                    )
+                )
+        except errors.PyMongoError as e:
+            yield rx.toast.error(
+                f"Error loading cylinder history: {str(e)}"
+            )
+            return
+        finally:
+            repository.close()
+            self.is_loading_history = False
+        page: list[CylinderReading] = []
+        for document in documents:
+            page.extend(
+                readings_for_cylinder(
+                    document, self.cylinder_id
+                )
+            )
+        self.readings = self.readings + page
+        self.has_more_history = has_more
+        if documents:
+            self._history_cursor = (
+                documents[-1].get("submission_timestamp"),
+                str(documents[-1]["_id"]),
+            )
+        if not self.readings:
+            yield rx.toast.info(
+                f"No handovers found for cylinder {self.cylinder_id}."
+            )
+
+    @rx.event
+    async def load_cylinder_history(self):
+        cylinder_id = (
+            self.router.page.params.get("cylinder_id") or ""
+        ).strip()
+        if not cylinder_id:
+            return
+        self.cylinder_id = cylinder_id
+        self.readings = []
+        self.trend = []
+        self.has_more_history = False
+        self._history_cursor = None
+        self.is_loading_history = True
+        yield
+        async for update in self._fetch_history_page():
+            yield update
+
+    @rx.event
+    async def search_cylinder(self, form_data: dict):
+        cylinder_id = (
+            form_data.get("cylinder_id") or ""
+        ).strip()
+        if not cylinder_id:
+            yield rx.toast.error("Enter a cylinder ID.")
+            return
+        self.cylinder_id = cylinder_id
+        self.readings = []
+        self.trend = []
+        self.has_more_history = False
+        self._history_cursor = None
+        self.is_loading_history = True
+        yield
+        async for update in self._fetch_history_page():
+            yield update
+
+    @rx.event
+    async def load_more_history(self):
+        if (
+            self.is_loading_history
+            or not self.has_more_history
+        ):
+            return
+        self.is_loading_history = True
+        yield
+        async for update in self._fetch_history_page():
+            yield update
\ No newline at end of file
@@ -1,9 +1,59 @@
 import reflex as rx
-from typing import TypedDict, List
-from pymongo import MongoClient, errors
-from bson.objectid import ObjectId
-from app.states.auth_state import MONGO_URI_TEMPLATE
+from typing import Any, TypedDict, List
+from pymongo import errors
+from app.validation.cylinder_checks import (
+    field_error_key,
+    validate_cylinder_checks,
+)
+from app.validation.handover import (
+    FACILITIES,
+    expected_check_count,
+    validate_handover_header,
+)
+from app.db.repository import (
+    HandoverRepository,
+    history_generation,
+    run_db,
+)
+from app.db.journal import (
+    handover_journal,
+    remember_flusher_credentials,
+    run_journal,
+    sync_journal_entries,
+)
+from app.db.filters import (
+    HandoverFilters,
+    build_handover_query,
+    filters_from_params,
+)
+from app.db.timestamps import format_timestamp
+from app.api.grants import issue_grant
+from app.api.handover_export import EXPORT_ROUTE
+from app.states.repository_mixin import RepositoryMixin
 import datetime
+import json
+import sqlite3
+
+SUBMISSIONS_PAGE_SIZE = 25
+MAX_RENDERED_SUBMISSION_PAGES = 4
+EXPORT_DOWNLOAD_SCRIPT = """
+(() => {
+  const url = new URL("%(route)s", getBackendURL(env.UPLOAD));
+  for (const [key, value] of Object.entries(%(params)s)) {
+    url.searchParams.set(key, value);
+  }
+  const link = document.createElement("a");
+  link.href = url;
+  link.download = "";
+  document.body.appendChild(link);
+  link.click();
+  link.remove();
+})()
+"""
+
+
+def _form_value(form_data: dict, key: str) -> str:
+    return str(form_data.get(key) or "").strip()
 
 
 class CylinderCheckData(TypedDict):
@@ -20,20 +70,18 @@ class HandoverEntry(TypedDict):
     qty_2m: int
     qty_4m: int
     qty_7m: int
+    submitted_by: str
+    submission_timestamp: str
+
+
+class HandoverCheckDetail(TypedDict):
     cylinder_checks_2m: list[CylinderCheckData]
     cylinder_checks_4m: list[CylinderCheckData]
     cylinder_checks_7m: list[CylinderCheckData]
-    submitted_by: str
-    submission_timestamp: str
 
 
-class CylinderState(rx.State):
-    facilities: list[str] = [
-        "Ajeromi General Hospital",
-        "Harvey Road General Hospital",
-        "Massey Children Hospital",
-        "God's Hope",
-    ]
+class CylinderState(RepositoryMixin, rx.State):
+    facilities: list[str] = list(FACILITIES)
     selected_facility: str = ""
     receiving_personnel: str = ""
     qty_2m: int = 0
@@ -43,12 +91,36 @@ class CylinderState(rx.State):
     cylinder_checks_4m: list[CylinderCheckData] = []
     cylinder_checks_7m: list[CylinderCheckData] = []
     current_form_page: int = 1
+    _page_2_intent: str = "submit"
+    cylinder_check_errors: dict[str, str] = {}
     all_submissions: list[HandoverEntry] = []
+    filter_facility: str = ""
+    filter_date_from: str = ""
+    filter_date_to: str = ""
+    filter_submitted_by: str = ""
+    filter_receiving_personnel: str = ""
+    filter_cylinder_id: str = ""
     is_loading_submissions: bool = False
-    _DB_NAME = "Cylinder_Inventory"
-    _COLLECTION_NAME = "Handover_records"
+    is_loading_more_submissions: bool = False
+    has_more_submissions: bool = False
+    has_newer_submissions: bool = False
+    submissions_window_offset: int = 0
+    _page_cursors: list[Any] = [None]
+    _window_first_page: int = 0
+    _window_page_sizes: list[int] = []
+    _prefetched_page_number: int = -1
+    open_submission_details: dict[
+        str, HandoverCheckDetail
+    ] = {}
     show_delete_confirm_dialog: bool = False
     submission_to_delete_id: str | None = None
+    selected_submission_ids: list[str] = []
+    _submissions_watermark: Any = None
+    _newest_submission_cursor: Any = None
+    _submissions_generation: int = -1
+    is_bulk_delete: bool = False
+    pending_sync_count: int = 0
+    _unsynced_handover_ids: list[str] = []
 
     @rx.var
     async def bmt_in_charge_display(self) -> str:
@@ -64,15 +136,15 @@ class CylinderState(rx.State):
 
     @rx.var
     def num_cylinder_forms_to_show_2m(self) -> int:
-        return min(self.qty_2m, 5)
+        return expected_check_count(self.qty_2m)
 
     @rx.var
     def num_cylinder_forms_to_show_4m(self) -> int:
-        return min(self.qty_4m, 5)
+        return expected_check_count(self.qty_4m)
 
     @rx.var
     def num_cylinder_forms_to_show_7m(self) -> int:
-        return min(self.qty_7m, 5)
+        return expected_check_count(self.qty_7m)
 
     @rx.var
     def total_forms_to_show(self) -> int:
@@ -129,26 +201,16 @@ class CylinderState(rx.State):
         self.qty_7m = (
             int(raw_qty_7m) if raw_qty_7m.isdigit() else 0
         )
-        if not self.selected_facility:
-            yield rx.toast.error("Facility is required.")
-            return
-        if (
-            self.qty_2m < 0
-            or self.qty_4m < 0
-            or self.qty_7m < 0
-        ):
-            yield rx.toast.error(
-                "Cylinder quantities cannot be negative."
-            )
-            return
-        if (
-            self.qty_2m == 0
-            and self.qty_4m == 0
-            and (self.qty_7m == 0)
-        ):
-            yield rx.toast.error(
-                "At least one cylinder quantity must be greater than 0."
-            )
+        header_error = validate_handover_header(
+            self.selected_facility,
+            {
+                "2m": self.qty_2m,
+                "4m": self.qty_4m,
+                "7m": self.qty_7m,
+            },
+        )
+        if header_error:
+            yield rx.toast.error(header_error)
             return
         self.cylinder_checks_2m = (
             self._adjust_cylinder_checks_list(
@@ -168,6 +230,7 @@ class CylinderState(rx.State):
                 self.num_cylinder_forms_to_show_7m,
             )
         )
+        self.cylinder_check_errors = {}
         self.current_form_page = 2
         yield rx.redirect("/handover_entry_p2")
 
@@ -225,59 +288,95 @@ class CylinderState(rx.State):
                 f"Error accessing cylinder data for {size_key} cylinder {index + 1}. Please re-enter quantities or refresh."
             )
 
-    async def _get_db_client(self) -> MongoClient | None:
-        from app.states.auth_state import AuthState
+    @rx.event
+    def set_page_2_intent(self, intent: str):
+        self._page_2_intent = intent
 
-        auth_s = await self.get_state(AuthState)
-        username = auth_s.authenticated_username
-        password = (
-            auth_s._authenticated_password_DO_NOT_EXPOSE
-        )
-        if not username or not password:
-            return None
-        uri = MONGO_URI_TEMPLATE.format(
-            db_username=username, db_password=password
-        )
-        try:
-            client = MongoClient(
-                uri, serverSelectionTimeoutMS=5000
-            )
-            client.admin.command("ping")
-            return client
-        except (
-            errors.ConnectionFailure,
-            errors.OperationFailure,
+    def _parse_cylinder_checks_form(
+        self, form_data: dict
+    ) -> dict[str, str]:
+        parse_errors: dict[str, str] = {}
+        parsed_checks: dict[
+            str, list[CylinderCheckData]
+        ] = {}
+        for size_key, num_forms in (
+            ("2m", self.num_cylinder_forms_to_show_2m),
+            ("4m", self.num_cylinder_forms_to_show_4m),
+            ("7m", self.num_cylinder_forms_to_show_7m),
         ):
-            return None
-
-    async def _get_cylinder_check_validation_errors(
-        self,
-        checks_list: list[CylinderCheckData],
-        size_label: str,
-    ) -> list[str]:
-        error_messages: list[str] = []
-        for i, check in enumerate(checks_list):
-            if check["purity"] is None:
-                error_messages.append(
-                    f"Purity is required for {size_label} cylinder {i + 1}."
+            checks: list[CylinderCheckData] = []
+            for index in range(num_forms):
+                prefix = f"{size_key}_{index}_"
+                raw_id = _form_value(
+                    form_data, prefix + "cylinder_id"
                 )
-            elif not 0 <= check["purity"] <= 99:
-                error_messages.append(
-                    f"Purity for {size_label} cylinder {i + 1} must be between 0 and 99."
+                raw_purity = _form_value(
+                    form_data, prefix + "purity"
                 )
-            if check["pressure"] is None:
-                error_messages.append(
-                    f"Pressure is required for {size_label} cylinder {i + 1}."
+                raw_pressure = _form_value(
+                    form_data, prefix + "pressure"
                 )
-            elif not 0 <= check["pressure"] <= 2000:
-                error_messages.append(
-                    f"Pressure for {size_label} cylinder {i + 1} must be between 0 and 2000."
-                )
-        return error_messages
+                check: CylinderCheckData = {
+                    "cylinder_id": raw_id or None,
+                    "purity": None,
+                    "pressure": None,
+                }
+                try:
+                    check["purity"] = (
+                        float(raw_purity)
+                        if raw_purity
+                        else None
+                    )
+                except ValueError:
+                    parse_errors[
+                        field_error_key(
+                            size_key, index, "purity"
+                        )
+                    ] = f"Invalid input for purity at {size_key} cylinder {index + 1}"
+                try:
+                    check["pressure"] = (
+                        int(raw_pressure)
+                        if raw_pressure
+                        else None
+                    )
+                except ValueError:
+                    parse_errors[
+                        field_error_key(
+                            size_key, index, "pressure"
+                        )
+                    ] = f"Invalid input for pressure at {size_key} cylinder {index + 1}"
+                checks.append(check)
+            parsed_checks[size_key] = checks
+        self.cylinder_checks_2m = parsed_checks["2m"]
+        self.cylinder_checks_4m = parsed_checks["4m"]
+        self.cylinder_checks_7m = parsed_checks["7m"]
+        return parse_errors
+
+    @rx.event
+    async def handle_page_2_submit(self, form_data: dict):
+        parse_errors = self._parse_cylinder_checks_form(
+            form_data
+        )
+        if self._page_2_intent == "previous":
+            self._page_2_intent = "submit"
+            self.current_form_page = 1
+            yield rx.redirect("/handover_entry_p1")
+            return
+        if parse_errors:
+            self.cylinder_check_errors = parse_errors
+            yield rx.toast.error(
+                f"Please fix {len(parse_errors)} highlighted field(s)."
+            )
+            return
+        async for update in self._submit_handover():
+            yield update
 
     @rx.event
     async def submit_final_form(self):
-        all_validation_errors: list[str] = []
+        async for update in self._submit_handover():
+            yield update
+
+    async def _submit_handover(self):
         plain_checks_2m = self._plain_python_checks_list(
             self.cylinder_checks_2m
         )
@@ -287,39 +386,39 @@ class CylinderState(rx.State):
         plain_checks_7m = self._plain_python_checks_list(
             self.cylinder_checks_7m
         )
-        errors_2m = await self._get_cylinder_check_validation_errors(
-            plain_checks_2m, "2m³"
-        )
-        all_validation_errors.extend(errors_2m)
-        errors_4m = await self._get_cylinder_check_validation_errors(
-            plain_checks_4m, "4m³"
-        )
-        all_validation_errors.extend(errors_4m)
-        errors_7m = await self._get_cylinder_check_validation_errors(
-            plain_checks_7m, "7m³"
+        validation_errors = validate_cylinder_checks(
+            {
+                "2m": plain_checks_2m,
+                "4m": plain_checks_4m,
+                "7m": plain_checks_7m,
+            }
         )
-        all_validation_errors.extend(errors_7m)
-        if all_validation_errors:
-            for error_msg in all_validation_errors:
-                yield rx.toast.error(error_msg)
+        self.cylinder_check_errors = {
+            field_error_key(
+                error["size_key"],
+                error["index"],
+                error["field"],
+            ): error["message"]
+            for error in validation_errors
+        }
+        if validation_errors:
+            yield rx.toast.error(
+                f"Please fix {len(validation_errors)} highlighted field(s)."
+            )
             return
-        client = await self._get_db_client()
-        if client is None:
+        credentials = await self._get_db_credentials()
+        if credentials is None:
             yield rx.toast.error(
-                "Database connection error. Please sign in again."
+                "Your session has expired. Please sign in again."
             )
             from app.states.auth_state import AuthState
 
             auth_s_check = await self.get_state(AuthState)
             if auth_s_check.is_authenticated:
-                yield auth_s_check.sign_out()
+                yield await auth_s_check.sign_out()
             return
+        username, password = credentials
         try:
-            db = client[self._DB_NAME]
-            collection = db[self._COLLECTION_NAME]
-            from app.states.auth_state import AuthState
-
-            auth_s_submit = await self.get_state(AuthState)
             current_bmt_in_charge = (
                 await self.bmt_in_charge_display
             )
@@ -337,27 +436,69 @@ class CylinderState(rx.State):
                 "cylinder_checks_2m": plain_checks_2m,
                 "cylinder_checks_4m": plain_checks_4m,
                 "cylinder_checks_7m": plain_checks_7m,
-                "submitted_by": auth_s_submit.authenticated_username
-                or "Unknown",
-                "submission_timestamp": datetime.datetime.utcnow().isoformat(),
+                "submitted_by": username,
+                "submission_timestamp": datetime.datetime.utcnow(),
             }
-            collection.insert_one(entry_data_to_insert)
-            yield rx.toast.success(
-                "Handover entry submitted successfully!"
+            remember_flusher_credentials(username, password)
+            handover_id = await run_journal(
+                handover_journal.append,
+                username,
+                entry_data_to_insert,
+            )
+            self._unsynced_handover_ids.append(handover_id)
+            self.pending_sync_count = await run_journal(
+                handover_journal.pending_count, username
             )
             self._reset_form_state()
+            yield rx.toast.info("Handover entry saved.")
             yield rx.redirect("/handover_entry_p1")
-        except errors.OperationFailure as e:
+            yield CylinderState.sync_submitted_handovers
+        except sqlite3.Error as e:
             yield rx.toast.error(
-                f"Database operation failed: {str(e)}"
+                f"Failed to save handover locally: {str(e)}"
             )
-        except Exception as e:
-            yield rx.toast.error(
-                f"Failed to submit form: {str(e)}"
+
+    @rx.event(background=True)
+    async def sync_submitted_handovers(self):
+        async with self:
+            handover_ids = self._unsynced_handover_ids
+            self._unsynced_handover_ids = []
+            credentials = await self._get_db_credentials()
+        if not handover_ids or credentials is None:
+            return
+        username = credentials[0]
+        try:
+            still_pending = await sync_journal_entries(
+                username, handover_ids
+            )
+        except Exception:
+            still_pending = len(handover_ids)
+        async with self:
+            self.pending_sync_count = await run_journal(
+                handover_journal.pending_count, username
+            )
+        if still_pending:
+            yield rx.toast.warning(
+                "Database unavailable. The handover is saved on the server and will sync automatically."
+            )
+        else:
+            yield rx.toast.success(
+                "Handover entry submitted successfully!"
             )
-        finally:
-            if client:
-                client.close()
+
+    @rx.event
+    async def refresh_pending_sync_count(self):
+        credentials = await self._get_db_credentials()
+        if credentials is None:
+            self.pending_sync_count = 0
+            return
+        try:
+            self.pending_sync_count = await run_journal(
+                handover_journal.pending_count,
+                credentials[0],
+            )
+        except sqlite3.Error:
+            pass
 
     def _reset_form_state(self):
         self.selected_facility = ""
@@ -369,16 +510,143 @@ class CylinderState(rx.State):
         self.cylinder_checks_4m = []
         self.cylinder_checks_7m = []
         self.current_form_page = 1
+        self.cylinder_check_errors = {}
         self.submission_to_delete_id = None
         self.show_delete_confirm_dialog = False
+        self.is_bulk_delete = False
+
+    def _handover_entries_from_documents(
+        self, submission_docs: list[dict[str, Any]]
+    ) -> list[HandoverEntry]:
+        submissions_list: list[HandoverEntry] = []
+        for sub_doc in submission_docs:
+            entry: HandoverEntry = {
+                "_id": str(sub_doc["_id"]),
+                "facility": sub_doc.get("facility", ""),
+                "bmt_in_charge": sub_doc.get(
+                    "bmt_in_charge", ""
+                ),
+                "receiving_personnel": sub_doc.get(
+                    "receiving_personnel"
+                ),
+                "qty_2m": sub_doc.get("qty_2m", 0),
+                "qty_4m": sub_doc.get("qty_4m", 0),
+                "qty_7m": sub_doc.get("qty_7m", 0),
+                "submitted_by": sub_doc.get(
+                    "submitted_by", "Unknown"
+                ),
+                "submission_timestamp": format_timestamp(
+                    sub_doc.get("submission_timestamp")
+                ),
+            }
+            submissions_list.append(entry)
+        return submissions_list
+
+    def _submission_filters(self) -> HandoverFilters:
+        return filters_from_params(
+            {
+                "facility": self.filter_facility,
+                "date_from": self.filter_date_from,
+                "date_to": self.filter_date_to,
+                "submitted_by": self.filter_submitted_by,
+                "receiving_personnel": self.filter_receiving_personnel,
+                "cylinder_id": self.filter_cylinder_id,
+            }
+        )
+
+    async def _fetch_submissions_page(
+        self,
+        repository: HandoverRepository,
+        after: tuple[Any, str] | None,
+    ) -> tuple[list[HandoverEntry], tuple[Any, str] | None]:
+        (
+            submission_docs,
+            has_more,
+        ) = await repository.list_handovers_page(
+            after,
+            SUBMISSIONS_PAGE_SIZE,
+            self._submission_filters(),
+        )
+        return self._submissions_page(
+            after, submission_docs, has_more
+        )
+
+    def _submissions_page(
+        self,
+        after: tuple[Any, str] | None,
+        submission_docs: list[dict[str, Any]],
+        has_more: bool,
+    ) -> tuple[list[HandoverEntry], tuple[Any, str] | None]:
+        submissions_list = (
+            self._handover_entries_from_documents(
+                submission_docs
+            )
+        )
+        if after is None and submission_docs:
+            self._newest_submission_cursor = (
+                submission_docs[0].get(
+                    "submission_timestamp"
+                ),
+                str(submission_docs[0]["_id"]),
+            )
+        next_cursor = None
+        if has_more and submission_docs:
+            last_doc = submission_docs[-1]
+            next_cursor = (
+                last_doc.get("submission_timestamp"),
+                str(last_doc["_id"]),
+            )
+        return submissions_list, next_cursor
+
+    def _clear_prefetched_page(self):
+        self._prefetched_page_number = -1
+
+    def _set_page_cursor(
+        self, page: int, cursor: tuple[Any, str] | None
+    ):
+        del self._page_cursors[page:]
+        if cursor is not None:
+            self._page_cursors.append(cursor)
+
+    def _sync_window_flags(self):
+        last_page = self._window_first_page + len(
+            self._window_page_sizes
+        )
+        self.has_more_submissions = last_page < len(
+            self._page_cursors
+        )
+        self.has_newer_submissions = (
+            self._window_first_page > 0
+        )
+
+    def _drop_hidden_submission_details(self):
+        visible_ids = {
+            entry["_id"] for entry in self.all_submissions
+        }
+        self.open_submission_details = {
+            submission_id: detail
+            for submission_id, detail in self.open_submission_details.items()
+            if submission_id in visible_ids
+        }
 
     @rx.event
     async def fetch_db_submissions(self):
         self.is_loading_submissions = True
         self.all_submissions = []
+        self.submissions_window_offset = 0
+        self._page_cursors = [None]
+        self._window_first_page = 0
+        self._window_page_sizes = []
+        self._clear_prefetched_page()
+        self._sync_window_flags()
+        self.open_submission_details = {}
+        self.selected_submission_ids = []
+        self._submissions_watermark = None
+        self._newest_submission_cursor = None
+        generation = await history_generation()
         yield
-        client = await self._get_db_client()
-        if client is None:
+        repository = await self._get_repository()
+        if repository is None:
             self.is_loading_submissions = False
             yield rx.toast.error(
                 "Database connection not available for fetching. Please sign in again."
@@ -387,56 +655,33 @@ class CylinderState(rx.State):
 
             auth_s = await self.get_state(AuthState)
             if auth_s.is_authenticated:
-                yield auth_s.sign_out()
+                yield await auth_s.sign_out()
             return
         try:
-            db = client[self._DB_NAME]
-            collection = db[self._COLLECTION_NAME]
-            submissions_cursor = collection.find({}).sort(
-                "submission_timestamp", -1
-            )
-            submissions_list: list[HandoverEntry] = []
-            for sub_doc in submissions_cursor:
-                entry: HandoverEntry = {
-                    "_id": str(sub_doc["_id"]),
-                    "facility": sub_doc.get("facility", ""),
-                    "bmt_in_charge": sub_doc.get(
-                        "bmt_in_charge", ""
-                    ),
-                    "receiving_personnel": sub_doc.get(
-                        "receiving_personnel"
-                    ),
-                    "qty_2m": sub_doc.get("qty_2m", 0),
-                    "qty_4m": sub_doc.get("qty_4m", 0),
-                    "qty_7m": sub_doc.get("qty_7m", 0),
-                    "cylinder_checks_2m": sub_doc.get(
-                        "cylinder_checks_2m", []
-                    ),
-                    "cylinder_checks_4m": sub_doc.get(
-                        "cylinder_checks_4m", []
-                    ),
-                    "cylinder_checks_7m": sub_doc.get(
-                        "cylinder_checks_7m", []
-                    ),
-                    "submitted_by": sub_doc.get(
-                        "submitted_by", "Unknown"
-                    ),
-                    "submission_timestamp": sub_doc.get(
-                        "submission_timestamp", ""
-                    ),
-                }
-                submissions_list.append(entry)
+            (
+                submissions_list,
+                next_cursor,
+            ) = await self._fetch_submissions_page(
+                repository, None
+            )
             self.all_submissions = submissions_list
+            self._window_page_sizes = [
+                len(submissions_list)
+            ]
+            self._set_page_cursor(1, next_cursor)
+            self._sync_window_flags()
+            self._update_submissions_watermark()
+            self._submissions_generation = generation
             self.is_loading_submissions = False
             yield
             if not submissions_list:
                 yield rx.toast.info(
-                    "No submissions found in the database."
+                    "No submissions match these filters."
+                    if self._submission_filters()
+                    else "No submissions found in the database."
                 )
             else:
-                yield rx.toast.success(
-                    f"Fetched {len(submissions_list)} submissions."
-                )
+                yield CylinderState.prefetch_next_submissions_page
         except Exception as e:
             self.all_submissions = []
             self.is_loading_submissions = False
@@ -444,8 +689,391 @@ class CylinderState(rx.State):
                 f"Error fetching submissions: {str(e)}"
             )
         finally:
-            if client:
-                client.close()
+            if repository:
+                repository.close()
+
+    @rx.event
+    def apply_submission_filters(self, form_data: dict):
+        filters = filters_from_params(form_data)
+        try:
+            build_handover_query(filters)
+        except ValueError:
+            return rx.toast.error(
+                "Dates must be in YYYY-MM-DD format."
+            )
+        self.filter_facility = filters.get("facility", "")
+        self.filter_date_from = filters.get("date_from", "")
+        self.filter_date_to = filters.get("date_to", "")
+        self.filter_submitted_by = filters.get(
+            "submitted_by", ""
+        )
+        self.filter_receiving_personnel = filters.get(
+            "receiving_personnel", ""
+        )
+        self.filter_cylinder_id = filters.get(
+            "cylinder_id", ""
+        )
+        return CylinderState.fetch_db_submissions
+
+    @rx.event
+    def clear_submission_filters(self):
+        self.filter_facility = ""
+        self.filter_date_from = ""
+        self.filter_date_to = ""
+        self.filter_submitted_by = ""
+        self.filter_receiving_personnel = ""
+        self.filter_cylinder_id = ""
+        return CylinderState.fetch_db_submissions
+
+    def _update_submissions_watermark(self):
+        if (
+            self.all_submissions
+            and self._window_first_page == 0
+            and self._newest_submission_cursor is not None
+        ):
+            self._submissions_watermark = (
+                self._newest_submission_cursor
+            )
+
+    async def _needs_full_submissions_reload(self) -> bool:
+        return (
+            self._submissions_watermark is None
+            or self._submissions_generation
+            != await history_generation()
+        )
+
+    async def _fetch_newer_submissions(
+        self,
+    ) -> list[HandoverEntry] | None:
+        repository = await self._get_repository()
+        if repository is None:
+            return None
+        try:
+            submission_docs = (
+                await repository.list_handovers_newer_than(
+                    self._submissions_watermark,
+                    SUBMISSIONS_PAGE_SIZE + 1,
+                    self._submission_filters(),
+                )
+            )
+        finally:
+            repository.close()
+        submission_docs.reverse()
+        if submission_docs:
+            self._newest_submission_cursor = (
+                submission_docs[0].get(
+                    "submission_timestamp"
+                ),
+                str(submission_docs[0]["_id"]),
+            )
+        return self._handover_entries_from_documents(
+            submission_docs
+        )
+
+    def _prepend_newer_submissions(
+        self, submissions_list: list[HandoverEntry]
+    ):
+        self.all_submissions = (
+            submissions_list + self.all_submissions
+        )
+        self._window_page_sizes[0] += len(submissions_list)
+        self._update_submissions_watermark()
+
+    @rx.event
+    async def sync_db_submissions(self):
+        if (
+            self._window_first_page != 0
+            or not self._window_page_sizes
+            or await self._needs_full_submissions_reload()
+        ):
+            yield CylinderState.fetch_db_submissions
+            return
+        try:
+            submissions_list = (
+                await self._fetch_newer_submissions()
+            )
+        except Exception as e:
+            yield rx.toast.error(
+                f"Error fetching submissions: {str(e)}"
+            )
+            return
+        if submissions_list is None:
+            yield rx.toast.error(
+                "Database connection not available for fetching. Please sign in again."
+            )
+            return
+        if len(submissions_list) > SUBMISSIONS_PAGE_SIZE:
+            yield CylinderState.fetch_db_submissions
+            return
+        if submissions_list:
+            self._prepend_newer_submissions(
+                submissions_list
+            )
+            yield rx.toast.info(
+                f"{len(submissions_list)} new submissions."
+            )
+
+    @rx.event
+    async def refresh_submissions(self):
+        if (
+            self.is_loading_submissions
+            or self._window_first_page != 0
+            or not self._window_page_sizes
+        ):
+            return
+        if await self._needs_full_submissions_reload():
+            yield CylinderState.fetch_db_submissions
+            return
+        try:
+            submissions_list = (
+                await self._fetch_newer_submissions()
+            )
+        except Exception:
+            return
+        if not submissions_list:
+            return
+        if len(submissions_list) > SUBMISSIONS_PAGE_SIZE:
+            yield CylinderState.fetch_db_submissions
+            return
+        self._prepend_newer_submissions(submissions_list)
+
+    @rx.event(background=True)
+    async def prefetch_next_submissions_page(self):
+        async with self:
+            page = self._window_first_page + len(
+                self._window_page_sizes
+            )
+            if (
+                page >= len(self._page_cursors)
+                or self._prefetched_page_number == page
+            ):
+                return
+            after = self._page_cursors[page]
+            filters = self._submission_filters()
+            credentials = await self._get_db_credentials()
+        if credentials is None:
+            return
+        try:
+            repository = await HandoverRepository.connect(
+                *credentials
+            )
+        except (
+            errors.ConnectionFailure,
+            errors.OperationFailure,
+        ):
+            return
+        try:
+            await repository.list_handovers_page(
+                after, SUBMISSIONS_PAGE_SIZE, filters
+            )
+        except Exception:
+            return
+        finally:
+            repository.close()
+        async with self:
+            if (
+                page < len(self._page_cursors)
+                and self._page_cursors[page] == after
+                and self._submission_filters() == filters
+            ):
+                self._prefetched_page_number = page
+
+    @rx.event
+    async def load_more_submissions(self):
+        if (
+            self.is_loading_more_submissions
+            or not self.has_more_submissions
+        ):
+            return
+        page = self._window_first_page + len(
+            self._window_page_sizes
+        )
+        after = self._page_cursors[page]
+        repository = await self._get_repository()
+        if repository is None:
+            yield rx.toast.error(
+                "Database connection not available for fetching. Please sign in again."
+            )
+            return
+        try:
+            # A page the prefetch warmed is served from the shared
+            # cache without the loading state; if it was evicted since,
+            # or warmed in another worker's local cache, fetch it.
+            cached = None
+            if self._prefetched_page_number == page:
+                cached = (
+                    await repository.cached_handovers_page(
+                        after,
+                        SUBMISSIONS_PAGE_SIZE,
+                        self._submission_filters(),
+                    )
+                )
+            if cached is None:
+                self.is_loading_more_submissions = True
+                yield
+                (
+                    submissions_list,
+                    next_cursor,
+                ) = await self._fetch_submissions_page(
+                    repository, after
+                )
+            else:
+                (
+                    submissions_list,
+                    next_cursor,
+                ) = self._submissions_page(after, *cached)
+        except Exception as e:
+            self.is_loading_more_submissions = False
+            yield rx.toast.error(
+                f"Error fetching submissions: {str(e)}"
+            )
+            return
+        finally:
+            repository.close()
+        self._clear_prefetched_page()
+        self.all_submissions = (
+            self.all_submissions + submissions_list
+        )
+        self._window_page_sizes.append(
+            len(submissions_list)
+        )
+        self._set_page_cursor(page + 1, next_cursor)
+        if (
+            len(self._window_page_sizes)
+            > MAX_RENDERED_SUBMISSION_PAGES
+        ):
+            dropped = self._window_page_sizes.pop(0)
+            self.all_submissions = self.all_submissions[
+                dropped:
+            ]
+            self.submissions_window_offset += dropped
+            self._window_first_page += 1
+            self._drop_hidden_submission_details()
+        self._sync_window_flags()
+        self.is_loading_more_submissions = False
+        yield CylinderState.prefetch_next_submissions_page
+
+    @rx.event
+    async def load_newer_submissions(self):
+        if (
+            self.is_loading_more_submissions
+            or self._window_first_page == 0
+        ):
+            return
+        page = self._window_first_page - 1
+        self.is_loading_more_submissions = True
+        yield
+        repository = await self._get_repository()
+        if repository is None:
+            self.is_loading_more_submissions = False
+            yield rx.toast.error(
+                "Database connection not available for fetching. Please sign in again."
+            )
+            return
+        try:
+            (
+                submissions_list,
+                _,
+            ) = await self._fetch_submissions_page(
+                repository, self._page_cursors[page]
+            )
+        except Exception as e:
+            self.is_loading_more_submissions = False
+            yield rx.toast.error(
+                f"Error fetching submissions: {str(e)}"
+            )
+            return
+        finally:
+            repository.close()
+        self.all_submissions = (
+            submissions_list + self.all_submissions
+        )
+        self._window_page_sizes.insert(
+            0, len(submissions_list)
+        )
+        self._window_first_page = page
+        self.submissions_window_offset -= len(
+            submissions_list
+        )
+        if (
+            len(self._window_page_sizes)
+            > MAX_RENDERED_SUBMISSION_PAGES
+        ):
+            dropped = self._window_page_sizes.pop()
+            if dropped:
+                self.all_submissions = self.all_submissions[
+                    :-dropped
+                ]
+            self._clear_prefetched_page()
+            self._drop_hidden_submission_details()
+        self._sync_window_flags()
+        self.is_loading_more_submissions = False
+
+    @rx.event
+    async def toggle_submission_details(
+        self, submission_id: str
+    ):
+        if submission_id in self.open_submission_details:
+            self.open_submission_details.pop(submission_id)
+            return
+        repository = await self._get_repository()
+        if repository is None:
+            yield rx.toast.error(
+                "Database connection not available for fetching. Please sign in again."
+            )
+            return
+        try:
+            detail_doc = (
+                await repository.get_handover_checks(
+                    submission_id
+                )
+            )
+        except Exception as e:
+            yield rx.toast.error(
+                f"Error loading cylinder checks: {str(e)}"
+            )
+            return
+        finally:
+            repository.close()
+        if detail_doc is None:
+            yield rx.toast.warning(
+                "Submission not found or already deleted."
+            )
+            return
+        self.open_submission_details[submission_id] = {
+            "cylinder_checks_2m": detail_doc.get(
+                "cylinder_checks_2m", []
+            ),
+            "cylinder_checks_4m": detail_doc.get(
+                "cylinder_checks_4m", []
+            ),
+            "cylinder_checks_7m": detail_doc.get(
+                "cylinder_checks_7m", []
+            ),
+        }
+
+    @rx.event
+    async def export_submissions(self, export_format: str):
+        credentials = await self._get_db_credentials()
+        if credentials is None:
+            yield rx.toast.error(
+                "Database connection not available for export. Please sign in again."
+            )
+            return
+        params = {
+            **self._submission_filters(),
+            "token": await run_db(
+                issue_grant, *credentials, "export"
+            ),
+            "format": export_format,
+        }
+        yield rx.call_script(
+            EXPORT_DOWNLOAD_SCRIPT
+            % {
+                "route": EXPORT_ROUTE,
+                "params": json.dumps(params),
+            }
+        )
 
     @rx.event
     def clear_form_and_reset_to_p1(self):
@@ -455,51 +1083,138 @@ class CylinderState(rx.State):
     @rx.event
     def prepare_delete_submission(self, submission_id: str):
         self.submission_to_delete_id = submission_id
+        self.is_bulk_delete = False
+        self.show_delete_confirm_dialog = True
+
+    @rx.event
+    def toggle_submission_selection(
+        self, submission_id: str
+    ):
+        if submission_id in self.selected_submission_ids:
+            self.selected_submission_ids.remove(
+                submission_id
+            )
+        else:
+            self.selected_submission_ids.append(
+                submission_id
+            )
+
+    @rx.event
+    def clear_submission_selection(self):
+        self.selected_submission_ids = []
+
+    @rx.event
+    def prepare_bulk_delete_submissions(self):
+        if not self.selected_submission_ids:
+            return rx.toast.error(
+                "No submission selected for deletion."
+            )
+        self.submission_to_delete_id = None
+        self.is_bulk_delete = True
         self.show_delete_confirm_dialog = True
 
     @rx.event
     def cancel_delete_submission(self):
         self.submission_to_delete_id = None
+        self.is_bulk_delete = False
         self.show_delete_confirm_dialog = False
 
+    def _remove_submissions_locally(
+        self, submission_ids: set[str]
+    ):
+        remaining: list[HandoverEntry] = []
+        page_sizes: list[int] = []
+        start = 0
+        for size in self._window_page_sizes:
+            page = [
+                entry
+                for entry in self.all_submissions[
+                    start : start + size
+                ]
+                if entry["_id"] not in submission_ids
+            ]
+            remaining.extend(page)
+            page_sizes.append(len(page))
+            start += size
+        self.all_submissions = remaining
+        self._window_page_sizes = page_sizes
+        self.selected_submission_ids = [
+            submission_id
+            for submission_id in self.selected_submission_ids
+            if submission_id not in submission_ids
+        ]
+        for submission_id in submission_ids:
+            self.open_submission_details.pop(
+                submission_id, None
+            )
+
     @rx.event
     async def confirm_delete_submission(self):
-        if self.submission_to_delete_id is None:
+        if self.is_bulk_delete:
+            submission_ids = list(
+                self.selected_submission_ids
+            )
+        elif self.submission_to_delete_id is not None:
+            submission_ids = [self.submission_to_delete_id]
+        else:
+            submission_ids = []
+        if not submission_ids:
             yield rx.toast.error(
                 "No submission selected for deletion."
             )
             self.show_delete_confirm_dialog = False
+            self.is_bulk_delete = False
             return
-        client = await self._get_db_client()
-        if client is None:
+        repository = await self._get_repository()
+        if repository is None:
             yield rx.toast.error(
                 "Database connection error. Cannot delete."
             )
             self.show_delete_confirm_dialog = False
             self.submission_to_delete_id = None
+            self.is_bulk_delete = False
             from app.states.auth_state import AuthState
 
             auth_s = await self.get_state(AuthState)
             if auth_s.is_authenticated:
-                yield auth_s.sign_out()
+                yield await auth_s.sign_out()
             return
+        generation = await history_generation()
         try:
-            db = client[self._DB_NAME]
-            collection = db[self._COLLECTION_NAME]
-            object_id_to_delete = ObjectId(
-                self.submission_to_delete_id
-            )
-            delete_result = collection.delete_one(
-                {"_id": object_id_to_delete}
+            if len(submission_ids) == 1:
+                deleted_count = (
+                    await repository.delete_handover(
+                        submission_ids[0]
+                    )
+                )
+            else:
+                deleted_count = (
+                    await repository.delete_handovers(
+                        submission_ids
+                    )
+                )
+            self._remove_submissions_locally(
+                set(submission_ids)
             )
-            if delete_result.deleted_count == 1:
+            if self._submissions_generation == generation:
+                self._submissions_generation = (
+                    await history_generation()
+                )
+            if deleted_count == 0:
+                yield rx.toast.warning(
+                    "Submission not found or already deleted."
+                )
+            elif len(submission_ids) == 1:
                 yield rx.toast.success(
                     "Submission deleted successfully."
                 )
-                yield CylinderState.fetch_db_submissions
+            elif deleted_count == len(submission_ids):
+                yield rx.toast.success(
+                    f"Deleted {deleted_count} submissions."
+                )
             else:
                 yield rx.toast.warning(
-                    "Submission not found or already deleted."
+                    f"Deleted {deleted_count} of {len(submission_ids)} submissions; the rest were already deleted."
                 )
         except errors.PyMongoError as e:
             yield rx.toast.error(
@@ -510,7 +1225,8 @@ class CylinderState(rx.State):
                 f"An unexpected error occurred during deletion: {str(e)}"
             )
         finally:
-            if client:
-                client.close()
+            if repository:
+                repository.close()
             self.show_delete_confirm_dialog = False
-            self.submission_to_delete_id = None
\ No newline at end of file
+            self.submission_to_delete_id = None
+            self.is_bulk_delete = False
\ No newline at end of file
@@ -0,0 +1,80 @@
+import reflex as rx
+from pymongo import errors
+from app.db.aggregations import (
+    DASHBOARD_PERIODS,
+    DistributionBucket,
+    FacilityPeriodTotal,
+)
+from app.db.filters import (
+    HandoverFilters,
+    filters_from_params,
+)
+from app.states.repository_mixin import RepositoryMixin
+from app.validation.handover import FACILITIES
+
+
+class DashboardState(RepositoryMixin, rx.State):
+    facilities: list[str] = list(FACILITIES)
+    periods: list[str] = list(DASHBOARD_PERIODS)
+    filter_facility: str = ""
+    filter_date_from: str = ""
+    filter_date_to: str = ""
+    period: str = "month"
+    totals: list[FacilityPeriodTotal] = []
+    purity_distribution: list[DistributionBucket] = []
+    pressure_distribution: list[DistributionBucket] = []
+    is_loading_dashboard: bool = False
+
+    def _dashboard_filters(self) -> HandoverFilters:
+        return filters_from_params(
+            {
+                "facility": self.filter_facility,
+                "date_from": self.filter_date_from,
+                "date_to": self.filter_date_to,
+            }
+        )
+
+    @rx.event
+    async def load_dashboard(self):
+        self.is_loading_dashboard = True
+        yield
+        repository = await self._get_repository()
+        if repository is None:
+            self.is_loading_dashboard = False
+            yield rx.toast.error(
+                "Database connection not available for the dashboard. Please sign in again."
+            )
+            return
+        try:
+            summary = await repository.dashboard_summary(
+                self._dashboard_filters(), self.period
+            )
+            self.totals = summary["totals"]
+            self.purity_distribution = summary["purity"]
+            self.pressure_distribution = summary["pressure"]
+        except ValueError:
+            yield rx.toast.error(
+                "Dates must be in YYYY-MM-DD format."
+            )
+        except errors.PyMongoError as e:
+            yield rx.toast.error(
+                f"Error loading dashboard: {str(e)}"
+            )
+        finally:
+            repository.close()
+            self.is_loading_dashboard = False
+
+    @rx.event
+    def apply_dashboard_filters(self, form_data: dict):
+        self.filter_facility = form_data.get("facility", "")
+        self.filter_date_from = form_data.get(
+            "date_from", ""
+        )
+        self.filter_date_to = form_data.get("date_to", "")
+        period = form_data.get("period", "month")
+        self.period = (
+            period
+            if period in DASHBOARD_PERIODS
+            else "month"
+        )
+        return DashboardState.load_dashboard
\ No newline at end of file
@@ -0,0 +1,89 @@
+import reflex as rx
+from app.api.grants import issue_grant
+from app.api.handover_import import IMPORT_ROUTE
+from app.db.repository import run_db
+from app.importers.handover_import import ImportFailure
+from app.states.repository_mixin import RepositoryMixin
+
+IMPORT_FILE_INPUT_ID = "handover-import-file"
+IMPORT_UPLOAD_SCRIPT = """
+(async () => {
+  const input = document.getElementById("%(input_id)s");
+  const file = input && input.files && input.files[0];
+  if (!file) {
+    return {error: "Choose a .csv or .jsonl file to import."};
+  }
+  const url = new URL("%(route)s", getBackendURL(env.UPLOAD));
+  url.searchParams.set("token", "%(token)s");
+  url.searchParams.set("filename", file.name);
+  try {
+    const response = await fetch(url, {method: "POST", body: file});
+    return await response.json();
+  } catch (e) {
+    return {error: `Upload failed: ${e.message}`};
+  }
+})()
+"""
+
+
+class ImportState(RepositoryMixin, rx.State):
+    is_importing: bool = False
+    has_import_report: bool = False
+    import_rows_read: int = 0
+    import_inserted: int = 0
+    import_failed: int = 0
+    import_failures: list[ImportFailure] = []
+
+    @rx.event
+    async def start_import(self):
+        credentials = await self._get_db_credentials()
+        if credentials is None:
+            yield rx.toast.error(
+                "Database connection error. Please sign in again."
+            )
+            return
+        username, password = credentials
+        self.is_importing = True
+        self.has_import_report = False
+        self.import_failures = []
+        token = None
+        try:
+            token = await run_db(
+                issue_grant, username, password, "import"
+            )
+        finally:
+            # finish_import clears the flag once the upload returns;
+            # without a grant there is no upload to wait for.
+            if token is None:
+                self.is_importing = False
+        yield rx.call_script(
+            IMPORT_UPLOAD_SCRIPT
+            % {
+                "input_id": IMPORT_FILE_INPUT_ID,
+                "route": IMPORT_ROUTE,
+                "token": token,
+            },
+            callback=ImportState.finish_import,
+        )
+
+    @rx.event
+    def finish_import(self, result: dict):
+        self.is_importing = False
+        if not isinstance(result, dict):
+            result = {"error": "Import failed."}
+        if "error" in result:
+            yield rx.toast.error(result["error"])
+            return
+        self.has_import_report = True
+        self.import_rows_read = result.get("rows_read", 0)
+        self.import_inserted = result.get("inserted", 0)
+        self.import_failed = result.get("failed", 0)
+        self.import_failures = result.get("failures", [])
+        if self.import_failed:
+            yield rx.toast.warning(
+                f"Imported {self.import_inserted} of {self.import_rows_read} row(s); {self.import_failed} failed."
+            )
+        else:
+            yield rx.toast.success(
+                f"Imported {self.import_inserted} handover(s)."
+            )
\ No newline at end of file
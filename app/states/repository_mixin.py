@@ -0,0 +1,36 @@
+import reflex as rx
+from pymongo import errors
+from app.db.repository import HandoverRepository
+from app.states.auth_state import AuthState
+
+
+class RepositoryMixin(rx.State, mixin=True):
+    """Opens a ``HandoverRepository`` as the signed-in user."""
+
+    async def _get_db_credentials(
+        self,
+    ) -> tuple[str, str] | None:
+        auth_s = await self.get_state(AuthState)
+        username = auth_s.authenticated_username
+        password = (
+            auth_s._authenticated_password_DO_NOT_EXPOSE
+        )
+        if not username or not password:
+            return None
+        return username, password
+
+    async def _get_repository(
+        self,
+    ) -> HandoverRepository | None:
+        credentials = await self._get_db_credentials()
+        if credentials is None:
+            return None
+        try:
+            return await HandoverRepository.connect(
+                *credentials
+            )
+        except (
+            errors.ConnectionFailure,
+            errors.OperationFailure,
+        ):
+            return None
\ No newline at end of file
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from typing import Any, Sequence, TypedDict
+
+SIZE_KEYS = ("2m", "4m", "7m")
+SIZE_LABELS = {"2m": "2m³", "4m": "4m³", "7m": "7m³"}
+
+
+@dataclass(frozen=True)
+class FieldRule:
+    field: str
+    label: str
+    required: bool = False
+    minimum: float | None = None
+    maximum: float | None = None
+
+
+_PURITY = FieldRule(
+    "purity", "Purity", required=True, minimum=0, maximum=99
+)
+_PRESSURE = FieldRule(
+    "pressure",
+    "Pressure",
+    required=True,
+    minimum=0,
+    maximum=2000,
+)
+
+CYLINDER_CHECK_RULES: dict[str, tuple[FieldRule, ...]] = {
+    "2m": (_PURITY, _PRESSURE),
+    "4m": (_PURITY, _PRESSURE),
+    "7m": (_PURITY, _PRESSURE),
+}
+
+
+class FieldError(TypedDict):
+    size_key: str
+    index: int
+    field: str
+    message: str
+
+
+def field_error_key(
+    size_key: str, index: int, field: str
+) -> str:
+    return f"{size_key}_{index}_{field}"
+
+
+def _format_bound(value: float) -> str:
+    return f"{value:g}"
+
+
+def validate_check_columns(
+    size_key: str,
+    columns: dict[str, Sequence[Any]],
+    cylinder_numbers: Sequence[int] | None = None,
+) -> list[tuple[int, str, str]]:
+    """Validate one size's checks column by column.
+
+    ``columns`` maps a field name to the values of that field for every
+    check in the batch. Returns ``(position, field, message)`` tuples for
+    the failing cells, so callers can map positions back to form rows or
+    import lines. ``cylinder_numbers`` overrides the 1-based cylinder
+    number used in messages when the batch spans several handovers.
+    """
+    size_label = SIZE_LABELS.get(size_key, size_key)
+
+    def number(position: int) -> int:
+        if cylinder_numbers is None:
+            return position + 1
+        return cylinder_numbers[position]
+
+    failures: list[tuple[int, str, str]] = []
+    for rule in CYLINDER_CHECK_RULES[size_key]:
+        column = columns.get(rule.field, ())
+        low = (
+            rule.minimum
+            if rule.minimum is not None
+            else float("-inf")
+        )
+        high = (
+            rule.maximum
+            if rule.maximum is not None
+            else float("inf")
+        )
+        missing = [
+            position
+            for position, value in enumerate(column)
+            if value is None
+        ]
+        not_numeric = [
+            position
+            for position, value in enumerate(column)
+            if value is not None
+            and (
+                isinstance(value, bool)
+                or not isinstance(value, (int, float))
+            )
+        ]
+        out_of_range = [
+            position
+            for position, value in enumerate(column)
+            if isinstance(value, (int, float))
+            and not isinstance(value, bool)
+            and not low <= value <= high
+        ]
+        if rule.required:
+            failures.extend(
+                (
+                    position,
+                    rule.field,
+                    f"{rule.label} is required for {size_label} cylinder {number(position)}.",
+                )
+                for position in missing
+            )
+        failures.extend(
+            (
+                position,
+                rule.field,
+                f"{rule.label} for {size_label} cylinder {number(position)} must be a number.",
+            )
+            for position in not_numeric
+        )
+        failures.extend(
+            (
+                position,
+                rule.field,
+                f"{rule.label} for {size_label} cylinder {number(position)} must be between {_format_bound(low)} and {_format_bound(high)}.",
+            )
+            for position in out_of_range
+        )
+    return failures
+
+
+def validate_cylinder_checks(
+    checks_by_size: dict[str, Sequence[dict[str, Any]]],
+) -> list[FieldError]:
+    field_order = {
+        size_key: {
+            rule.field: order
+            for order, rule in enumerate(rules)
+        }
+        for size_key, rules in CYLINDER_CHECK_RULES.items()
+    }
+    errors: list[FieldError] = []
+    for size_key in SIZE_KEYS:
+        checks = checks_by_size.get(size_key, ())
+        if not checks:
+            continue
+        columns = {
+            rule.field: [
+                check.get(rule.field) for check in checks
+            ]
+            for rule in CYLINDER_CHECK_RULES[size_key]
+        }
+        failures = validate_check_columns(size_key, columns)
+        failures.sort(
+            key=lambda failure: (
+                failure[0],
+                field_order[size_key][failure[1]],
+            )
+        )
+        errors.extend(
+            {
+                "size_key": size_key,
+                "index": position,
+                "field": field,
+                "message": message,
+            }
+            for position, field, message in failures
+        )
+    return errors
\ No newline at end of file
@@ -0,0 +1,29 @@
+from typing import Mapping
+
+FACILITIES = (
+    "Ajeromi General Hospital",
+    "Harvey Road General Hospital",
+    "Massey Children Hospital",
+    "God's Hope",
+)
+MAX_CHECKS_PER_SIZE = 5
+
+
+def expected_check_count(quantity: int) -> int:
+    return min(quantity, MAX_CHECKS_PER_SIZE)
+
+
+def validate_handover_header(
+    facility: str | None, quantities: Mapping[str, int]
+) -> str | None:
+    if not facility:
+        return "Facility is required."
+    if any(
+        quantity < 0 for quantity in quantities.values()
+    ):
+        return "Cylinder quantities cannot be negative."
+    if all(
+        quantity == 0 for quantity in quantities.values()
+    ):
+        return "At least one cylinder quantity must be greater than 0."
+    return None
\ No newline at end of file
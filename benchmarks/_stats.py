@@ -0,0 +1,23 @@
+"""Latency summaries shared by the benchmark scripts."""
+
+import statistics
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(
+        int(round(pct / 100 * (len(ordered) - 1))),
+        len(ordered) - 1,
+    )
+    return ordered[index]
+
+
+def report(label: str, samples: list[float]) -> None:
+    """Print mean, p50, p95 and max of ``samples`` (seconds) in ms."""
+    ms = [s * 1000 for s in samples]
+    print(
+        f"{label:<22} mean={statistics.mean(ms):8.2f}ms "
+        f"p50={percentile(ms, 50):8.2f}ms "
+        f"p95={percentile(ms, 95):8.2f}ms "
+        f"max={max(ms):8.2f}ms"
+    )
@@ -0,0 +1,155 @@
+"""Stored size of handover documents: row vs. column check encoding.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_check_encoding
+    python -m benchmarks.bench_check_encoding --handovers 10000 --max-qty 15
+
+Builds a synthetic collection in memory (no MongoDB needed) and reports
+BSON bytes per document and for the check arrays alone, plus the cost of
+encoding and decoding each layout.
+"""
+
+import argparse
+import datetime
+import random
+import statistics
+import time
+
+import bson
+from bson.objectid import ObjectId
+
+from app.db.check_encoding import (
+    CHECK_ARRAY_FIELDS,
+    COLUMN_ENCODING,
+    ROW_ENCODING,
+    decode_handover_checks,
+    encode_handover_checks,
+)
+from app.validation.cylinder_checks import SIZE_KEYS
+from app.validation.handover import FACILITIES
+
+
+def synthetic_handover(
+    rng: random.Random, max_qty: int
+) -> dict:
+    document = {
+        "_id": ObjectId(),
+        "facility": rng.choice(FACILITIES),
+        "bmt_in_charge": "Mr. technician",
+        "receiving_personnel": "Ward nurse",
+        "submitted_by": "technician",
+        "submission_timestamp": datetime.datetime(
+            2025, 1, 1
+        )
+        + datetime.timedelta(
+            minutes=rng.randrange(500_000)
+        ),
+    }
+    for size_key in SIZE_KEYS:
+        quantity = rng.randint(0, max_qty)
+        document[f"qty_{size_key}"] = quantity
+        document[f"cylinder_checks_{size_key}"] = [
+            {
+                "cylinder_id": f"CYL-{size_key}-{rng.randrange(100_000):06d}",
+                "purity": round(rng.uniform(90, 99), 1),
+                "pressure": rng.randrange(1000, 2000),
+            }
+            for _ in range(quantity)
+        ]
+    return document
+
+
+def _sizes(
+    documents: list[dict],
+) -> tuple[list[int], list[int]]:
+    document_sizes = []
+    check_sizes = []
+    for document in documents:
+        document_sizes.append(len(bson.encode(document)))
+        check_sizes.append(
+            len(
+                bson.encode(
+                    {
+                        field: document[field]
+                        for field in CHECK_ARRAY_FIELDS
+                    }
+                )
+            )
+        )
+    return document_sizes, check_sizes
+
+
+def _timed(fn, documents: list[dict]) -> float:
+    started = time.perf_counter()
+    for document in documents:
+        fn(document)
+    return (
+        (time.perf_counter() - started)
+        / len(documents)
+        * 1e6
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--handovers", type=int, default=5000
+    )
+    parser.add_argument("--max-qty", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    rows = [
+        synthetic_handover(rng, args.max_qty)
+        for _ in range(args.handovers)
+    ]
+    columns = [
+        encode_handover_checks(document, COLUMN_ENCODING)
+        for document in rows
+    ]
+    checks = sum(
+        len(document[field])
+        for document in rows
+        for field in CHECK_ARRAY_FIELDS
+    )
+    print(
+        f"{args.handovers} handovers, {checks} checks "
+        f"({checks / args.handovers:.1f} per handover)"
+    )
+    results = {}
+    for label, documents in (
+        (ROW_ENCODING, rows),
+        (COLUMN_ENCODING, columns),
+    ):
+        document_sizes, check_sizes = _sizes(documents)
+        results[label] = sum(document_sizes)
+        print(
+            f"{label:<8} total={sum(document_sizes) / 1024:10.1f}KiB "
+            f"mean doc={statistics.mean(document_sizes):8.1f}B "
+            f"checks={sum(check_sizes) / 1024:10.1f}KiB "
+            f"per check={sum(check_sizes) / max(checks, 1):6.1f}B"
+        )
+    print(
+        f"reduction: {1 - results[COLUMN_ENCODING] / results[ROW_ENCODING]:.1%} "
+        "of stored document bytes"
+    )
+    encode_us = _timed(
+        lambda document: encode_handover_checks(
+            document, COLUMN_ENCODING
+        ),
+        rows,
+    )
+    decode_us = _timed(
+        lambda document: decode_handover_checks(
+            dict(document)
+        ),
+        columns,
+    )
+    print(
+        f"encode {encode_us:.1f}us/doc, decode {decode_us:.1f}us/doc"
+    )
+
+
+if __name__ == "__main__":
+    main()
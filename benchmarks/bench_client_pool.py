@@ -0,0 +1,118 @@
+"""Per-event latency: connect-per-event vs. the pooled MongoClient registry.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_client_pool
+    python -m benchmarks.bench_client_pool --uri-user USER --uri-password PASS
+
+Without credentials a simulated client is used whose constructor and
+first ping cost ``--connect-ms`` (SRV lookup + TLS + auth) and whose
+warm round-trips cost ``--rtt-ms``.
+"""
+
+import argparse
+import statistics
+import time
+
+from app.db.client_pool import (
+    MONGO_URI_TEMPLATE,
+    MongoClientPool,
+    _default_client_factory,
+)
+from benchmarks._stats import report
+
+
+class _SimulatedAdmin:
+    def __init__(self, client: "SimulatedClient"):
+        self._client = client
+
+    def command(self, name: str):
+        self._client.round_trip()
+        return {"ok": 1}
+
+
+class SimulatedClient:
+    def __init__(self, connect_ms: float, rtt_ms: float):
+        self._connect_s = connect_ms / 1000
+        self._rtt_s = rtt_ms / 1000
+        self._connected = False
+        self.admin = _SimulatedAdmin(self)
+
+    def round_trip(self) -> None:
+        if not self._connected:
+            time.sleep(self._connect_s)
+            self._connected = True
+        time.sleep(self._rtt_s)
+
+    def close(self) -> None:
+        self._connected = False
+
+
+def run(
+    events: int,
+    factory,
+    username: str,
+    password: str,
+) -> None:
+    uri = MONGO_URI_TEMPLATE.format(
+        db_username=username, db_password=password
+    )
+
+    before: list[float] = []
+    for _ in range(events):
+        start = time.perf_counter()
+        client = factory(uri)
+        client.admin.command("ping")
+        client.admin.command("ping")
+        client.close()
+        before.append(time.perf_counter() - start)
+
+    pool = MongoClientPool(client_factory=factory)
+    after: list[float] = []
+    for _ in range(events):
+        start = time.perf_counter()
+        client = pool.acquire(username, password)
+        client.admin.command("ping")
+        pool.release(client)
+        after.append(time.perf_counter() - start)
+    pool.close_all()
+
+    report("connect per event", before)
+    report("pooled client", after)
+    print(
+        f"speedup (mean): "
+        f"{statistics.mean(before) / statistics.mean(after):.1f}x  "
+        f"pool stats: {pool.stats}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=50)
+    parser.add_argument(
+        "--connect-ms", type=float, default=120
+    )
+    parser.add_argument("--rtt-ms", type=float, default=8)
+    parser.add_argument("--uri-user")
+    parser.add_argument("--uri-password")
+    args = parser.parse_args()
+    if args.uri_user and args.uri_password:
+        run(
+            args.events,
+            _default_client_factory,
+            args.uri_user,
+            args.uri_password,
+        )
+        return
+    run(
+        args.events,
+        lambda uri: SimulatedClient(
+            args.connect_ms, args.rtt_ms
+        ),
+        "bench",
+        "bench",
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""Time and allocations of the per-event CylinderState code paths.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_state_hot_paths
+    python -m benchmarks.bench_state_hot_paths --sizes 5 500 --output current.json
+    python -m benchmarks.bench_state_hot_paths --compare baseline.json
+
+Each path runs at every size: the number of checks for the check-list
+paths and validation, and the number of handover documents for the
+document-to-HandoverEntry mapping used by ``fetch_db_submissions``. The
+defaults are 5 (a typical handover), 500 (a large one) and 50,000 (a
+stress case). Timings are the median of ``--repeat`` runs. Allocations
+come from one extra run under tracemalloc: the peak traced memory and
+the number of allocated blocks still live when the call returns.
+
+``--compare`` exits non-zero if any median time or peak allocation is
+worse than the baseline JSON by more than ``--tolerance``, so a
+regression can fail a pre-deployment check.
+"""
+
+import argparse
+import datetime
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from bson.objectid import ObjectId
+
+from app.validation.cylinder_checks import SIZE_KEYS
+from app.validation.handover import FACILITIES
+from benchmarks._stats import percentile
+
+DEFAULT_SIZES = (5, 500, 50_000)
+# Calls are looped until a timed sample lasts about this long, so fast
+# paths are not dominated by timer resolution.
+TARGET_SAMPLE_SECONDS = 0.02
+
+
+def synthetic_checks(
+    rng: random.Random,
+    count: int,
+    invalid_rate: float = 0.0,
+) -> list[dict[str, Any]]:
+    checks = []
+    for _ in range(count):
+        check = {
+            "cylinder_id": f"CYL-{rng.randrange(100_000):06d}",
+            "purity": round(rng.uniform(90, 99), 1),
+            "pressure": rng.randrange(1000, 2000),
+        }
+        if rng.random() < invalid_rate:
+            check[rng.choice(("purity", "pressure"))] = -1
+        checks.append(check)
+    return checks
+
+
+def synthetic_documents(
+    rng: random.Random, count: int
+) -> list[dict[str, Any]]:
+    started = datetime.datetime(2025, 1, 1)
+    return [
+        {
+            "_id": ObjectId(),
+            "facility": rng.choice(FACILITIES),
+            "bmt_in_charge": "Mr. technician",
+            "receiving_personnel": rng.choice(
+                ("Ward nurse", None)
+            ),
+            "qty_2m": rng.randint(0, 5),
+            "qty_4m": rng.randint(0, 5),
+            "qty_7m": rng.randint(0, 5),
+            "submitted_by": "technician",
+            "submission_timestamp": started
+            + datetime.timedelta(
+                minutes=rng.randrange(500_000)
+            ),
+        }
+        for _ in range(count)
+    ]
+
+
+def _cylinder_state() -> Any:
+    from reflex.state import State
+
+    from app.states.cylinder_state import CylinderState
+
+    root = State(_reflex_internal_init=True)
+    return root.get_substate(
+        CylinderState.get_full_name().split(".")[1:]
+    )
+
+
+def _drain(updates: Any) -> None:
+    for _ in updates or ():
+        pass
+
+
+def hot_paths(
+    size: int, rng: random.Random
+) -> dict[str, Callable[[], Any]]:
+    """Zero-argument callables for each path, set up for ``size``."""
+    from app.states.cylinder_state import CylinderState
+    from app.validation.cylinder_checks import (
+        validate_cylinder_checks,
+    )
+
+    state = _cylinder_state()
+    checks = synthetic_checks(rng, size)
+    state.cylinder_checks_2m = checks
+    proxied_checks = state.cylinder_checks_2m
+    per_size = -(-size // len(SIZE_KEYS))
+    checks_by_size = {
+        size_key: synthetic_checks(
+            rng, per_size, invalid_rate=0.05
+        )
+        for size_key in SIZE_KEYS
+    }
+    documents = synthetic_documents(rng, size)
+    fields = [
+        ("cylinder_id", "CYL-000001"),
+        ("purity", "95.5"),
+        ("pressure", "1500"),
+    ]
+    field_cycle = iter(range(sys.maxsize))
+
+    def update_field() -> None:
+        field_name, value = fields[
+            next(field_cycle) % len(fields)
+        ]
+        _drain(
+            CylinderState.update_cylinder_check_field.fn(
+                state, "2m", size - 1, field_name, value
+            )
+        )
+
+    return {
+        "plain_python_checks_list": lambda: (
+            state._plain_python_checks_list(proxied_checks)
+        ),
+        "adjust_checks_list_grow": lambda: (
+            state._adjust_cylinder_checks_list(
+                proxied_checks[: size // 2], size
+            )
+        ),
+        "adjust_checks_list_shrink": lambda: (
+            state._adjust_cylinder_checks_list(
+                proxied_checks, size // 2
+            )
+        ),
+        "update_cylinder_check_field": update_field,
+        "validate_cylinder_checks": lambda: (
+            validate_cylinder_checks(checks_by_size)
+        ),
+        "handover_entries_from_documents": lambda: (
+            state._handover_entries_from_documents(
+                documents
+            )
+        ),
+    }
+
+
+# update_cylinder_check_field touches one check however long the list
+# is; the others walk all of them.
+_PER_CALL_PATHS = frozenset(
+    ("update_cylinder_check_field",)
+)
+
+
+def measure(
+    fn: Callable[[], Any], items: int, repeat: int
+) -> dict[str, float]:
+    started = time.perf_counter()
+    fn()
+    loops = max(
+        1,
+        int(
+            TARGET_SAMPLE_SECONDS
+            / (time.perf_counter() - started)
+        ),
+    )
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append(
+            (time.perf_counter() - started) / loops
+        )
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    del result
+    live_blocks = sum(
+        stat.count_diff
+        for stat in after.compare_to(before, "filename")
+        if stat.count_diff > 0
+    )
+    median = statistics.median(samples)
+    return {
+        "median_us": round(median * 1e6, 3),
+        "p95_us": round(percentile(samples, 95) * 1e6, 3),
+        "per_item_ns": round(median / items * 1e9, 3),
+        "peak_kib": round(peak / 1024, 3),
+        "live_blocks": live_blocks,
+    }
+
+
+def run(sizes: list[int], repeat: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for size in sizes:
+        for name, fn in hot_paths(size, rng).items():
+            items = 1 if name in _PER_CALL_PATHS else size
+            results.setdefault(name, {})[str(size)] = (
+                measure(fn, items, repeat)
+            )
+    return results
+
+
+def compare(
+    results: dict, baseline: dict, tolerance: float
+) -> list[str]:
+    regressions = []
+    for name, by_size in results.items():
+        for size, current in by_size.items():
+            previous = baseline.get(name, {}).get(size)
+            if previous is None:
+                continue
+            for metric in ("median_us", "peak_kib"):
+                if previous[metric] and current[
+                    metric
+                ] > previous[metric] * (1 + tolerance):
+                    regressions.append(
+                        f"{name}[{size}] {metric}: "
+                        f"{previous[metric]} -> {current[metric]}"
+                    )
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=list(DEFAULT_SIZES),
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--output", help="Write the results as JSON."
+    )
+    parser.add_argument(
+        "--compare", help="Baseline JSON from --output."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown or growth against --compare.",
+    )
+    args = parser.parse_args()
+    results = run(args.sizes, args.repeat, args.seed)
+    for name, by_size in results.items():
+        for size, metrics in by_size.items():
+            print(
+                f"{name:<34} n={size:<6} "
+                f"median={metrics['median_us']:12.2f}us "
+                f"per item={metrics['per_item_ns']:10.1f}ns "
+                f"peak={metrics['peak_kib']:10.1f}KiB "
+                f"live blocks={metrics['live_blocks']}"
+            )
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(
+            results, baseline, args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
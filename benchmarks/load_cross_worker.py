@@ -0,0 +1,285 @@
+"""Cross-worker session load test for the shared Redis state manager.
+
+Run from the repository root against a local Redis:
+
+    python -m benchmarks.load_cross_worker --redis-url redis://localhost:6379/0
+    python -m benchmarks.load_cross_worker --fake-redis
+
+Two worker processes share nothing but the Redis URL, like two backends
+behind a load balancer without session affinity. Worker A signs each
+simulated user in and submits page 1 of a handover; worker B then loads
+the same sessions, checks the form progress survived, and submits page
+2. Submissions land in worker B's local journal, so no MongoDB is needed.
+``--fake-redis`` serves an in-process fakeredis over TCP instead (needs
+``pip install fakeredis``).
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from app.validation.handover import FACILITIES
+from benchmarks._stats import report
+
+FACILITY = FACILITIES[0]
+
+
+def _init_worker(redis_url: str, journal_path: str) -> None:
+    os.environ["REDIS_URL"] = redis_url
+    os.environ["HANDOVER_JOURNAL_PATH"] = journal_path
+    os.environ.setdefault(
+        "REFLEX_IGNORE_REDIS_CONFIG_ERROR", "true"
+    )
+
+
+async def _drain(updates) -> None:
+    if hasattr(updates, "__aiter__"):
+        async for _ in updates:
+            pass
+    elif updates is not None:
+        for _ in updates:
+            pass
+
+
+def _attach_session(root, token: str) -> None:
+    """What Reflex does with each event's router data, so sibling
+    states are loaded for this session rather than a blank one."""
+    from reflex.constants import RouteVar
+    from reflex.istate.data import RouterData
+
+    router_data = {RouteVar.CLIENT_TOKEN: token}
+    root.router_data = router_data
+    root.router = RouterData(router_data)
+
+
+async def _start_handover(
+    manager, token: str, quantity: int
+) -> str | None:
+    from reflex.state import _substate_key
+
+    from app.states.auth_state import AuthState
+    from app.states.cylinder_state import CylinderState
+
+    async with manager.modify_state(
+        _substate_key(token, CylinderState)
+    ) as root:
+        _attach_session(root, token)
+        auth = await root.get_state(AuthState)
+        auth.is_authenticated = True
+        auth.authenticated_username = f"user-{token[:8]}"
+        auth._authenticated_password_DO_NOT_EXPOSE = (
+            "secret"
+        )
+        cylinder = await root.get_state(CylinderState)
+        cylinder.selected_facility = FACILITY
+        await _drain(
+            CylinderState.handle_page_1_submit.fn(
+                cylinder,
+                {
+                    "receiving_personnel": "Ward B",
+                    "qty_2m": str(quantity),
+                    "qty_4m": "0",
+                    "qty_7m": "0",
+                },
+            )
+        )
+        if cylinder.current_form_page != 2:
+            return "page 1 was not accepted"
+    return None
+
+
+async def _finish_handover(
+    manager, token: str, quantity: int
+) -> str | None:
+    from reflex.state import _substate_key
+
+    from app.db.journal import handover_journal
+    from app.states.cylinder_state import CylinderState
+
+    async with manager.modify_state(
+        _substate_key(token, CylinderState)
+    ) as root:
+        _attach_session(root, token)
+        cylinder = await root.get_state(CylinderState)
+        if (
+            cylinder.current_form_page != 2
+            or cylinder.selected_facility != FACILITY
+            or cylinder.qty_2m != quantity
+            or len(cylinder.cylinder_checks_2m) != quantity
+        ):
+            return "form progress was not shared"
+        cylinder._page_2_intent = "submit"
+        form = {}
+        for index in range(quantity):
+            form[f"2m_{index}_cylinder_id"] = f"C{index}"
+            form[f"2m_{index}_purity"] = "96.5"
+            form[f"2m_{index}_pressure"] = "1500"
+        await _drain(
+            CylinderState.handle_page_2_submit.fn(
+                cylinder, form
+            )
+        )
+        if cylinder.qty_2m != 0 or not (
+            cylinder._unsynced_handover_ids
+        ):
+            return "page 2 was not submitted"
+        handover_ids = list(cylinder._unsynced_handover_ids)
+    if not handover_journal.get(handover_ids):
+        return "submission was not journaled"
+    return None
+
+
+async def _run_phase(
+    phase: str, tokens: list[str], concurrency: int
+) -> tuple[list[float], list[str]]:
+    from reflex.utils import prerequisites
+
+    app = prerequisites.get_and_validate_app().app
+    app._enable_state()
+    manager = app.state_manager
+    step = (
+        _start_handover
+        if phase == "start"
+        else _finish_handover
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    failures: list[str] = []
+
+    async def one(position: int, token: str) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                error = await step(
+                    manager, token, position % 5 + 1
+                )
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            latencies.append(time.perf_counter() - started)
+            if error:
+                failures.append(f"{token}: {error}")
+
+    await asyncio.gather(
+        *(
+            one(position, token)
+            for position, token in enumerate(tokens)
+        )
+    )
+    await manager.close()
+    return latencies, failures
+
+
+def _phase(
+    phase: str, tokens: list[str], concurrency: int
+) -> tuple[int, list[float], list[str]]:
+    latencies, failures = asyncio.run(
+        _run_phase(phase, tokens, concurrency)
+    )
+    return os.getpid(), latencies, failures
+
+
+def _serve_fake_redis() -> str:
+    from fakeredis import TcpFakeServer
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = TcpFakeServer(
+        ("127.0.0.1", port), server_type="redis"
+    )
+    threading.Thread(
+        target=server.serve_forever, daemon=True
+    ).start()
+    return f"redis://127.0.0.1:{port}/0"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--redis-url",
+        default=os.environ.get(
+            "REDIS_URL", "redis://localhost:6379/0"
+        ),
+    )
+    parser.add_argument("--fake-redis", action="store_true")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument(
+        "--concurrency", type=int, default=20
+    )
+    args = parser.parse_args()
+    redis_url = (
+        _serve_fake_redis()
+        if args.fake_redis
+        else args.redis_url
+    )
+    tokens = [str(uuid.uuid4()) for _ in range(args.users)]
+    context = get_context("spawn")
+    with tempfile.TemporaryDirectory() as journal_dir:
+        workers = [
+            ProcessPoolExecutor(
+                max_workers=1,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(
+                    redis_url,
+                    os.path.join(
+                        journal_dir, f"worker-{name}.db"
+                    ),
+                ),
+            )
+            for name in ("a", "b")
+        ]
+        try:
+            pid_a, started, start_failures = (
+                workers[0]
+                .submit(
+                    _phase,
+                    "start",
+                    tokens,
+                    args.concurrency,
+                )
+                .result()
+            )
+            pid_b, finished, finish_failures = (
+                workers[1]
+                .submit(
+                    _phase,
+                    "finish",
+                    tokens,
+                    args.concurrency,
+                )
+                .result()
+            )
+        finally:
+            for worker in workers:
+                worker.shutdown()
+    print(
+        f"{args.users} users, page 1 on worker pid {pid_a}, "
+        f"page 2 on worker pid {pid_b}"
+    )
+    report("page 1 (worker A)", started)
+    report("page 2 (worker B)", finished)
+    failures = start_failures + finish_failures
+    for failure in failures[:10]:
+        print(f"FAILED {failure}")
+    failed_tokens = {
+        failure.split(":", 1)[0] for failure in failures
+    }
+    print(
+        f"completed across workers: "
+        f"{args.users - len(failed_tokens)}/{args.users}"
+    )
+    if failures or pid_a == pid_b:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
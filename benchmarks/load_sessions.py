@@ -0,0 +1,630 @@
+"""Concurrent technician sessions driven through the Reflex event pipeline.
+
+Run from the repository root:
+
+    python -m benchmarks.load_sessions --in-process --sessions 50
+    python -m benchmarks.load_sessions --mongo-uri mongodb://localhost:27017 \\
+        --sessions 200 --output results.json
+
+Each simulated session is one browser tab. It connects, signs in, picks a
+facility, submits page 1, submits page 2 with a value for every check
+row the form shows (``handle_page_2_submit``, as the browser posts the
+form) and opens the submissions page. Events go through ``reflex.app.process`` with the
+app's own state manager and middleware. Follow-up events are handled the
+way the frontend would: redirects become page navigations, chained
+events are sent back, and background events run as tasks. Nothing
+listens on a port, so the whole run is offline.
+
+``--in-process`` serves MongoDB from mongomock (``pip install
+mongomock``). ``--mongo-uri`` sends every sign-in to a local mongod
+instead of the Atlas cluster. Latency is measured per event, from
+dispatch until its last update. Background events are also timed until
+their task finishes. ``--output`` writes the results as JSON, including
+the git revision, so runs of different builds can be compared.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+from app.validation.cylinder_checks import SIZE_KEYS
+from app.validation.handover import (
+    FACILITIES,
+    expected_check_count,
+)
+from benchmarks._stats import percentile
+
+CLIENT_IP = "127.0.0.1"
+
+
+@dataclass
+class EventStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self) -> dict[str, float]:
+        ms = [s * 1000 for s in self.latencies]
+        return {
+            "count": len(ms),
+            "errors": self.errors,
+            "mean_ms": round(statistics.mean(ms), 3),
+            "p50_ms": round(percentile(ms, 50), 3),
+            "p95_ms": round(percentile(ms, 95), 3),
+            "p99_ms": round(percentile(ms, 99), 3),
+            "max_ms": round(max(ms), 3),
+        }
+
+
+class LoadRecorder:
+    def __init__(self) -> None:
+        self.events: dict[str, EventStats] = defaultdict(
+            EventStats
+        )
+        self.background: dict[str, EventStats] = (
+            defaultdict(EventStats)
+        )
+        self.pushed_updates = 0
+        self.background_tasks: dict[
+            str, set[asyncio.Task]
+        ] = defaultdict(set)
+
+    def record(
+        self,
+        name: str,
+        seconds: float,
+        failed: bool,
+        background: bool = False,
+    ) -> None:
+        stats = (
+            self.background if background else self.events
+        )[name]
+        stats.latencies.append(seconds)
+        stats.errors += failed
+
+    @property
+    def events_processed(self) -> int:
+        return sum(
+            len(stats.latencies)
+            for stats in self.events.values()
+        )
+
+
+class _RecordingNamespace:
+    """Stands in for the Socket.IO namespace: updates that background
+    tasks would push to the browser are counted instead."""
+
+    def __init__(self, recorder: LoadRecorder):
+        self._recorder = recorder
+
+    async def emit_update(
+        self, update: Any, sid: str
+    ) -> None:
+        self._recorder.pushed_updates += 1
+
+    async def emit(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+def _handler_name(event_name: str) -> str:
+    return event_name.rsplit(".", 1)[-1]
+
+
+def _is_error_toast(event: Any) -> bool:
+    return event.name == "_call_function" and (
+        '["error"]' in str(event.payload.get("function"))
+    )
+
+
+def _trace_background_events(
+    app: Any, recorder: LoadRecorder
+) -> None:
+    process_background = app._process_background
+
+    def traced(state: Any, event: Any) -> Any:
+        task = process_background(state, event)
+        if task is not None:
+            started = time.perf_counter()
+            name = _handler_name(event.name)
+
+            def done(task: asyncio.Task) -> None:
+                recorder.record(
+                    name,
+                    time.perf_counter() - started,
+                    task.cancelled()
+                    or task.exception() is not None,
+                    background=True,
+                )
+
+            tasks = recorder.background_tasks[event.token]
+            tasks.add(task)
+            task.add_done_callback(done)
+            task.add_done_callback(tasks.discard)
+        return task
+
+    app._process_background = traced
+
+
+class SimulatedSession:
+    def __init__(
+        self,
+        app: Any,
+        recorder: LoadRecorder,
+        index: int,
+        args: argparse.Namespace,
+    ):
+        self.app = app
+        self.recorder = recorder
+        self.args = args
+        self.token = str(uuid.uuid4())
+        self.sid = f"load-{index}"
+        self.username = f"tech-{index % args.users:04d}"
+        self.path = "/sign-in"
+        self.failed_events: list[str] = []
+        self.rng = random.Random(args.seed + index)
+
+    def _router_data(self) -> dict[str, Any]:
+        return {
+            "pathname": self.path,
+            "asPath": self.path,
+            "query": {},
+        }
+
+    async def dispatch(
+        self, event_name: str, payload: dict | None = None
+    ) -> None:
+        from reflex.app import process
+        from reflex.event import Event
+
+        queue = [(event_name, payload or {})]
+        while queue:
+            name, event_payload = queue.pop(0)
+            follow_ups: list[tuple[str, dict]] = []
+            redirect: str | None = None
+            failed = False
+            started = time.perf_counter()
+            try:
+                async for update in process(
+                    self.app,
+                    Event(
+                        token=self.token,
+                        name=name,
+                        payload=event_payload,
+                        router_data=self._router_data(),
+                    ),
+                    self.sid,
+                    {},
+                    CLIENT_IP,
+                ):
+                    for event in update.events:
+                        if "." in event.name:
+                            follow_ups.append(
+                                (event.name, event.payload)
+                            )
+                        elif event.name == "_redirect":
+                            redirect = event.payload["path"]
+                        elif _is_error_toast(event):
+                            failed = True
+            except Exception:
+                failed = True
+            self.recorder.record(
+                _handler_name(name),
+                time.perf_counter() - started,
+                failed,
+            )
+            if failed:
+                self.failed_events.append(
+                    _handler_name(name)
+                )
+            queue.extend(follow_ups)
+            if redirect is not None:
+                self.path = redirect
+                queue.append((_on_load_event_name(), {}))
+
+    async def wait_for_background_events(self) -> None:
+        tasks = self.recorder.background_tasks[self.token]
+        if tasks:
+            await asyncio.wait(
+                list(tasks), timeout=self.args.drain_timeout
+            )
+
+    async def navigate(self, path: str) -> None:
+        self.path = path
+        await self.dispatch(_on_load_event_name())
+
+    async def think(self) -> None:
+        if self.args.think_ms:
+            await asyncio.sleep(
+                self.rng.uniform(0, self.args.think_ms)
+                / 1000
+            )
+
+    def _quantities(self) -> dict[str, int]:
+        quantities = {
+            size_key: self.rng.randint(0, self.args.max_qty)
+            for size_key in SIZE_KEYS
+        }
+        if not any(quantities.values()):
+            quantities[SIZE_KEYS[0]] = 1
+        return quantities
+
+    async def submit_handover(self) -> None:
+        from app.states.cylinder_state import CylinderState
+
+        cylinder_state = CylinderState.get_full_name()
+        await self.dispatch(
+            f"{cylinder_state}.set_selected_facility",
+            {"value": self.rng.choice(FACILITIES)},
+        )
+        quantities = self._quantities()
+        await self.think()
+        await self.dispatch(
+            f"{cylinder_state}.handle_page_1_submit",
+            {
+                "form_data": {
+                    "receiving_personnel": "Ward nurse",
+                    **{
+                        f"qty_{size_key}": str(quantity)
+                        for size_key, quantity in quantities.items()
+                    },
+                }
+            },
+        )
+        form_data = {}
+        for size_key, quantity in quantities.items():
+            for index in range(
+                expected_check_count(quantity)
+            ):
+                prefix = f"{size_key}_{index}_"
+                form_data[prefix + "cylinder_id"] = (
+                    f"CYL-{size_key}-{self.rng.randrange(100_000):06d}"
+                )
+                form_data[prefix + "purity"] = (
+                    f"{self.rng.uniform(90, 99):.1f}"
+                )
+                form_data[prefix + "pressure"] = str(
+                    self.rng.randrange(1000, 2000)
+                )
+        await self.think()
+        await self.dispatch(
+            f"{cylinder_state}.handle_page_2_submit",
+            {"form_data": form_data},
+        )
+
+    async def run(self) -> None:
+        from reflex import constants
+        from reflex.state import State
+
+        from app.states.auth_state import AuthState
+
+        await self.dispatch(
+            f"{State.get_full_name()}.{constants.CompileVars.HYDRATE}"
+        )
+        await self.dispatch(_on_load_event_name())
+        await self.think()
+        await self.dispatch(
+            f"{AuthState.get_full_name()}.sign_in",
+            {
+                "form_data": {
+                    "username": self.username,
+                    "password": self.args.password,
+                }
+            },
+        )
+        for _ in range(self.args.handovers_per_session):
+            await self.submit_handover()
+        # The technician opens the list once the sync toast is shown.
+        await self.wait_for_background_events()
+        await self.think()
+        await self.navigate("/submissions")
+
+
+def _on_load_event_name() -> str:
+    from reflex.state import OnLoadInternalState
+
+    return f"{OnLoadInternalState.get_full_name()}.on_load_internal"
+
+
+def _bulk_write(
+    self: Any,
+    requests: list[Any],
+    ordered: bool = True,
+    **kwargs: Any,
+) -> SimpleNamespace:
+    from pymongo import DeleteOne, InsertOne, UpdateOne
+
+    modified = 0
+    for request in requests:
+        if isinstance(request, InsertOne):
+            self.insert_one(request._doc)
+        elif isinstance(request, UpdateOne):
+            modified += self.update_one(
+                request._filter,
+                request._doc,
+                upsert=request._upsert,
+            ).modified_count
+        elif isinstance(request, DeleteOne):
+            self.delete_one(request._filter)
+        else:
+            raise TypeError(
+                f"Unsupported bulk operation {request!r}"
+            )
+    return SimpleNamespace(modified_count=modified)
+
+
+def _use_in_process_mongo() -> None:
+    """Serve every pooled client from one mongomock instance.
+
+    mongomock cannot build the operation objects of recent pymongo
+    releases for ``bulk_write``, and it has no time-series collections,
+    so both are applied as plain per-document writes here.
+    """
+    try:
+        import mongomock
+    except ImportError:
+        sys.exit(
+            "--in-process needs mongomock: pip install mongomock"
+        )
+    from app.db import indexes
+    from app.db.client_pool import client_pool
+
+    create_collection = mongomock.Database.create_collection
+
+    def _create_collection(
+        self: Any, name: str, **kwargs: Any
+    ) -> Any:
+        kwargs.pop("timeseries", None)
+        return create_collection(self, name, **kwargs)
+
+    mongomock.Collection.bulk_write = _bulk_write
+    mongomock.Database.create_collection = (
+        _create_collection
+    )
+    client = mongomock.MongoClient()
+    client_pool._client_factory = lambda uri: client
+    # mongomock has no $indexStats; building indexes is a one-off per
+    # worker rather than per-session load, so it is skipped here.
+    indexes._provisioned = True
+
+
+def _use_local_mongod(mongo_uri: str) -> None:
+    from pymongo import MongoClient
+
+    from app.db.client_pool import client_pool
+
+    client_pool._client_factory = lambda uri: MongoClient(
+        mongo_uri, serverSelectionTimeoutMS=5000
+    )
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_load(
+    args: argparse.Namespace,
+) -> dict[str, Any]:
+    from reflex.utils import prerequisites
+
+    app = prerequisites.get_and_validate_app().app
+    app._enable_state()
+    state_manager = type(app.state_manager).__name__
+    recorder = LoadRecorder()
+    app._event_namespace = _RecordingNamespace(recorder)
+    _trace_background_events(app, recorder)
+    sessions = [
+        SimulatedSession(app, recorder, index, args)
+        for index in range(args.sessions)
+    ]
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(session.run() for session in sessions),
+        return_exceptions=True,
+    )
+    foreground_seconds = time.perf_counter() - started
+    pending = list(app._background_tasks)
+    if pending:
+        await asyncio.wait(
+            pending, timeout=args.drain_timeout
+        )
+    wall_seconds = time.perf_counter() - started
+    if hasattr(app.state_manager, "close"):
+        await app.state_manager.close()
+    completed = sum(
+        1
+        for session, outcome in zip(sessions, outcomes)
+        if outcome is None and not session.failed_events
+    )
+    failures = [
+        f"{session.username}: {outcome!r}"
+        if outcome is not None
+        else f"{session.username}: {', '.join(session.failed_events)}"
+        for session, outcome in zip(sessions, outcomes)
+        if outcome is not None or session.failed_events
+    ]
+    handovers = args.sessions * args.handovers_per_session
+    return {
+        "build": {
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "reflex": _reflex_version(),
+        },
+        "config": {
+            "backend": "mongomock"
+            if args.in_process
+            else args.mongo_uri,
+            "state_manager": state_manager,
+            "sessions": args.sessions,
+            "users": args.users,
+            "handovers_per_session": args.handovers_per_session,
+            "max_qty": args.max_qty,
+            "think_ms": args.think_ms,
+            "seed": args.seed,
+        },
+        "sessions": {
+            "started": args.sessions,
+            "completed": completed,
+            "failed": args.sessions - completed,
+        },
+        "wall_seconds": round(wall_seconds, 3),
+        "foreground_seconds": round(foreground_seconds, 3),
+        "throughput": {
+            "events_per_second": round(
+                recorder.events_processed
+                / foreground_seconds,
+                2,
+            ),
+            "handovers_per_second": round(
+                handovers / foreground_seconds, 2
+            ),
+        },
+        "events": {
+            name: stats.summary()
+            for name, stats in sorted(
+                recorder.events.items()
+            )
+        },
+        "background": {
+            name: stats.summary()
+            for name, stats in sorted(
+                recorder.background.items()
+            )
+        },
+        "pushed_updates": recorder.pushed_updates,
+        "failures": failures[:20],
+    }
+
+
+def _reflex_version() -> str | None:
+    from importlib import metadata
+
+    try:
+        return metadata.version("reflex")
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def _print_table(results: dict[str, Any]) -> None:
+    sessions = results["sessions"]
+    throughput = results["throughput"]
+    print(
+        f"{sessions['completed']}/{sessions['started']} sessions completed "
+        f"in {results['foreground_seconds']:.2f}s "
+        f"({throughput['events_per_second']:.1f} events/s, "
+        f"{throughput['handovers_per_second']:.1f} handovers/s)"
+    )
+    for section in ("events", "background"):
+        for name, summary in results[section].items():
+            label = (
+                name
+                if section == "events"
+                else f"{name} [bg]"
+            )
+            print(
+                f"{label:<36} n={summary['count']:<6} "
+                f"err={summary['errors']:<4} "
+                f"p50={summary['p50_ms']:8.2f}ms "
+                f"p95={summary['p95_ms']:8.2f}ms "
+                f"p99={summary['p99_ms']:8.2f}ms"
+            )
+    for failure in results["failures"][:10]:
+        print(f"FAILED {failure}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    backend = parser.add_mutually_exclusive_group(
+        required=True
+    )
+    backend.add_argument(
+        "--in-process",
+        action="store_true",
+        help="Use mongomock instead of a MongoDB server.",
+    )
+    backend.add_argument(
+        "--mongo-uri",
+        help="A local mongod, e.g. mongodb://localhost:27017.",
+    )
+    parser.add_argument(
+        "--state-manager",
+        choices=("memory", "disk", "redis"),
+        default="memory",
+        help="Reflex state manager; REDIS_URL selects redis regardless.",
+    )
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument(
+        "--users",
+        type=int,
+        default=None,
+        help="Distinct technician accounts (default: one per session).",
+    )
+    parser.add_argument("--password", default="load-test")
+    parser.add_argument(
+        "--handovers-per-session", type=int, default=1
+    )
+    parser.add_argument("--max-qty", type=int, default=3)
+    parser.add_argument(
+        "--think-ms",
+        type=float,
+        default=0.0,
+        help="Upper bound of a random pause between user actions.",
+    )
+    parser.add_argument(
+        "--drain-timeout",
+        type=float,
+        default=30.0,
+        help="Seconds to wait for background events after the sessions finish.",
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--output",
+        help="Write the results as JSON to this path ('-' for stdout).",
+    )
+    args = parser.parse_args()
+    args.users = args.users or args.sessions
+    with tempfile.TemporaryDirectory() as journal_dir:
+        os.environ["STATE_MANAGER_MODE"] = (
+            args.state_manager
+        )
+        os.environ["HANDOVER_JOURNAL_PATH"] = os.path.join(
+            journal_dir, "handover_journal.db"
+        )
+        if args.in_process:
+            _use_in_process_mongo()
+        else:
+            _use_local_mongod(args.mongo_uri)
+        results = asyncio.run(run_load(args))
+    if args.output == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+    else:
+        _print_table(results)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(results, f, indent=2)
+    if results["sessions"]["failed"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import datetime
+from types import SimpleNamespace
+from typing import Any
+
+import fakeredis
+import mongomock
+import pytest
+import redis
+from bson import ObjectId
+from pymongo import DeleteOne, UpdateOne
+
+import app.db.cache as cache
+import app.db.journal as journal
+import app.db.repository as repository
+from app.db.client_pool import client_pool
+
+FACILITY = "Ajeromi General Hospital"
+
+
+def _bulk_write(
+    self,
+    requests: list[Any],
+    ordered: bool = True,
+    **kwargs,
+):
+    # mongomock predates the request classes of pymongo 4.9+.
+    modified = 0
+    for request in requests:
+        if isinstance(request, UpdateOne):
+            modified += self.update_one(
+                request._filter,
+                request._doc,
+                upsert=request._upsert,
+            ).modified_count
+        elif isinstance(request, DeleteOne):
+            self.delete_one(request._filter)
+        else:
+            raise TypeError(request)
+    return SimpleNamespace(modified_count=modified)
+
+
+@pytest.fixture
+def mongo_client(monkeypatch):
+    client = mongomock.MongoClient()
+    monkeypatch.setattr(
+        mongomock.Collection, "bulk_write", _bulk_write
+    )
+    monkeypatch.setattr(
+        client_pool, "_client_factory", lambda uri: client
+    )
+    # mongomock cursors cannot explain their query plan.
+    monkeypatch.setattr(
+        repository,
+        "check_filter_plan_once",
+        lambda collection, query, filters: None,
+    )
+    yield client
+    client_pool.close_all()
+
+
+@pytest.fixture
+def database(mongo_client):
+    return mongo_client[repository.DB_NAME]
+
+
+@pytest.fixture(autouse=True)
+def fresh_module_state(monkeypatch):
+    monkeypatch.setattr(
+        repository,
+        "submissions_cache",
+        cache.QueryCache(
+            cache.LocalCacheBackend(64, 10**6)
+        ),
+    )
+    monkeypatch.setattr(
+        repository, "_history_generation", 0
+    )
+    monkeypatch.setattr(
+        repository, "_rollups_rebuilt", False
+    )
+    monkeypatch.setattr(journal, "_flusher_credentials", {})
+    monkeypatch.setattr(
+        journal, "_signed_out_usernames", set()
+    )
+
+
+@pytest.fixture
+def handover_journal(monkeypatch, tmp_path):
+    handover_journal = journal.HandoverJournal(
+        str(tmp_path / "journal.db")
+    )
+    monkeypatch.setattr(
+        journal, "handover_journal", handover_journal
+    )
+    yield handover_journal
+    handover_journal.close()
+
+
+@pytest.fixture
+def redis_server(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        redis.Redis,
+        "from_url",
+        lambda url, **kwargs: fakeredis.FakeRedis(
+            server=server
+        ),
+    )
+    return server
+
+
+def make_handover(
+    timestamp: Any = None,
+    facility: str = FACILITY,
+    purities: tuple[float, ...] = (95.0,),
+    cylinder_id: str | None = "CYL-2M-0001",
+) -> dict[str, Any]:
+    return {
+        "_id": ObjectId(),
+        "facility": facility,
+        "bmt_in_charge": "Mr. tester",
+        "receiving_personnel": None,
+        "qty_2m": len(purities),
+        "qty_4m": 0,
+        "qty_7m": 0,
+        "cylinder_checks_2m": [
+            {
+                "cylinder_id": cylinder_id,
+                "purity": purity,
+                "pressure": 1500,
+            }
+            for purity in purities
+        ],
+        "cylinder_checks_4m": [],
+        "cylinder_checks_7m": [],
+        "submitted_by": "tester",
+        "submission_timestamp": timestamp
+        or datetime.datetime(2025, 1, 1, 8),
+    }
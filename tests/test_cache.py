@@ -0,0 +1,132 @@
+import asyncio
+
+import bson
+
+from app.db.cache import (
+    LocalCacheBackend,
+    QueryCache,
+    RedisCacheBackend,
+)
+from app.db.repository import HandoverRepository
+from tests.conftest import make_handover
+
+
+def _redis_cache(max_entries: int = 512) -> QueryCache:
+    return QueryCache(
+        RedisCacheBackend("redis://cache", max_entries)
+    )
+
+
+def test_result_computed_before_invalidation_is_not_served():
+    query_cache = QueryCache(LocalCacheBackend(8, 10**6))
+    generation = query_cache.current_generation()
+    query_cache.invalidate()
+    query_cache.set("page", ["stale"], generation)
+
+    assert (
+        query_cache.get(
+            "page", query_cache.current_generation()
+        )
+        is None
+    )
+
+
+def test_local_backend_evicts_least_recently_used():
+    query_cache = QueryCache(LocalCacheBackend(2, 10**6))
+    generation = query_cache.current_generation()
+    query_cache.set("a", 1, generation)
+    query_cache.set("b", 2, generation)
+    query_cache.get("a", generation)
+    query_cache.set("c", 3, generation)
+
+    assert query_cache.get("a", generation) == 1
+    assert query_cache.get("b", generation) is None
+
+
+def test_oversize_results_are_not_cached():
+    query_cache = QueryCache(
+        LocalCacheBackend(8, 10**6), max_entry_bytes=64
+    )
+    generation = query_cache.current_generation()
+    query_cache.set("big", "x" * 100, generation)
+
+    assert query_cache.get("big", generation) is None
+    assert query_cache.stats["oversize"] == 1
+
+
+def test_redis_generation_is_shared_between_workers(
+    redis_server,
+):
+    worker_a, worker_b = _redis_cache(), _redis_cache()
+    generation = worker_a.current_generation()
+    worker_a.set("page", ["first"], generation)
+    assert worker_b.get(
+        "page", worker_b.current_generation()
+    ) == ["first"]
+
+    worker_b.invalidate()
+    assert (
+        worker_a.get("page", worker_a.current_generation())
+        is None
+    )
+
+
+def test_redis_backend_caps_entries(redis_server):
+    query_cache = _redis_cache(max_entries=3)
+    generation = query_cache.current_generation()
+    for number in range(5):
+        query_cache.set(
+            f"page-{number}", number, generation
+        )
+
+    assert [
+        query_cache.get(f"page-{number}", generation)
+        for number in range(5)
+    ] == [None, None, 2, 3, 4]
+
+
+def test_unreachable_backend_is_skipped():
+    class Unreachable:
+        def generation(self):
+            raise ConnectionError
+
+        def clear(self):
+            raise ConnectionError
+
+    query_cache = QueryCache(Unreachable())
+    generation = query_cache.current_generation()
+    query_cache.set("page", 1, generation)
+    query_cache.invalidate()
+
+    assert query_cache.get("page", generation) is None
+    assert query_cache.stats["backend_errors"] == 2
+
+
+def test_cached_pages_are_scoped_per_user(mongo_client):
+    mongo_client["Cylinder_Inventory"][
+        "Handover_records"
+    ].insert_one(make_handover())
+
+    async def pages():
+        alice = HandoverRepository(mongo_client, "alice")
+        bob = HandoverRepository(mongo_client, "bob")
+        await alice.list_handovers_page(limit=10)
+        return (
+            await alice.cached_handovers_page(limit=10),
+            await bob.cached_handovers_page(limit=10),
+        )
+
+    alice_page, bob_page = asyncio.run(pages())
+    assert len(alice_page[0]) == 1
+    assert bob_page is None
+
+
+def test_cache_round_trips_bson_values():
+    query_cache = QueryCache(LocalCacheBackend(8, 10**6))
+    document = make_handover()
+    generation = query_cache.current_generation()
+    query_cache.set("page", [document], generation)
+
+    assert query_cache.get("page", generation) == [
+        bson.decode(bson.encode(document))
+    ]
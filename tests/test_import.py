@@ -0,0 +1,131 @@
+import asyncio
+import io
+import json
+from types import SimpleNamespace
+
+from pymongo import errors
+
+from app.db.repository import HandoverRepository
+from app.importers.handover_import import import_handovers
+from tests.conftest import FACILITY
+
+CSV_HEADER = "facility,bmt_in_charge,qty_2m,2m_1_cylinder_id,2m_1_purity,2m_1_pressure,submission_timestamp\n"
+
+
+def _jsonl(*records: dict) -> io.StringIO:
+    return io.StringIO(
+        "\n".join(json.dumps(record) for record in records)
+    )
+
+
+def _record(purity: float = 95.0) -> dict:
+    return {
+        "facility": FACILITY,
+        "qty_2m": 1,
+        "cylinder_checks_2m": [
+            {
+                "cylinder_id": "CYL-2M-0001",
+                "purity": purity,
+                "pressure": 1500,
+            }
+        ],
+        "submission_timestamp": "2025-01-01T08:00:00",
+    }
+
+
+def test_csv_rows_are_validated_and_inserted(
+    mongo_client, database
+):
+    stream = io.StringIO(
+        CSV_HEADER
+        + f"{FACILITY},,1,CYL-1,95,1500,2025-01-01T08:00:00\n"
+        + f"{FACILITY},,1,CYL-2,150,1500,2025-01-01T09:00:00\n"
+        + "Nowhere,,1,CYL-3,95,1500,\n"
+    )
+    repository = HandoverRepository(mongo_client, "tester")
+
+    report = asyncio.run(
+        repository.import_handovers(
+            stream, "csv", "tester", "Mr. tester"
+        )
+    )
+
+    assert (report.rows_read, report.inserted) == (3, 1)
+    assert [
+        failure["line"] for failure in report.failures
+    ] == [
+        3,
+        4,
+    ]
+    stored = database.Handover_records.find_one()
+    assert stored["bmt_in_charge"] == "Mr. tester"
+    assert stored["submitted_by"] == "tester"
+    assert (
+        database.Cylinder_readings.count_documents({}) == 1
+    )
+
+
+def test_jsonl_reports_bad_lines_and_keeps_going(
+    mongo_client, database
+):
+    stream = io.StringIO(
+        json.dumps(_record())
+        + "\nnot json\n"
+        + json.dumps(_record(99.5))
+        + "\n"
+        + json.dumps(_record())
+    )
+    repository = HandoverRepository(mongo_client, "tester")
+
+    report = asyncio.run(
+        repository.import_handovers(
+            stream, "jsonl", "tester", "Mr. tester"
+        )
+    )
+
+    assert (report.inserted, report.failed) == (2, 2)
+    assert [
+        failure["line"] for failure in report.failures
+    ] == [
+        2,
+        3,
+    ]
+    assert (
+        database.Handover_records.count_documents({}) == 2
+    )
+
+
+def test_database_error_returns_partial_report():
+    class DropsSecondChunk:
+        def __init__(self):
+            self.calls = 0
+
+        def insert_many(self, documents, ordered=True):
+            self.calls += 1
+            if self.calls == 2:
+                raise errors.AutoReconnect(
+                    "connection lost"
+                )
+            return SimpleNamespace(
+                inserted_ids=[None] * len(documents)
+            )
+
+    report = import_handovers(
+        DropsSecondChunk(),
+        _jsonl(*[_record() for _ in range(5)]),
+        "jsonl",
+        "tester",
+        "Mr. tester",
+        chunk_size=2,
+    )
+
+    assert (report.rows_read, report.inserted) == (4, 2)
+    assert [
+        failure["line"] for failure in report.failures
+    ] == [
+        3,
+        4,
+    ]
+    assert (
+        "connection lost" in report.failures[0]["errors"][0]
+    )
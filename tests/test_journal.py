@@ -0,0 +1,144 @@
+import asyncio
+
+from pymongo import errors
+
+import app.db.journal as journal
+from app.db.client_pool import client_pool
+from app.db.rollups import ROLLUP_ALL_SIZES
+from tests.conftest import make_handover
+
+
+def test_flush_leaves_entries_of_unknown_users_untouched(
+    mongo_client, database, handover_journal
+):
+    handover_journal.append("tester", make_handover())
+
+    assert asyncio.run(journal.flush_journal()) == 0
+    # Still due, not deferred, for a worker with the credentials.
+    [entry] = handover_journal.due(10, ["tester"])
+    assert entry.attempts == 0
+    assert (
+        database.Handover_records.count_documents({}) == 0
+    )
+
+
+def test_flush_writes_handover_with_rollups_and_readings(
+    mongo_client, database, handover_journal
+):
+    handover_journal.append("tester", make_handover())
+    journal._flusher_credentials["tester"] = "secret"
+
+    assert asyncio.run(journal.flush_journal()) == 1
+    assert handover_journal.pending_count() == 0
+    assert (
+        database.Handover_records.count_documents({}) == 1
+    )
+    rollup = database.Handover_daily_rollups.find_one(
+        {"size": ROLLUP_ALL_SIZES}
+    )
+    assert rollup["handovers"] == 1
+    assert (
+        database.Cylinder_readings.count_documents({}) == 1
+    )
+
+
+def test_failed_connection_defers_with_backoff(
+    monkeypatch, handover_journal
+):
+    def unreachable(uri):
+        raise errors.ServerSelectionTimeoutError("down")
+
+    monkeypatch.setattr(
+        client_pool, "_client_factory", unreachable
+    )
+    handover_id = handover_journal.append(
+        "tester", make_handover()
+    )
+    journal._flusher_credentials["tester"] = "secret"
+
+    assert asyncio.run(journal.flush_journal()) == 0
+    [entry] = handover_journal.get([handover_id])
+    assert entry.attempts == 1
+    assert handover_journal.due(10, ["tester"]) == []
+    client_pool.close_all()
+
+
+def test_replayed_entry_finishes_rollups_and_readings_once(
+    mongo_client, database, handover_journal
+):
+    document = make_handover()
+    # An earlier attempt landed but never reported back.
+    database.Handover_records.insert_one(dict(document))
+    handover_journal.append("tester", document)
+    journal._flusher_credentials["tester"] = "secret"
+
+    assert asyncio.run(journal.flush_journal()) == 1
+    assert (
+        database.Handover_records.count_documents({}) == 1
+    )
+    assert (
+        database.Cylinder_readings.count_documents({}) == 1
+    )
+
+    handover_journal.append("tester", dict(document))
+    assert asyncio.run(journal.flush_journal()) == 1
+    assert (
+        database.Cylinder_readings.count_documents({}) == 1
+    )
+
+
+def test_claimed_entries_are_hidden_from_other_workers(
+    handover_journal,
+):
+    other_worker = journal.HandoverJournal(
+        handover_journal.path
+    )
+    handover_journal.append("tester", make_handover())
+
+    assert len(handover_journal.due(10, ["tester"])) == 1
+    assert other_worker.due(10, ["tester"]) == []
+    other_worker.close()
+
+
+def test_sync_counts_unconfirmed_ids_as_pending(
+    mongo_client, handover_journal
+):
+    journal._flusher_credentials["tester"] = "secret"
+    handover_id = handover_journal.append(
+        "tester", make_handover()
+    )
+    missing_id = str(make_handover()["_id"])
+
+    assert (
+        asyncio.run(
+            journal.sync_journal_entries(
+                "tester", [handover_id]
+            )
+        )
+        == 0
+    )
+    assert (
+        asyncio.run(
+            journal.sync_journal_entries(
+                "tester", [handover_id, missing_id]
+            )
+        )
+        == 1
+    )
+
+
+def test_sign_out_keeps_credentials_until_entries_are_written(
+    mongo_client, handover_journal
+):
+    journal._flusher_credentials["tester"] = "secret"
+    handover_journal.append("tester", make_handover())
+
+    asyncio.run(
+        journal.forget_flusher_credentials("tester")
+    )
+    assert journal._flusher_credentials == {
+        "tester": "secret"
+    }
+
+    assert asyncio.run(journal.flush_journal()) == 1
+    assert journal._flusher_credentials == {}
@@ -0,0 +1,116 @@
+import asyncio
+import datetime
+
+from app.db.repository import HandoverRepository
+from app.db.timestamps import keyset_sort_key
+from tests.conftest import make_handover
+
+START = datetime.datetime(2025, 1, 1)
+
+
+def _store_mixed_history(database) -> list[dict]:
+    documents = []
+    for number in range(13):
+        timestamp = START + datetime.timedelta(
+            hours=7 * number
+        )
+        documents.append(
+            make_handover(
+                # Legacy rows still hold ISO strings.
+                timestamp
+                if number % 2
+                else timestamp.isoformat(),
+                facility="Alimosho General Hospital"
+                if number % 3
+                else "Ajeromi General Hospital",
+            )
+        )
+    # Two handovers submitted in the same instant.
+    documents.append(make_handover(START))
+    documents.append(make_handover(START))
+    database.Handover_records.insert_many(documents)
+    return sorted(
+        documents,
+        key=lambda document: keyset_sort_key(
+            document["submission_timestamp"],
+            document["_id"],
+        ),
+        reverse=True,
+    )
+
+
+def _page_through(repository, limit, filters=None):
+    async def pages():
+        seen, after = [], None
+        while True:
+            (
+                documents,
+                has_more,
+            ) = await repository.list_handovers_page(
+                after, limit, filters
+            )
+            seen.extend(documents)
+            if not has_more:
+                return seen
+            after = (
+                documents[-1]["submission_timestamp"],
+                str(documents[-1]["_id"]),
+            )
+
+    return asyncio.run(pages())
+
+
+def test_pages_cover_every_handover_once_in_order(
+    mongo_client, database
+):
+    expected = _store_mixed_history(database)
+    repository = HandoverRepository(mongo_client, "tester")
+
+    seen = _page_through(repository, 4)
+
+    assert [document["_id"] for document in seen] == [
+        document["_id"] for document in expected
+    ]
+
+
+def test_pages_respect_filters(mongo_client, database):
+    expected = [
+        document
+        for document in _store_mixed_history(database)
+        if document["facility"]
+        == "Ajeromi General Hospital"
+    ]
+    repository = HandoverRepository(mongo_client, "tester")
+
+    seen = _page_through(
+        repository,
+        2,
+        {"facility": "Ajeromi General Hospital"},
+    )
+
+    assert [document["_id"] for document in seen] == [
+        document["_id"] for document in expected
+    ]
+
+
+def test_newer_than_returns_handovers_above_watermark(
+    mongo_client, database
+):
+    expected = _store_mixed_history(database)
+    watermark = expected[5]
+    repository = HandoverRepository(mongo_client, "tester")
+
+    newer = asyncio.run(
+        repository.list_handovers_newer_than(
+            (
+                watermark["submission_timestamp"],
+                str(watermark["_id"]),
+            ),
+            100,
+        )
+    )
+
+    assert [document["_id"] for document in newer] == [
+        document["_id"]
+        for document in reversed(expected[:5])
+    ]
@@ -0,0 +1,110 @@
+import asyncio
+import datetime
+
+from app.db.repository import (
+    HANDOVER_COLLECTION_NAME,
+    HandoverRepository,
+)
+from app.db.rollups import (
+    ROLLUP_ALL_SIZES,
+    rebuild_rollups,
+    rollups_rebuilt,
+    summarize_handovers,
+)
+from tests.conftest import make_handover
+
+ROLLUP_FIELDS = (
+    "handovers",
+    "quantity",
+    "checks",
+    "purity_sum",
+    "purity_min",
+    "purity_max",
+    "pressure_max",
+)
+
+
+def _stored_rollups(database) -> dict:
+    return {
+        (row["facility"], row["day"], row["size"]): {
+            field: row.get(field) for field in ROLLUP_FIELDS
+        }
+        for row in database.Handover_daily_rollups.find()
+        if row["handovers"]
+    }
+
+
+def _expected_rollups(database) -> dict:
+    return {
+        key: {
+            field: rollup[field] for field in ROLLUP_FIELDS
+        }
+        for key, rollup in summarize_handovers(
+            database.Handover_records.find()
+        ).items()
+    }
+
+
+def _handovers() -> list[dict]:
+    day = datetime.datetime(2025, 1, 1, 8)
+    return [
+        make_handover(day, purities=(91.0, 96.0)),
+        make_handover(day, purities=(98.5,)),
+        make_handover(
+            day + datetime.timedelta(days=1),
+            facility="Alimosho General Hospital",
+            purities=(85.0,),
+        ),
+    ]
+
+
+def test_inserts_keep_rollups_in_step(
+    mongo_client, database
+):
+    repository = HandoverRepository(mongo_client, "tester")
+    asyncio.run(repository.insert_handovers(_handovers()))
+
+    assert _stored_rollups(database) == _expected_rollups(
+        database
+    )
+
+
+def test_delete_recomputes_extremes(mongo_client, database):
+    repository = HandoverRepository(mongo_client, "tester")
+    documents = _handovers()
+    asyncio.run(repository.insert_handovers(documents))
+
+    asyncio.run(
+        repository.delete_handover(str(documents[1]["_id"]))
+    )
+
+    stored = _stored_rollups(database)
+    assert stored == _expected_rollups(database)
+    overall = stored[
+        (
+            documents[0]["facility"],
+            "2025-01-01",
+            ROLLUP_ALL_SIZES,
+        )
+    ]
+    assert overall["purity_max"] == 96.0
+
+
+def test_rebuild_matches_live_rollups_and_marks_completion(
+    mongo_client, database
+):
+    repository = HandoverRepository(mongo_client, "tester")
+    asyncio.run(repository.insert_handovers(_handovers()))
+    live = _stored_rollups(database)
+    assert not rollups_rebuilt(database)
+
+    processed = rebuild_rollups(
+        database,
+        HANDOVER_COLLECTION_NAME,
+        batch_size=2,
+        grace_seconds=0,
+    )
+
+    assert processed == 3
+    assert _stored_rollups(database) == live
+    assert rollups_rebuilt(database)